@@ -1,6 +1,6 @@
 import os
 import threading
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import config
@@ -18,8 +18,9 @@ jwt = JWTManager()
 
 def start_scheduler():
     """
-    🔄 LANCE LES 2 PIPELINES (WEB + FACEBOOK) AUTOMATIQUEMENT
-    Toutes les 10 minutes en arrière-plan
+    🔄 LANCE LES PIPELINES AUTOMATIQUEMENT en arrière-plan
+    - WEB: un job par média, intervalle adapté à son rythme de publication
+    - Facebook: toutes les 10 minutes
     """
     import sys
     from pathlib import Path
@@ -28,70 +29,36 @@ def start_scheduler():
     sys.path.insert(0, str(Path(__file__).parent))
     sys.path.insert(0, str(Path(__file__).parent / 'pipeline'))
     
-    from apscheduler.schedulers.background import BackgroundScheduler
-    from pipeline.unified_scheduler import run_unified_pipeline
+    from pipeline.unified_scheduler import start_unified_scheduler
     import logging
     
-    # Configuration des logs du scheduler
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - [SCHEDULER] - %(message)s'
-    )
-    logger = logging.getLogger('unified_scheduler')
-    
-    # 🔓 RESET du flag is_running au démarrage (au cas où il serait bloqué)
-    try:
-        import json
-        from pathlib import Path
-        state_file = Path(__file__).parent / 'pipeline_state.json'
-        if state_file.exists():
-            with open(state_file, 'r', encoding='utf-8') as f:
-                state = json.load(f)
-            if state.get('is_running', False):
-                logger.warning("⚠️ Flag 'is_running' était bloqué - Réinitialisation")
-                state['is_running'] = False
-                with open(state_file, 'w', encoding='utf-8') as f:
-                    json.dump(state, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.warning(f"Erreur lors du reset du flag: {e}")
-    
-    # Créer le scheduler en arrière-plan
-    scheduler = BackgroundScheduler()
-    
-    # 🚀 EXÉCUTER IMMÉDIATEMENT au démarrage
-    logger.info("🚀 LANCEMENT IMMÉDIAT des pipelines WEB + FACEBOOK...")
-    logger.info("📰 Pipeline WEB: 5 médias burkinabè")
-    logger.info("👥 Pipeline Facebook: 5 pages Facebook")
-    
-    try:
-        run_unified_pipeline()
-        logger.info("✅ Première exécution terminée avec succès")
-    except Exception as e:
-        logger.error(f"❌ Erreur lors de la première exécution: {e}")
-    
-    # Ajouter le job unifié : toutes les 10 MINUTES
-    scheduler.add_job(
-        run_unified_pipeline,
-        'interval',
-        minutes=10,
-        id='unified_pipeline_scraping',
-        name='Scraping automatique WEB + Facebook',
-        replace_existing=True,
-        max_instances=1  # Un seul job à la fois
-    )
-    
-    # Démarrer le scheduler
-    scheduler.start()
-    logger.info("⏰ SCHEDULER UNIFIÉ ACTIVÉ - Prochaine exécution dans 10 minutes")
+    # Récupère les jobs interrompus et programme les premiers passages (échelonnés)
+    start_unified_scheduler()
+    logging.getLogger('unified_scheduler').info("⏰ SCHEDULER UNIFIÉ ACTIVÉ - Intervalles adaptatifs par média")
 
 
-
-def create_app(config_name='development'):
-    """Factory pour créer l'application Flask"""
+def create_app(config_name='development', api_only=None):
+    """
+    Factory pour créer l'application Flask
+    
+    Args:
+        config_name: Configuration à charger
+        api_only: Mode API seule: aucun scraping dans ce processus, /api/pipeline/run met
+                  le job en file pour le worker (python -m pipeline.worker).
+                  Défaut: variable d'environnement PIPELINE_MODE=api
+    """
     app = Flask(__name__)
     
+    # Journalisation JSON de l'API et des pipelines (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLING)
+    # Même nom de module que les orchestrateurs (utils.log, pipeline/ ajouté au path par routes.pipeline)
+    from utils.log import configure_logging
+    configure_logging()
+    
     # Configuration
     app.config.from_object(config[config_name])
+    if api_only is None:
+        api_only = os.getenv('PIPELINE_MODE', 'embedded') == 'api'
+    app.config['PIPELINE_API_ONLY'] = api_only
     
     # Initialiser JWT
     jwt.init_app(app)
@@ -143,6 +110,14 @@ def create_app(config_name='development'):
             'database': 'supabase'
         })
     
+    # Mesures Prometheus des pipelines exécutés dans ce processus
+    # (mode API seule: les mesures sont servies par le worker, voir METRICS_PORT)
+    @app.route('/metrics')
+    def metrics():
+        # Même nom de module que les orchestrateurs (utils.metrics): un seul registre
+        from utils.metrics import METRICS, PROMETHEUS_CONTENT_TYPE
+        return Response(METRICS.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+    
     # Gestion des erreurs JWT
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -178,17 +153,22 @@ if __name__ == '__main__':
     print("🚀 DÉMARRAGE MÉDIA-SCAN")
     print("="*70)
     print("📡 API Flask: http://127.0.0.1:5000")
-    print("⏰ SCHEDULER UNIFIÉ: WEB + Facebook toutes les 10 MINUTES")
+    if app.config['PIPELINE_API_ONLY']:
+        print("⚙️  MODE API SEULE: scheduler et scrapings dans le worker (python -m pipeline.worker)")
+    else:
+        print("⏰ SCHEDULER UNIFIÉ: WEB par média (intervalle adaptatif) + Facebook toutes les 10 MINUTES")
     print("📢 Notifications: Cloche + Popup bleues activées")
     print("="*70 + "\n")
     
-    scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
-    scheduler_thread.start()
+    if not app.config['PIPELINE_API_ONLY']:
+        scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
+        scheduler_thread.start()
     
     # Lancer l'application Flask
     app.run(
         host='0.0.0.0',
         port=5000,
         debug=app.config['DEBUG'],
+        threaded=True,  # Le flux SSE /api/pipeline/events garde une connexion ouverte par client
         use_reloader=False  # Désactive le watchdog pour éviter double exécution du scheduler
     )
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 import numpy as np
 from tqdm import tqdm
 from supabase_client import get_supabase_client
+from pipeline.utils.publication_days import PublicationDays
 from datetime import datetime
 import pytz
 
@@ -200,6 +201,13 @@ def import_data():
                 supabase.table('articles').upsert(batch, on_conflict='id').execute()
             except Exception as e:
                 print(f"Erreur lors de l'insertion du lot {i//batch_size + 1} des articles: {e}")
+        
+        # Jours de publication des médias importés (régularité), l'upsert en masse ne passe pas par record()
+        media_ids = sorted({article['media_id'] for article in articles_to_insert})
+        try:
+            PublicationDays(supabase).backfill(media_ids)
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement des jours de publication: {e}")
     
     # --- 5. Insérer les engagements par lots ---
     if engagements_to_insert:
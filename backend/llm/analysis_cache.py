@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Mémo persistant des analyses déontologiques
+Clé = hash normalisé de (titre, contenu tronqué, version du prompt, modèle):
+un texte déjà analysé (ex: post Facebook reprenant un article web) est servi sans appel API,
+et toute modification du prompt change la clé, ce qui invalide les anciennes entrées.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'deontology_cache.sqlite3')
+DEFAULT_MAX_ENTRIES = 50000
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Minuscules et espaces normalisés: les variations de mise en forme partagent la même clé"""
+    return _WHITESPACE.sub(' ', (text or '').lower()).strip()
+
+
+def prompt_version(*templates: str) -> str:
+    """Empreinte courte du (des) gabarit(s) de prompt"""
+    return hashlib.sha256('\x00'.join(templates).encode('utf-8')).hexdigest()[:12]
+
+
+def make_key(titre: str, contenu: str, version: str, model: str) -> str:
+    """Clé de mémo d'une analyse"""
+    payload = '\x00'.join([normalize_text(titre), normalize_text(contenu), version, model])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """Mémo SQLite borné en taille (éviction des entrées les moins récemment utilisées)"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            path: Fichier SQLite (défaut: DEONTOLOGY_CACHE_PATH ou llm/deontology_cache.sqlite3)
+            max_entries: Nombre maximal d'entrées conservées (défaut: DEONTOLOGY_CACHE_MAX_ENTRIES ou 50000)
+        """
+        self.path = path or os.getenv('DEONTOLOGY_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries or int(os.getenv('DEONTOLOGY_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+
+        self._lock = threading.Lock()
+        # Connexion partagée entre les threads d'analyse (accès sérialisés par le verrou)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_last_used ON analyses(last_used)")
+        self._conn.commit()
+
+        # Compte tenu à jour à chaque insertion: pas de COUNT(*) à chaque set()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retourne l'analyse mémorisée (et la marque comme récemment utilisée)"""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            self._conn.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.stats['hits'] += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, result: Dict):
+        """Mémorise une analyse puis applique la limite de taille"""
+        with self._lock:
+            payload, now = json.dumps(result, ensure_ascii=False), time.time()
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO analyses (key, result, last_used) VALUES (?, ?, ?)",
+                (key, payload, now)
+            ).rowcount
+            if inserted:
+                self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+            else:
+                self._conn.execute(
+                    "UPDATE analyses SET result = ?, last_used = ? WHERE key = ?",
+                    (payload, now, key)
+                )
+            self._conn.commit()
+
+    def _evict(self):
+        # Recompte réel (fichier éventuellement partagé avec un autre processus) avant suppression
+        self._count = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+            self._count -= excess
+
+    def size(self) -> int:
+        """Nombre d'entrées mémorisées"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
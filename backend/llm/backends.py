@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Backends LLM de l'analyse déontologique
+Chaque backend n'expose que `complete(prompt, max_tokens)`: le débit, le retry,
+le mémo et les lots sont gérés une seule fois par DeontologyAnalyzer.
+- MistralBackend: API Mistral (open-mistral-7b)
+- GroqBackend: API Groq (llama-3.3-70b-versatile)
+- LocalBackend: remplaçant déterministe hors ligne (développement, benchmarks)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+
+class LLMBackend:
+    """Interface commune des backends"""
+
+    name = 'base'
+    model = ''
+    # Budget de tokens du contenu envoyé au modèle (au-delà: extrait des passages clés)
+    max_input_tokens = 3000
+    # Limites de débit par défaut du fournisseur
+    requests_per_minute = 60
+    tokens_per_minute: Optional[int] = None
+
+    def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Envoie un prompt (message utilisateur unique) et retourne le texte de la réponse
+
+        Les erreurs HTTP doivent être propagées telles quelles (le retry s'appuie sur leur status_code).
+        """
+        raise NotImplementedError
+
+
+class MistralBackend(LLMBackend):
+    name = 'mistral'
+    model = 'open-mistral-7b'
+    max_input_tokens = 3000
+    requests_per_minute = 60
+    tokens_per_minute = 500000
+
+    def __init__(self, api_key: str):
+        from mistralai import Mistral
+        self.client = Mistral(api_key=api_key)
+        print("✓ Client Mistral initialisé")
+
+    def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        response = self.client.chat.complete(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens
+        )
+        if not response or not response.choices:
+            return ''
+        return (response.choices[0].message.content or '').strip()
+
+
+class GroqBackend(LLMBackend):
+    name = 'groq'
+    model = 'llama-3.3-70b-versatile'
+    # Budget plus serré: 12k tokens/minute sur l'offre gratuite
+    max_input_tokens = 2000
+    # Limites de l'offre gratuite pour llama-3.3-70b
+    requests_per_minute = 30
+    tokens_per_minute = 12000
+
+    def __init__(self, api_key: str):
+        from groq import Groq
+        self.client = Groq(api_key=api_key)
+        print("✓ Client Groq initialisé")
+
+    def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.0,  # Température à 0 pour des résultats déterministes
+            max_tokens=max_tokens or 300,
+            top_p=1.0,  # top_p à 1.0 pour désactiver le nucleus sampling
+            seed=42  # Seed fixe pour garantir la reproductibilité
+        )
+        if not response or not response.choices:
+            return ''
+        return (response.choices[0].message.content or '').strip()
+
+
+class LocalBackend(LLMBackend):
+    """
+    Remplaçant déterministe d'un LLM, sans réseau
+
+    Le score dépend uniquement du texte (mots à risque repérés), la latence est simulée
+    en fonction de la taille du prompt. Les prompts individuels et par lots sont reconnus.
+    """
+
+    name = 'local'
+    model = 'local-standin'
+    max_input_tokens = 3000
+    requests_per_minute = 100000
+    tokens_per_minute = None
+
+    RISKY_WORDS = re.compile(
+        r"\b(menteur|voleur|traître|corrompu|escroc|idiot|imbécile|haine|tuer|massacre|"
+        r"honte|scandale|complot|rumeur|aurait|présumé)\w*",
+        re.IGNORECASE
+    )
+    ARTICLE_ID = re.compile(r"^### ID : (.+)$", re.MULTILINE)
+
+    def __init__(self, latency: float = 0.0, latency_per_1k_tokens: float = 0.0):
+        """
+        Args:
+            latency: Latence fixe simulée par appel (secondes)
+            latency_per_1k_tokens: Latence supplémentaire par millier de tokens de prompt
+        """
+        self.latency = latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.stats = {'calls': 0, 'prompt_chars': 0}
+        self._lock = threading.Lock()
+
+    def _analyze(self, text: str) -> dict:
+        hits = len(self.RISKY_WORDS.findall(text))
+        score = max(0, 10 - 2 * hits)
+        # Interprétation stable pour un même texte
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:8]
+        return {
+            'interpretation': f"Analyse locale ({hits} formulation(s) à risque) [{digest}]",
+            'score': score
+        }
+
+    def complete(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['prompt_chars'] += len(prompt)
+
+        delay = self.latency + self.latency_per_1k_tokens * len(prompt) / 4000
+        if delay > 0:
+            time.sleep(delay)
+
+        # Prompt par lots: un bloc "### ID : ..." par article
+        blocks = self.ARTICLE_ID.split(prompt)
+        if len(blocks) > 1:
+            items = []
+            for article_id, block in zip(blocks[1::2], blocks[2::2]):
+                items.append({'id': article_id.strip(), **self._analyze(block)})
+            return json.dumps(items, ensure_ascii=False)
+
+        # Prompt individuel: seul le texte de l'article (après les consignes) est évalué
+        return json.dumps(self._analyze(prompt.split('TITRE :', 1)[-1]), ensure_ascii=False)
+
+
+BACKENDS = {
+    'mistral': (MistralBackend, 'MISTRAL_API_KEY'),
+    'groq': (GroqBackend, 'GROQ_API_KEY'),
+    'local': (LocalBackend, None),
+}
+
+
+def get_backend(name: str, api_key: Optional[str] = None, **kwargs) -> LLMBackend:
+    """
+    Instancie un backend par son nom
+
+    Args:
+        name: 'mistral', 'groq' ou 'local'
+        api_key: Clé API (défaut: variable d'environnement du fournisseur)
+
+    Raises:
+        ValueError: backend inconnu ou clé API manquante
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend LLM inconnu: {name} (disponibles: {', '.join(BACKENDS)})")
+
+    backend_class, env_var = BACKENDS[name]
+    if env_var is None:
+        return backend_class(**kwargs)
+
+    api_key = api_key or os.getenv(env_var)
+    if not api_key:
+        raise ValueError(f"Variable {env_var} requise pour le backend {name}")
+    return backend_class(api_key, **kwargs)
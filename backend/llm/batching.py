@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Analyse déontologique par lots
+Plusieurs textes courts (posts Facebook, brèves) sont regroupés dans un seul prompt
+sous un budget de tokens; le modèle répond par un tableau JSON indexé par ID d'article.
+"""
+
+import json
+from typing import Dict, Iterable, List
+
+from llm_client import estimate_tokens
+
+
+# Budget de tokens du prompt d'un lot et nombre maximal d'articles par lot
+DEFAULT_BATCH_TOKEN_BUDGET = 3000
+DEFAULT_BATCH_MAX_ITEMS = 10
+# Tokens de réponse prévus par article (objet JSON avec interprétation de 2 lignes)
+OUTPUT_TOKENS_PER_ITEM = 80
+
+BATCH_PROMPT_TEMPLATE = """Tu es un expert en analyse déontologique du contenu journalistique.
+
+Analyse CHACUN des textes ci-dessous indépendamment et réponds UNIQUEMENT avec un tableau JSON strict, un objet par texte :
+
+[
+  {{"id": "ID du texte", "interpretation": "Description en 2 lignes de l'analyse déontologique", "score": 0-10}}
+]
+
+Critères : véracité, diffamation, incitation à la haine, insultes, manipulation, ton biaisé, intégrité.
+
+Score : 10=excellent, 7-9=bon, 4-6=problèmes, 0-3=graves manquements, -1=impossible d'analyser
+
+{articles}
+
+Réponds UNIQUEMENT avec le tableau JSON, rien d'autre."""
+
+ARTICLE_BLOCK_TEMPLATE = """### ID : {id}
+TITRE : {titre}
+CONTENU : {contenu}
+"""
+
+
+def format_article_block(article: Dict) -> str:
+    return ARTICLE_BLOCK_TEMPLATE.format(
+        id=article['id'],
+        titre=article.get('titre') or '',
+        contenu=article.get('contenu') or ''
+    )
+
+
+def build_batch_prompt(articles: List[Dict]) -> str:
+    """Prompt unique pour un lot d'articles"""
+    return BATCH_PROMPT_TEMPLATE.format(articles='\n'.join(format_article_block(a) for a in articles))
+
+
+def pack_batches(articles: Iterable[Dict], token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+                 max_items: int = DEFAULT_BATCH_MAX_ITEMS):
+    """
+    Regroupe les articles en lots respectant le budget de tokens
+
+    Un article qui occupe à lui seul plus de la moitié du budget n'est pas groupé:
+    il gagne peu au regroupement et doit être analysé seul.
+
+    Returns:
+        (lots, articles_seuls)
+    """
+    overhead = estimate_tokens(BATCH_PROMPT_TEMPLATE)
+    batches, singles = [], []
+    current, current_tokens = [], overhead
+
+    for article in articles:
+        tokens = estimate_tokens(format_article_block(article))
+        if tokens > token_budget // 2:
+            singles.append(article)
+            continue
+
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], overhead
+
+        current.append(article)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    # Un lot d'un seul article coûte plus cher que le prompt individuel
+    singles.extend(b[0] for b in batches if len(b) == 1)
+    return [b for b in batches if len(b) > 1], singles
+
+
+def _strip_markdown(text: str) -> str:
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('```')[1]
+        if text.startswith('json'):
+            text = text[4:]
+        text = text.strip()
+    return text
+
+
+def parse_batch_response(response_text: str, expected_ids: Iterable) -> Dict[str, Dict]:
+    """
+    Valide la réponse d'un lot et la découpe par article
+
+    Les entrées invalides (ID inconnu, score hors bornes, champ manquant) sont ignorées:
+    les articles correspondants seront réanalysés individuellement.
+
+    Returns:
+        dict: str(article_id) -> {interpretation, score}
+    """
+    expected = {str(article_id) for article_id in expected_ids}
+
+    try:
+        data = json.loads(_strip_markdown(response_text or ''))
+    except json.JSONDecodeError:
+        return {}
+
+    # Certains modèles enveloppent le tableau dans un objet
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if isinstance(v, list)), [])
+    if not isinstance(data, list):
+        return {}
+
+    results = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+
+        article_id = str(item.get('id', '')).strip()
+        if article_id not in expected or 'interpretation' not in item or 'score' not in item:
+            continue
+
+        try:
+            score = int(item['score'])
+        except (TypeError, ValueError):
+            continue
+        if score < -1 or score > 10:
+            continue
+
+        results[article_id] = {
+            'interpretation': str(item['interpretation']),
+            'score': score
+        }
+
+    return results
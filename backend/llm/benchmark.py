@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne de l'analyse déontologique
+Mesure débit et latence des différents modes (séquentiel, concurrent, lots, mémo)
+contre le backend local: aucune clé API ni connexion réseau nécessaire.
+
+Usage:
+    python benchmark.py --articles 200 --latency 0.05 --workers 8
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from analysis_cache import AnalysisCache
+from backends import LocalBackend
+from deontology_analyzer import DeontologyAnalyzer
+from llm_client import RateLimiter, run_concurrent
+
+
+WORDS = ("le gouvernement a annoncé une nouvelle mesure pour la population de Ouagadougou "
+         "selon le ministre les travaux commenceront la semaine prochaine dans plusieurs régions "
+         "les habitants saluent cette décision tandis que certains dénoncent un scandale présumé").split()
+
+
+def make_text(rng, words):
+    """Texte synthétique: phrases de 10 à 25 mots, sur une seule ligne comme le contenu normalisé en base"""
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(10, 25))
+        sentences.append(' '.join(rng.choices(WORDS, k=length)).capitalize() + '.')
+        words -= length
+    return ' '.join(sentences)
+
+
+def make_articles(count, short_ratio=0.7, seed=42):
+    """Articles synthétiques: posts courts (Facebook) et articles longs (web)"""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        length = rng.randint(15, 60) if rng.random() < short_ratio else rng.randint(400, 2500)
+        articles.append({
+            'id': f"bench-{i}",
+            'titre': ' '.join(rng.choices(WORDS, k=8)),
+            'contenu': make_text(rng, length)
+        })
+    return articles
+
+
+def run_mode(name, analyzer, articles, workers=1, batch=False):
+    backend = analyzer.backend
+    calls_before = backend.stats['calls']
+    chars_before = backend.stats['prompt_chars']
+    latencies = []
+
+    def timed(article):
+        start = time.perf_counter()
+        result = analyzer.analyze_content(article['titre'], article['contenu'])
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    start = time.perf_counter()
+    if batch:
+        analyzer.analyze_batch(articles, workers=workers)
+    elif workers > 1:
+        run_concurrent(articles, timed, max_workers=workers)
+    else:
+        for article in articles:
+            timed(article)
+    elapsed = time.perf_counter() - start
+
+    calls = backend.stats['calls'] - calls_before
+    tokens = (backend.stats['prompt_chars'] - chars_before) / 4 / len(articles)
+    line = (f"{name:<22} {elapsed:8.2f}s {len(articles) / elapsed:10.1f} art/s {calls:7d} appels"
+            f" {tokens:7.0f} tok/art")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+        line += f"  p50 {statistics.median(latencies) * 1000:7.1f}ms  p95 {p95 * 1000:7.1f}ms"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne de l'analyse déontologique")
+    parser.add_argument('--articles', type=int, default=200, help="Nombre d'articles synthétiques")
+    parser.add_argument('--latency', type=float, default=0.05, help="Latence simulée par appel (s)")
+    parser.add_argument('--latency-per-1k', type=float, default=0.02, help="Latence par millier de tokens (s)")
+    parser.add_argument('--workers', type=int, default=8, help="Appels simultanés du mode concurrent")
+    parser.add_argument('--token-budget', type=int, help="Tokens de contenu par article (défaut: budget du backend)")
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    print(f"📊 {len(articles)} articles synthétiques, latence simulée {args.latency * 1000:.0f}ms/appel\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def analyzer(cache_name=None):
+            backend = LocalBackend(args.latency, args.latency_per_1k)
+            cache = AnalysisCache(os.path.join(tmp, cache_name)) if cache_name else None
+            return DeontologyAnalyzer(backend, rate_limiter=RateLimiter(100000), cache=cache,
+                                      use_cache=cache is not None, token_budget=args.token_budget)
+
+        run_mode("séquentiel", analyzer(), articles)
+        run_mode(f"concurrent ({args.workers})", analyzer(), articles, workers=args.workers)
+        run_mode("lots", analyzer(), articles, batch=True)
+        run_mode(f"lots + concurrent ({args.workers})", analyzer(), articles, workers=args.workers, batch=True)
+
+        cached = analyzer('memo.sqlite3')
+        run_mode("mémo (1er passage)", cached, articles, batch=True)
+        run_mode("mémo (2e passage)", cached, articles, batch=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Analyse déontologique des articles journalistiques
+Un seul DeontologyAnalyzer quel que soit le fournisseur: le backend (Mistral, Groq ou
+remplaçant local) ne fait qu'envoyer un prompt; limitation de débit, retry, mémo et
+analyse par lots sont communs.
+"""
+
+import os
+import json
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from analysis_cache import AnalysisCache, make_key, prompt_version
+from backends import BACKENDS, LLMBackend, get_backend
+from batching import (BATCH_PROMPT_TEMPLATE, DEFAULT_BATCH_MAX_ITEMS, DEFAULT_BATCH_TOKEN_BUDGET,
+                      OUTPUT_TOKENS_PER_ITEM, build_batch_prompt, pack_batches, parse_batch_response)
+from llm_client import RateLimiter, call_with_retry, estimate_tokens, run_concurrent
+from text_extractor import extract_for_budget
+
+
+SCORES_TABLE = 'deontology_scores'
+
+# Tokens de réponse prévus pour une analyse individuelle
+OUTPUT_TOKENS_SINGLE = 300
+
+PROMPT_TEMPLATE = """Tu es un expert en analyse déontologique du contenu journalistique.
+
+Analyse ce texte et réponds UNIQUEMENT avec un JSON strict :
+
+{{
+  "interpretation": "Description en 2 lignes de l'analyse déontologique",
+  "score": 0-10
+}}
+
+Critères : véracité, diffamation, incitation à la haine, insultes, manipulation, ton biaisé, intégrité.
+
+Score : 10=excellent, 7-9=bon, 4-6=problèmes, 0-3=graves manquements, -1=impossible d'analyser
+
+TITRE : {titre}
+
+CONTENU : {contenu}
+
+Réponds UNIQUEMENT avec le JSON, rien d'autre."""
+
+# Toute modification du prompt change la version et invalide le mémo
+# (analyses individuelles et par lots sont interchangeables dans le mémo)
+PROMPT_VERSION = prompt_version(PROMPT_TEMPLATE, BATCH_PROMPT_TEMPLATE)
+
+
+class DeontologyAnalyzer:
+    """Analyseur déontologique pour articles de presse"""
+
+    def __init__(self, backend: LLMBackend, supabase=None, rate_limiter: Optional[RateLimiter] = None,
+                 max_retries: int = 5, cache: Optional[AnalysisCache] = None, use_cache: bool = True,
+                 token_budget: Optional[int] = None):
+        """
+        Initialise l'analyseur
+
+        Args:
+            backend: Backend LLM (voir backends.get_backend)
+            supabase: Client Supabase (optionnel: requis pour lire/sauvegarder les articles)
+            rate_limiter: Limiteur partagé par tous les appels (défaut: limites du backend)
+            max_retries: Nombre de nouveaux essais sur 429 / 5xx
+            cache: Mémo des analyses (défaut: mémo SQLite local)
+            use_cache: False pour forcer l'appel au modèle
+            token_budget: Tokens de contenu par article (défaut: DEONTOLOGY_TOKEN_BUDGET ou budget du backend)
+        """
+        self.backend = backend
+        self.supabase = supabase
+        self.rate_limiter = rate_limiter or RateLimiter(backend.requests_per_minute, backend.tokens_per_minute)
+        self.max_retries = max_retries
+        self.cache = (cache or AnalysisCache()) if use_cache else None
+        self.token_budget = token_budget or int(os.getenv('DEONTOLOGY_TOKEN_BUDGET', backend.max_input_tokens))
+
+    @classmethod
+    def from_env(cls, backend_name: str = 'mistral', **kwargs) -> 'DeontologyAnalyzer':
+        """
+        Crée un analyseur connecté à Supabase à partir des variables d'environnement
+        (SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY/SUPABASE_KEY/SUPABASE_ANON_KEY, clé API du backend)
+        """
+        from supabase import create_client
+
+        supabase_url = os.getenv('SUPABASE_URL')
+        supabase_key = (os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_KEY')
+                        or os.getenv('SUPABASE_ANON_KEY'))
+        if not supabase_url or not supabase_key:
+            raise ValueError("Variables SUPABASE_URL et SUPABASE_SERVICE_ROLE_KEY/SUPABASE_ANON_KEY requises")
+
+        supabase = create_client(supabase_url, supabase_key)
+        print("✓ Connexion à Supabase établie")
+
+        return cls(get_backend(backend_name), supabase=supabase, **kwargs)
+
+    # ========== ARTICLES ==========
+
+    def get_articles(self, limit: Optional[int] = None, article_id: Optional[str] = None) -> List[Dict]:
+        """
+        Récupère les articles de la base de données Supabase
+
+        Args:
+            limit: Nombre maximum d'articles à récupérer
+            article_id: ID spécifique d'un article (optionnel)
+
+        Returns:
+            Liste des articles avec leurs informations
+        """
+        try:
+            query = self.supabase.table('articles').select(
+                'id, titre, contenu, url, date, '
+                'medias(name, type), '
+                'categories(nom)'
+            )
+
+            # Filtre : articles avec contenu non nul
+            query = query.not_.is_('contenu', 'null')
+
+            if article_id:
+                query = query.eq('id', article_id)
+            else:
+                query = query.order('date', desc=True)
+                if limit:
+                    query = query.limit(limit)
+
+            response = query.execute()
+
+            # Transformation des données
+            articles = []
+            for item in response.data:
+                articles.append({
+                    'id': item['id'],
+                    'titre': item['titre'],
+                    'contenu': item['contenu'],
+                    'url': item['url'],
+                    'date': item['date'],
+                    'media_name': item['medias']['name'] if item.get('medias') else None,
+                    'media_type': item['medias']['type'] if item.get('medias') else None,
+                    'categorie': item['categories']['nom'] if item.get('categories') else None
+                })
+
+            return articles
+
+        except Exception as e:
+            print(f"✗ Erreur lors de la récupération des articles : {e}")
+            return []
+
+    def save_analysis(self, article_id: str, analysis: Dict):
+        """Persiste un score dans deontology_scores et sur l'article (lu par les alertes)"""
+        analyzed_at = datetime.now().isoformat()
+
+        self.supabase.table(SCORES_TABLE).upsert({
+            'article_id': article_id,
+            'score': analysis['score'],
+            'interpretation': analysis['interpretation'],
+            'analyzed_at': analyzed_at
+        }, on_conflict='article_id').execute()
+
+        self.supabase.table('articles').update({
+            'score_deontologique': analysis['score'],
+            'analyse_deontologique': analysis['interpretation'],
+            'analyzed_at': analyzed_at
+        }).eq('id', article_id).execute()
+
+    # ========== ANALYSE ==========
+
+    def _reduce(self, titre: str, contenu: str) -> str:
+        """Ramène un article long au budget de tokens (chapeau, citations, phrases clés)"""
+        texte = extract_for_budget(contenu, self.token_budget, titre)
+        if len(texte) < len(contenu):
+            print(f"  ✂️  Article long ({estimate_tokens(contenu)} tokens), extrait de {estimate_tokens(texte)} tokens")
+        return texte
+
+    def _send_prompt(self, prompt: str, output_tokens: int) -> str:
+        """Envoie un prompt au backend (débit limité, nouvel essai sur 429 / 5xx)"""
+        def request():
+            self.rate_limiter.acquire(estimate_tokens(prompt) + output_tokens)
+            return self.backend.complete(prompt, max_tokens=output_tokens)
+
+        return call_with_retry(request, max_retries=self.max_retries)
+
+    def analyze_content(self, titre: str, contenu: str) -> Dict:
+        """
+        Analyse le contenu d'un article
+
+        Args:
+            titre: Titre de l'article
+            contenu: Contenu de l'article
+
+        Returns:
+            Dictionnaire avec interpretation et score
+        """
+        texte_a_analyser = self._reduce(titre, contenu)
+
+        # Texte déjà analysé avec ce prompt et ce modèle: aucun appel API
+        key = make_key(titre, texte_a_analyser, PROMPT_VERSION, self.backend.model)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+
+        analysis = self._call_model(titre, texte_a_analyser)
+
+        # Les échecs (-1) ne sont pas mémorisés pour être réessayés
+        if self.cache and analysis['score'] >= 0:
+            self.cache.set(key, analysis)
+
+        return analysis
+
+    def _call_model(self, titre: str, texte_a_analyser: str) -> Dict:
+        """Envoie le prompt au backend et valide la réponse JSON"""
+        try:
+            prompt = PROMPT_TEMPLATE.format(titre=titre, contenu=texte_a_analyser)
+            response_text = self._send_prompt(prompt, OUTPUT_TOKENS_SINGLE)
+
+            # FALLBACK : Si le texte est vide
+            if not response_text:
+                print("  ⚠️  Réponse vide du modèle")
+                return {
+                    'interpretation': "Réponse vide du modèle",
+                    'score': -1
+                }
+
+            # Nettoyer la réponse si elle contient des marqueurs markdown
+            if response_text.startswith('```'):
+                response_text = response_text.split('```')[1]
+                if response_text.startswith('json'):
+                    response_text = response_text[4:]
+                response_text = response_text.strip()
+
+            result = json.loads(response_text)
+
+            # Validation du format
+            if 'interpretation' not in result or 'score' not in result:
+                raise ValueError("Format de réponse invalide")
+
+            # Validation du score
+            score = int(result['score'])
+            if score < -1 or score > 10:
+                raise ValueError(f"Score invalide : {score}")
+
+            return {
+                'interpretation': result['interpretation'],
+                'score': score
+            }
+
+        except json.JSONDecodeError as e:
+            print(f"✗ Erreur de parsing JSON : {e}")
+            print(f"Réponse brute : {response_text[:200] if 'response_text' in locals() else 'N/A'}")
+            return {
+                'interpretation': "Erreur de parsing JSON : réponse invalide du modèle",
+                'score': -1
+            }
+        except Exception as e:
+            print(f"✗ Erreur lors de l'analyse {self.backend.name} : {e}")
+            return {
+                'interpretation': f"Erreur d'analyse : {str(e)[:100]}",
+                'score': -1
+            }
+
+    def analyze_batch(self, articles: List[Dict], token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+                      max_items: int = DEFAULT_BATCH_MAX_ITEMS, workers: int = 1) -> Dict:
+        """
+        Analyse plusieurs articles en regroupant les textes courts dans un même prompt
+
+        Les articles absents ou invalides dans la réponse d'un lot sont réanalysés individuellement.
+
+        Args:
+            articles: Articles (id, titre, contenu)
+            token_budget: Budget de tokens du prompt d'un lot
+            max_items: Nombre maximal d'articles par lot
+            workers: Nombre d'appels LLM simultanés (lots puis appels individuels)
+
+        Returns:
+            dict: article_id -> {interpretation, score}
+        """
+        analyses = {}
+        pending = []
+
+        for article in articles:
+            texte = self._reduce(article['titre'], article.get('contenu') or '')
+            key = make_key(article['titre'], texte, PROMPT_VERSION, self.backend.model)
+            cached = self.cache.get(key) if self.cache else None
+            if cached:
+                analyses[article['id']] = cached
+            else:
+                pending.append({'id': article['id'], 'titre': article['titre'], 'contenu': texte, 'key': key})
+
+        batches, singles = pack_batches(pending, token_budget, max_items)
+
+        def send_batch(batch):
+            try:
+                response_text = self._send_prompt(build_batch_prompt(batch), OUTPUT_TOKENS_PER_ITEM * len(batch))
+                parsed = parse_batch_response(response_text, [a['id'] for a in batch])
+            except Exception as e:
+                print(f"✗ Erreur lors de l'analyse du lot : {e}")
+                parsed = {}
+
+            print(f"  📦 Lot de {len(batch)} articles : {len(parsed)} analyses valides")
+            return parsed
+
+        # Le limiteur de débit reste partagé entre les threads
+        for batch, parsed in zip(batches, run_concurrent(batches, send_batch, max_workers=workers)):
+            for article in batch:
+                analysis = parsed.get(str(article['id']))
+                if analysis is None:
+                    singles.append(article)
+                    continue
+                analyses[article['id']] = analysis
+                if self.cache and analysis['score'] >= 0:
+                    self.cache.set(article['key'], analysis)
+
+        # Articles longs et réponses manquantes: appel individuel
+        single_analyses = run_concurrent(
+            singles, lambda article: self.analyze_content(article['titre'], article['contenu']), max_workers=workers
+        )
+        for article, analysis in zip(singles, single_analyses):
+            analyses[article['id']] = analysis
+
+        return analyses
+
+    def analyze_article(self, article: Dict) -> Dict:
+        """
+        Analyse un article complet
+
+        Args:
+            article: Dictionnaire contenant les informations de l'article
+
+        Returns:
+            Résultat complet de l'analyse
+        """
+        print(f"\n→ Analyse de l'article : {article['id']}")
+        print(f"  Titre : {article['titre'][:60]}...")
+
+        # Analyse déontologique
+        analysis = self.analyze_content(article['titre'], article['contenu'])
+
+        return self._build_result(article, analysis)
+
+    def _build_result(self, article: Dict, analysis: Dict) -> Dict:
+        """Construit le résultat complet d'une analyse"""
+        return {
+            'article_id': article['id'],
+            'titre': article['titre'],
+            'media': article.get('media_name'),
+            'categorie': article.get('categorie'),
+            'date': article.get('date'),
+            'url': article.get('url'),
+            'analyse': analysis,
+            'timestamp_analyse': datetime.now().isoformat()
+        }
+
+    def analyze_articles(self, articles: List[Dict], workers: int = 1, batch: bool = False) -> List[Dict]:
+        """
+        Analyse une liste d'articles
+
+        Args:
+            articles: Articles à analyser
+            workers: Nombre d'appels LLM simultanés (1 = séquentiel), lots compris
+            batch: Regroupe les textes courts dans des prompts communs
+
+        Returns:
+            Résultats complets, dans l'ordre des articles
+        """
+        if batch:
+            analyses = self.analyze_batch(articles, workers=workers)
+            results = [self._build_result(article, analyses[article['id']]) for article in articles]
+            for result in results:
+                print(f"  {result['analyse']['score']}/10 - {result['titre'][:50]}...")
+            return results
+
+        if workers > 1:
+            # Mode concurrent: le limiteur de débit reste partagé entre les threads
+            done = []
+
+            def on_result(index, article, result):
+                done.append(index)
+                print(f"  [{len(done)}/{len(articles)}] {result['analyse']['score']}/10 - {article['titre'][:50]}...")
+
+            return run_concurrent(articles, self.analyze_article, max_workers=workers, on_result=on_result)
+
+        results = []
+        for i, article in enumerate(articles, 1):
+            print(f"\n[{i}/{len(articles)}]")
+            result = self.analyze_article(article)
+            results.append(result)
+
+            # Affichage du résultat
+            print(f"  ✓ Score déontologique : {result['analyse']['score']}/10")
+            print(f"  📝 {result['analyse']['interpretation']}")
+        return results
+
+    def run(self, limit: Optional[int] = None, article_id: Optional[str] = None, output_file: Optional[str] = None,
+            workers: int = 1, batch: bool = False, save: bool = False):
+        """
+        Execute l'analyse sur les articles
+
+        Args:
+            limit: Nombre d'articles à analyser
+            article_id: ID d'un article spécifique
+            output_file: Fichier de sortie pour les résultats (optionnel)
+            workers: Nombre d'appels LLM simultanés (1 = séquentiel)
+            batch: Regroupe les textes courts dans des prompts communs
+            save: Sauvegarde les scores en base de données
+        """
+        try:
+            # Récupération des articles
+            articles = self.get_articles(limit=limit, article_id=article_id)
+
+            if not articles:
+                print("✗ Aucun article trouvé")
+                return
+
+            print(f"\n📊 {len(articles)} article(s) à analyser ({self.backend.name})\n")
+            print("=" * 80)
+
+            results = self.analyze_articles(articles, workers=workers, batch=batch)
+
+            if save:
+                saved = 0
+                for result in results:
+                    if result['analyse']['score'] < 0:
+                        continue
+                    try:
+                        self.save_analysis(result['article_id'], result['analyse'])
+                        saved += 1
+                    except Exception as e:
+                        print(f"  ⚠️  Erreur sauvegarde BD ({result['article_id']}) : {e}")
+                print(f"\n💾 {saved} résultat(s) sauvegardé(s) en base de données")
+
+            print("\n" + "=" * 80)
+            print("\n📄 RÉSUMÉ DES ANALYSES\n")
+
+            # Affichage du résumé
+            for result in results:
+                score = result['analyse']['score']
+                emoji = self._get_score_emoji(score)
+                print(f"{emoji} {score}/10 - {result['titre'][:50]}...")
+
+            # Statistiques
+            valid_scores = [r['analyse']['score'] for r in results if r['analyse']['score'] >= 0]
+            if valid_scores:
+                avg_score = sum(valid_scores) / len(valid_scores)
+                print(f"\n📈 Score moyen : {avg_score:.1f}/10")
+
+            # Sauvegarde dans un fichier si demandé
+            if output_file:
+                self._save_results(results, output_file)
+
+            # Affichage JSON complet
+            print("\n" + "=" * 80)
+            print("📋 RÉSULTATS COMPLETS (JSON)\n")
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+
+        except Exception as e:
+            print(f"✗ Erreur lors de l'exécution : {e}")
+            import traceback
+            traceback.print_exc()
+
+    def _get_score_emoji(self, score: int) -> str:
+        """Retourne un emoji selon le score"""
+        if score == -1:
+            return "⚠️"
+        elif score >= 8:
+            return "✅"
+        elif score >= 6:
+            return "🟡"
+        elif score >= 4:
+            return "🟠"
+        else:
+            return "❌"
+
+    def _save_results(self, results: List[Dict], filename: str):
+        """Sauvegarde les résultats dans un fichier JSON"""
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print(f"\n✓ Résultats sauvegardés dans : {filename}")
+        except Exception as e:
+            print(f"\n✗ Erreur lors de la sauvegarde : {e}")
+
+
+def main(default_backend: str = 'mistral', save_by_default: bool = False):
+    """
+    Point d'entrée principal
+
+    Args:
+        default_backend: Backend utilisé si --backend n'est pas précisé
+        save_by_default: Sauvegarde les scores en base sans --save
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Analyse déontologique d'articles journalistiques"
+    )
+    parser.add_argument(
+        '--backend',
+        choices=list(BACKENDS),
+        default=default_backend,
+        help=f"Backend LLM (défaut: {default_backend})"
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help="Nombre d'articles à analyser (défaut: tous)"
+    )
+    parser.add_argument(
+        '--article-id',
+        type=str,
+        help="ID d'un article spécifique à analyser"
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help="Fichier de sortie pour les résultats JSON"
+    )
+    parser.add_argument(
+        '--env',
+        type=str,
+        default='.env',
+        help="Fichier .env (défaut: .env)"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Nombre d'appels LLM simultanés (défaut: 1, séquentiel)"
+    )
+    parser.add_argument(
+        '--rpm',
+        type=int,
+        help="Requêtes par minute autorisées (défaut: limite du fournisseur)"
+    )
+    parser.add_argument(
+        '--tpm',
+        type=int,
+        help="Tokens par minute autorisés (défaut: limite du fournisseur)"
+    )
+    parser.add_argument(
+        '--token-budget',
+        type=int,
+        help="Tokens de contenu envoyés par article (défaut: budget du fournisseur)"
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help="Regrouper les textes courts dans des prompts communs"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help="Ignorer le mémo des analyses et rappeler le modèle"
+    )
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        default=save_by_default,
+        help="Sauvegarder les scores en base de données"
+    )
+
+    args = parser.parse_args()
+
+    # Chargement depuis .env
+    from dotenv import load_dotenv
+    if os.path.exists(args.env):
+        load_dotenv(args.env)
+    else:
+        load_dotenv()
+
+    # Initialisation et exécution
+    try:
+        backend_class = BACKENDS[args.backend][0]
+        rate_limiter = None
+        if args.rpm or args.tpm:
+            rate_limiter = RateLimiter(args.rpm or backend_class.requests_per_minute,
+                                       args.tpm or backend_class.tokens_per_minute)
+
+        analyzer = DeontologyAnalyzer.from_env(
+            args.backend,
+            rate_limiter=rate_limiter,
+            use_cache=not args.no_cache,
+            token_budget=args.token_budget
+        )
+
+        analyzer.run(
+            limit=args.limit,
+            article_id=args.article_id,
+            output_file=args.output,
+            workers=args.workers,
+            batch=args.batch,
+            save=args.save
+        )
+
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Analyse interrompue par l'utilisateur")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\n✗ Erreur fatale : {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Service d'analyse déontologique en arrière-plan
+Une file d'IDs d'articles non analysés alimente un worker unique qui appelle le LLM
+et persiste les scores dans la table deontology_scores.
+Les routes ne font que lire les scores stockés (aucun appel LLM pendant une requête HTTP).
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from supabase import Client
+
+from deontology_analyzer import SCORES_TABLE, DeontologyAnalyzer
+
+# Nombre maximal d'articles retirés de la file pour une même analyse par lots
+BATCH_SIZE = 10
+
+
+def get_stored_scores(supabase: Client, article_ids: Iterable[str]) -> Dict[str, Dict]:
+    """
+    Récupère les scores déjà calculés
+
+    Args:
+        supabase: Client Supabase
+        article_ids: IDs des articles
+
+    Returns:
+        dict: article_id -> {score, interpretation, analyzed_at}
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return {}
+
+    result = supabase.table(SCORES_TABLE)\
+        .select('article_id, score, interpretation, analyzed_at')\
+        .in_('article_id', article_ids)\
+        .execute()
+    return {row['article_id']: row for row in result.data or []}
+
+
+class DeontologyScoringWorker:
+    """Worker d'analyse déontologique alimenté par une file d'IDs d'articles"""
+
+    def __init__(self, analyzer: DeontologyAnalyzer):
+        """
+        Args:
+            analyzer: Analyseur connecté à Supabase (le débit des appels est régulé par son limiteur)
+        """
+        self.analyzer = analyzer
+        self.supabase: Client = analyzer.supabase
+
+        self._queue: 'queue.Queue[str]' = queue.Queue()
+        # IDs en file ou en cours d'analyse (évite les doublons dans la file)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.stats = {'analyzed': 0, 'errors': 0}
+
+    # ========== FILE ==========
+
+    def enqueue(self, article_ids: Iterable[str]) -> int:
+        """
+        Ajoute des articles à analyser (ignorés s'ils sont déjà en attente)
+
+        Returns:
+            int: Nombre d'articles effectivement ajoutés
+        """
+        added = 0
+        with self._lock:
+            for article_id in article_ids:
+                if article_id and article_id not in self._pending:
+                    self._pending.add(article_id)
+                    self._queue.put(article_id)
+                    added += 1
+        if added:
+            self.start()
+        return added
+
+    def enqueue_unscored(self, limit: int = 100) -> int:
+        """Ajoute à la file les articles récents sans score stocké"""
+        result = self.supabase.table('articles')\
+            .select('id')\
+            .not_.is_('contenu', 'null')\
+            .order('date', desc=True)\
+            .limit(limit)\
+            .execute()
+
+        article_ids = [a['id'] for a in result.data or []]
+        scored = get_stored_scores(self.supabase, article_ids)
+        return self.enqueue(a for a in article_ids if a not in scored)
+
+    def pending_count(self) -> int:
+        """Nombre d'articles en attente d'analyse"""
+        with self._lock:
+            return len(self._pending)
+
+    def is_pending(self, article_id: str) -> bool:
+        with self._lock:
+            return article_id in self._pending
+
+    # ========== WORKER ==========
+
+    def start(self):
+        """Démarre le thread du worker s'il ne tourne pas déjà"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='DeontologyScoringWorker', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Arrête le worker après l'article en cours"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                article_ids = [self._queue.get(timeout=1)]
+            except queue.Empty:
+                continue
+
+            # Les articles déjà en file partent dans le même lot
+            while len(article_ids) < BATCH_SIZE:
+                try:
+                    article_ids.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._score_articles(article_ids)
+            except Exception as e:
+                self.stats['errors'] += len(article_ids)
+                print(f"⚠️ Erreur analyse déontologique ({len(article_ids)} articles): {e}")
+            finally:
+                with self._lock:
+                    self._pending.difference_update(article_ids)
+                for _ in article_ids:
+                    self._queue.task_done()
+
+    def _score_articles(self, article_ids):
+        """Analyse un lot d'articles (textes courts regroupés) et persiste leurs scores"""
+        result = self.supabase.table('articles')\
+            .select('id, titre, contenu')\
+            .in_('id', list(article_ids))\
+            .execute()
+        if not result.data:
+            return
+
+        analyses = self.analyzer.analyze_batch(result.data)
+
+        for article_id, analysis in analyses.items():
+            # Score -1 = échec d'analyse: on ne le persiste pas pour qu'il soit réessayé
+            if analysis['score'] < 0:
+                self.stats['errors'] += 1
+                continue
+
+            self.analyzer.save_analysis(article_id, analysis)
+            self.stats['analyzed'] += 1
+
+
+# ========== INSTANCE PARTAGÉE ==========
+
+_worker: Optional[DeontologyScoringWorker] = None
+_worker_lock = threading.Lock()
+# Configuration absente: retenu pour ne pas retenter from_env à chaque requête
+_worker_disabled = False
+
+
+def get_scoring_worker() -> Optional[DeontologyScoringWorker]:
+    """
+    Retourne le worker partagé du processus (créé au premier appel)
+
+    Le backend est choisi par LLM_BACKEND (mistral par défaut, groq ou local).
+
+    Returns:
+        None si les variables d'environnement nécessaires sont absentes (constaté une
+        seule fois par processus)
+    """
+    global _worker, _worker_disabled
+
+    with _worker_lock:
+        if _worker is not None or _worker_disabled:
+            return _worker
+
+        try:
+            analyzer = DeontologyAnalyzer.from_env(os.getenv('LLM_BACKEND', 'mistral'))
+        except ValueError as e:
+            print(f"⚠️ Worker déontologique désactivé ({e})")
+            _worker_disabled = True
+            return None
+
+        _worker = DeontologyScoringWorker(analyzer)
+        return _worker
+
+
+if __name__ == '__main__':
+    # Mode autonome: analyse en continu les articles récents non scorés
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    worker = get_scoring_worker()
+    if worker is None:
+        raise SystemExit(1)
+
+    try:
+        while True:
+            added = worker.enqueue_unscored(limit=200)
+            print(f"📥 {added} articles ajoutés à la file ({worker.pending_count()} en attente, {worker.stats['analyzed']} analysés)")
+            time.sleep(300)
+    except KeyboardInterrupt:
+        worker.stop()
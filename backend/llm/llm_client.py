@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Outils d'appel aux API LLM partagés par les analyseurs déontologiques
+- Limiteur de débit à seaux de jetons (requêtes/min et tokens/min)
+- Retry avec backoff exponentiel + jitter sur 429 / 5xx
+- Exécution concurrente avec un nombre borné de requêtes en vol
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional
+
+
+def _network_errors():
+    """
+    Erreurs réseau transitoires des bibliothèques HTTP installées
+    Aucune ne dérive de ConnectionError / TimeoutError: requests (appels directs),
+    httpx (SDK Mistral) et le SDK Groq ont leurs propres classes.
+    """
+    errors = [ConnectionError, TimeoutError]
+    try:
+        import requests
+        errors += [requests.ConnectionError, requests.Timeout]
+    except ImportError:
+        pass
+    try:
+        import httpx
+        errors += [httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError]
+    except ImportError:
+        pass
+    try:
+        import groq
+        # APITimeoutError dérive de APIConnectionError
+        errors.append(groq.APIConnectionError)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+NETWORK_ERRORS = _network_errors()
+
+
+class TokenBucket:
+    """Seau de jetons thread-safe: `capacity` jetons, rechargé de `rate` jetons/seconde"""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0):
+        """Bloque jusqu'à ce que `amount` jetons soient disponibles puis les consomme"""
+        # Une demande plus grosse que le seau ne pourrait jamais être servie
+        amount = min(float(amount), self.capacity)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Respecte un budget de requêtes/minute et (optionnellement) de tokens/minute"""
+
+    def __init__(self, requests_per_minute: int = 60, tokens_per_minute: Optional[int] = None):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0) if tokens_per_minute else None
+
+    def acquire(self, estimated_tokens: int = 0):
+        """Attend qu'une requête de `estimated_tokens` tokens puisse partir"""
+        self.requests.acquire(1)
+        if self.tokens and estimated_tokens:
+            self.tokens.acquire(estimated_tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière du nombre de tokens (~4 caractères par token)"""
+    return max(1, len(text or '') // 4)
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """Extrait le code HTTP d'une erreur des SDK Mistral / Groq / requests"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """429 (rate limit), 5xx et erreurs réseau sont réessayés"""
+    status = get_status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, NETWORK_ERRORS)
+
+
+def call_with_retry(func: Callable, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+    """
+    Appelle func() en réessayant les erreurs transitoires
+
+    Backoff exponentiel avec "full jitter": attente aléatoire dans [0, base * 2^tentative],
+    plafonnée à max_delay. Les autres erreurs sont propagées immédiatement.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            print(f"  ⏳ Erreur transitoire ({get_status_code(e) or type(e).__name__}), nouvel essai dans {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+
+def run_concurrent(items: Iterable, func: Callable, max_workers: int = 4,
+                   on_result: Optional[Callable] = None) -> List:
+    """
+    Applique func à chaque élément avec au plus `max_workers` appels en vol
+
+    Args:
+        items: Éléments à traiter
+        func: Fonction appelée pour chaque élément
+        max_workers: Nombre maximal d'appels simultanés
+        on_result: Callback (index, item, result) appelé à chaque fin de traitement
+
+    Returns:
+        Résultats dans l'ordre des éléments
+    """
+    items = list(items)
+    results = [None] * len(items)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_result:
+                on_result(index, items[index], results[index])
+
+    return results
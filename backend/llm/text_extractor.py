@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Réduction extractive des articles longs avant analyse LLM
+Au lieu de couper le texte à N caractères, on garde le chapeau (premier paragraphe, ou
+premières phrases quand le texte stocké est sur une seule ligne),
+les citations et les phrases les plus informatives (score TF-IDF par phrase)
+jusqu'à un budget de tokens, dans l'ordre d'origine.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List
+
+from llm_client import estimate_tokens
+
+
+# Séparateur inséré entre deux passages non contigus
+GAP_MARKER = ' [...] '
+
+# Part maximale du budget réservée aux citations (propos rapportés: cœur de l'analyse)
+QUOTES_BUDGET_SHARE = 0.5
+# Bonus par mot du titre présent dans la phrase
+TITLE_BONUS = 0.3
+# Chapeau d'un texte sans paragraphes (contenu normalisé sur une ligne): premières phrases
+LEAD_SENTENCES = 2
+
+_PARAGRAPHS = re.compile(r'\n\s*\n|\n')
+_SENTENCES = re.compile(r'(?<=[.!?…»"])\s+(?=[«"A-ZÀ-ÖØ-Þ0-9])')
+_WORDS = re.compile(r"[a-zà-öø-ÿ0-9]+", re.IGNORECASE)
+_QUOTES = re.compile(r'«[^»]{10,}»|“[^”]{10,}”|"[^"]{10,}"')
+
+# Mots vides fréquents: sans valeur pour distinguer les phrases
+STOPWORDS = frozenset("""
+a au aux avec ce ces cet cette dans de des du elle en et est il ils je la le les leur lui mais me
+ne nous on ou par pas pour qu que qui sa se ses son sont sur ta te tes ton tu un une vos votre vous
+y été être avoir ont été fait plus comme aussi tout tous très bien d l n s c j m
+""".split())
+
+
+def split_sentences(text: str) -> List[List[str]]:
+    """Découpe le texte en paragraphes, chacun en phrases"""
+    paragraphs = [p.strip() for p in _PARAGRAPHS.split(text) if p.strip()]
+    return [[s.strip() for s in _SENTENCES.split(p) if s.strip()] for p in paragraphs]
+
+
+def _terms(sentence: str) -> List[str]:
+    return [w for w in (m.lower() for m in _WORDS.findall(sentence)) if w not in STOPWORDS and len(w) > 2]
+
+
+def score_sentences(sentences: List[str], titre: str = '') -> List[float]:
+    """
+    Score TF-IDF de chaque phrase (chaque phrase est un "document")
+
+    Somme des poids TF-IDF de ses termes normalisée par sqrt(nombre de termes), plus un
+    bonus pour les mots du titre.
+    """
+    terms_by_sentence = [_terms(s) for s in sentences]
+    doc_freq = Counter(t for terms in terms_by_sentence for t in set(terms))
+    term_freq = Counter(t for terms in terms_by_sentence for t in terms)
+    max_freq = max(term_freq.values(), default=1)
+    n = len(sentences)
+    title_terms = set(_terms(titre))
+
+    scores = []
+    for sentence, terms in zip(sentences, terms_by_sentence):
+        if not terms:
+            scores.append(0.0)
+            continue
+
+        # TF sur l'article entier (sujets centraux), IDF par phrase (termes discriminants)
+        unique = set(terms)
+        weight = sum(term_freq[t] / max_freq * math.log(1 + n / doc_freq[t]) for t in unique)
+        score = weight / math.sqrt(len(terms))
+        score += TITLE_BONUS * len(title_terms & unique)
+        scores.append(score)
+
+    return scores
+
+
+def extract_for_budget(contenu: str, token_budget: int, titre: str = '') -> str:
+    """
+    Réduit le contenu à `token_budget` tokens environ
+
+    Le chapeau est toujours conservé (tronqué s'il dépasse à lui seul le budget), puis les
+    citations (jusqu'à QUOTES_BUDGET_SHARE du budget), puis les autres phrases par score
+    décroissant tant que le budget le permet.
+
+    Returns:
+        Le contenu inchangé s'il tient dans le budget, sinon l'extrait
+    """
+    if not contenu or estimate_tokens(contenu) <= token_budget:
+        return contenu
+
+    paragraphs = split_sentences(contenu)
+    if not paragraphs:
+        return contenu
+
+    if len(paragraphs) == 1:
+        # Pas de saut de paragraphe: le chapeau est fait des premières phrases
+        sentences = paragraphs[0]
+        lead_sentences = sentences[:LEAD_SENTENCES]
+        # Deuxième phrase abandonnée si le chapeau dépasse alors le budget
+        if len(lead_sentences) > 1 and estimate_tokens(' '.join(lead_sentences)) >= token_budget:
+            lead_sentences = lead_sentences[:1]
+        lead = ' '.join(lead_sentences)
+        rest = sentences[len(lead_sentences):]
+    else:
+        lead = ' '.join(paragraphs[0])
+        # Phrases hors chapeau, dans l'ordre du texte
+        rest = [sentence for paragraph in paragraphs[1:] for sentence in paragraph]
+
+    if estimate_tokens(lead) >= token_budget:
+        return lead[:token_budget * 4]
+
+    scores = score_sentences(rest, titre)
+    by_score = sorted(range(len(rest)), key=lambda i: scores[i], reverse=True)
+    quotes = [i for i in by_score if _QUOTES.search(rest[i])]
+
+    used = estimate_tokens(lead)
+    selected = set()
+
+    def select(indexes, limit):
+        nonlocal used
+        for index in indexes:
+            # +2: séparateur éventuel entre passages
+            cost = estimate_tokens(rest[index]) + 2
+            if index in selected or used + cost > limit:
+                continue
+            selected.add(index)
+            used += cost
+
+    select(quotes, used + token_budget * QUOTES_BUDGET_SHARE)
+    select(by_score, token_budget)
+
+    parts = [lead]
+    previous = -1
+    for index in sorted(selected):
+        parts.append((' ' if index == previous + 1 else GAP_MARKER) + rest[index])
+        previous = index
+
+    return ''.join(parts).strip()
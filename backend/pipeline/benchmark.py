@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks hors ligne des étapes du pipeline (aucune connexion réseau ni base)
+
+Usage (depuis backend/pipeline):
+    python benchmark.py normalize --articles 50000
+    python benchmark.py parse --repeat 20 [--backend lxml --backend bs4] [--fixtures DIR]
+    python benchmark.py scrape --repeat 5 [--site lefaso] [--backend lxml]
+    python benchmark.py record --site lefaso --max-articles 5   # seule commande en ligne
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import logging
+import random
+import sys
+import time
+import tracemalloc
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter les paths pour les imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.cleaner import DataCleaner
+from utils.normalizer import ArticleNormalizer
+
+# Pages enregistrées par site: <site>-section.html et <site>-article.html
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'html'
+SCRAPERS = {
+    'lefaso': ('scrapers.web.lefaso_scraper', 'LeFasoScraper'),
+    'sidwaya': ('scrapers.web.sidwaya_scraper', 'SidwayaScraper'),
+    'fasopresse': ('scrapers.web.fasopresse_scraper', 'FasoPresseScraper'),
+    'observateur': ('scrapers.web.observateur_scraper', 'ObservateurScraper'),
+    'burkina24': ('scrapers.web.burkina24_scraper', 'Burkina24Scraper'),
+}
+# Cassettes enregistrées par site (python benchmark.py record): <site>.json.gz
+CASSETTES_DIR = Path(__file__).parent / 'fixtures' / 'cassettes'
+# Champs comparés entre moteurs (la date relative de Burkina24 dépend de l'heure)
+COMPARED_FIELDS = ('titre', 'contenu', 'auteur', 'commentaires')
+
+MEDIAS = ['LeFaso', 'Sidwaya', 'FasoPresse', "L'Observateur Paalga", 'Burkina24']
+
+WORDS = ("le gouvernement a annoncé une nouvelle mesure pour la population de Ouagadougou "
+         "selon le ministre les travaux commenceront la semaine prochaine dans plusieurs régions "
+         "les habitants saluent cette décision tandis que certains dénoncent un scandale").split()
+
+
+def make_raw_articles(count, seed=42):
+    """
+    Articles bruts synthétiques tels que sortis des scrapers: espaces et sauts de ligne
+    irréguliers, ~5% invalides (titre, URL, média, métriques) et ~3% de doublons d'URL
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    articles = []
+    for i in range(count):
+        paragraphs = ['  '.join(rng.choices(WORDS, k=rng.randint(30, 80))) for _ in range(rng.randint(3, 12))]
+        url_index = i if rng.random() > 0.03 else rng.randint(0, max(0, i - 1))
+        article = {
+            'id': f"{i:064x}",
+            'media': rng.choice(MEDIAS),
+            'titre': '\n  ' + ' '.join(rng.choices(WORDS, k=rng.randint(6, 16))).capitalize() + '\t ',
+            'contenu': '\r\n\r\n'.join(paragraphs),
+            'url': f"https://media.bf/article-{url_index}",
+            'date': now - timedelta(minutes=i),
+            'categorie': rng.choice(['politique', 'Sport', 'economie', None]),
+            'likes': rng.randint(0, 500),
+            'commentaires': str(rng.randint(0, 50)),
+            'partages': None,
+            'auteur': '  Rédaction ',
+            'type_source': 'article',
+            'plateforme': 'web'
+        }
+
+        defect = rng.random()
+        if defect < 0.01:
+            article['titre'] = 'Court'
+        elif defect < 0.02:
+            article['url'] = 'media.bf/sans-schema'
+        elif defect < 0.03:
+            article['media'] = 'Média inconnu'
+        elif defect < 0.04:
+            article['likes'] = -3
+        elif defect < 0.05:
+            article['contenu'] = ''
+        articles.append(article)
+    return articles
+
+
+@contextlib.contextmanager
+def quiet():
+    """Sorties console et journaux coupés (messages par article hors mesure)"""
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def run_normalize(args):
+    articles = make_raw_articles(args.articles)
+    media_ids = {name: index for index, name in enumerate(MEDIAS, 1)}
+    print(f"📊 {len(articles)} articles bruts synthétiques\n")
+
+    def report(name, elapsed, valid):
+        print(f"{name:<34} {elapsed:7.2f}s {len(articles) / elapsed:10.0f} art/s {valid:7d} valides")
+
+    # Avant: DataCleaner.clean_batch + deduplicate, puis clean_article_for_db + validate_article_for_db
+    # supabase_client se connecte dès son import: remplacé par un module vide, seules les
+    # méthodes de validation (sans requête) sont mesurées
+    if 'supabase_client' not in sys.modules:
+        offline_client = types.ModuleType('supabase_client')
+        offline_client.get_supabase_client = None
+        sys.modules['supabase_client'] = offline_client
+    try:
+        from utils.db_writer import DatabaseWriter
+    except ImportError as e:
+        print(f"⚠️ Chaîne d'origine ignorée (dépendance manquante: {e})")
+    else:
+        writer = DatabaseWriter.__new__(DatabaseWriter)
+        writer.media_ids = media_ids
+        writer.category_ids = {}
+        start = time.perf_counter()
+        # Sorties console et journaux (avertissements par article) hors mesure
+        with quiet():
+            cleaned = DataCleaner.deduplicate(DataCleaner.clean_batch(articles))
+            valid = 0
+            for article in cleaned:
+                is_valid, _ = writer.validate_article_for_db(writer.clean_article_for_db(article))
+                valid += is_valid
+        report("avant (3 passes)", time.perf_counter() - start, valid)
+
+    normalizer = ArticleNormalizer(media_ids.get)
+    start = time.perf_counter()
+    records, _, _ = normalizer.normalize_batch(articles)
+    report("après (une passe)", time.perf_counter() - start, len(records))
+
+
+def run_parse(args):
+    try:
+        from scrapers.web.html_document import available_backends, parse_html
+        scrapers = {site: getattr(importlib.import_module(module), name)()
+                    for site, (module, name) in SCRAPERS.items()}
+    except ImportError as e:
+        print(f"❌ Scrapers indisponibles (dépendance manquante: {e})")
+        return
+
+    backends = args.backend or available_backends()
+    fixtures = Path(args.fixtures)
+    print(f"📊 Analyse + extraction, {args.repeat} répétitions par page ({fixtures})\n")
+    print(f"{'site':<12} {'moteur':<11} {'analyse':>10} {'extraction':>11} {'total':>9} {'gain':>6}  résultat")
+
+    for site, scraper in scrapers.items():
+        section = (fixtures / f"{site}-section.html").read_bytes()
+        article = (fixtures / f"{site}-article.html").read_bytes()
+
+        reference = None
+        rows = []
+        for backend in backends:
+            parse_time = extract_time = 0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                section_doc = parse_html(section, backend)
+                article_doc = parse_html(article, backend)
+                parsed = time.perf_counter()
+                urls = scraper.extract_article_urls(section_doc, 20)
+                result = scraper.extract_article(article_doc, urls[0] if urls else site)
+                extract_time += time.perf_counter() - parsed
+                parse_time += parsed - start
+
+            # Par page (section + article = 2 pages par répétition), en ms
+            pages = 2 * args.repeat
+            parse_ms = parse_time / pages * 1000
+            extract_ms = extract_time / pages * 1000
+            total_ms = parse_ms + extract_ms
+
+            outcome = (urls, {field: (result or {}).get(field) for field in COMPARED_FIELDS})
+            if reference is None:
+                reference = outcome
+                check = f"{len(urls)} URLs, {len((result or {}).get('contenu', ''))} car."
+            else:
+                check = "identique" if outcome == reference else "⚠️ DIFFÉRENT"
+            rows.append((backend, parse_ms, extract_ms, total_ms, check))
+
+        # Gain par rapport à BeautifulSoup (ancien moteur) s'il a été mesuré
+        baseline = next((row[3] for row in rows if row[0] == 'bs4'), None)
+        for backend, parse_ms, extract_ms, total_ms, check in rows:
+            gain = f"{baseline / total_ms:5.1f}x" if baseline else '     -'
+            print(f"{site:<12} {backend:<11} {parse_ms:8.2f}ms {extract_ms:9.2f}ms {total_ms:7.2f}ms {gain}  {check}")
+
+
+def load_scraper(site):
+    module, name = SCRAPERS[site]
+    return getattr(importlib.import_module(module), name)()
+
+
+def fixture_cassette(scraper, site, fixtures=FIXTURES_DIR):
+    """
+    Cassette construite depuis les pages enregistrées du site (sans enregistrement réel):
+    la page de section pour chaque rubrique, la page d'article pour chaque lien listé
+    """
+    from scrapers.web.cassette import Cassette
+    from scrapers.web.html_document import parse_html
+
+    section = (fixtures / f"{site}-section.html").read_bytes()
+    article = (fixtures / f"{site}-article.html").read_bytes()
+    cassette = Cassette()
+    for section_url in scraper.sections.values():
+        cassette.add(section_url, section)
+    for url, _ in scraper.extract_listing(parse_html(section, scraper.html_backend)):
+        cassette.add(url, article)
+    return cassette
+
+
+def run_record(args):
+    try:
+        from scrapers.web.cassette import Cassette
+    except ImportError as e:
+        print(f"❌ Scrapers indisponibles (dépendance manquante: {e})")
+        return
+
+    for site in args.site or SCRAPERS:
+        scraper = load_scraper(site)
+        scraper.discovery = args.discovery
+        path = CASSETTES_DIR / f"{site}.json.gz"
+        cassette = Cassette(path, mode='record', session=scraper.session)
+        scraper.session = cassette
+        articles = scraper.scrape_all_sections(args.max_articles)
+        cassette.save()
+        print(f"📼 {site}: {len(cassette.interactions)} réponses, {len(articles)} articles → {path}")
+
+
+def run_scrape(args):
+    try:
+        from scrapers.web.cassette import Cassette
+        from scrapers.web import base_scraper
+    except ImportError as e:
+        print(f"❌ Scrapers indisponibles (dépendance manquante: {e})")
+        return
+
+    print(f"📊 Scrapers rejoués hors ligne, {args.repeat} passages par site\n")
+    print(f"{'site':<12} {'source':<9} {'pages':>5} {'articles':>8} {'passage':>9} {'pages/s':>8} "
+          f"{'analyse':>9} {'reste':>8} {'pic mém.':>9}")
+
+    for site in args.site or SCRAPERS:
+        scraper = load_scraper(site)
+        scraper.discovery = args.discovery
+        if args.backend:
+            scraper.html_backend = args.backend
+
+        path = CASSETTES_DIR / f"{site}.json.gz"
+        if path.exists():
+            cassette, source = Cassette(path), 'cassette'
+        else:
+            cassette, source = fixture_cassette(scraper, site), 'fixtures'
+        scraper.session = cassette
+
+        # Temps d'analyse HTML: parse_html appelé par make_request
+        parse_time = [0.0]
+        parse_html = base_scraper.parse_html
+
+        def timed_parse(*a, **k):
+            start = time.perf_counter()
+            try:
+                return parse_html(*a, **k)
+            finally:
+                parse_time[0] += time.perf_counter() - start
+
+        base_scraper.parse_html = timed_parse
+        try:
+            total = 0.0
+            pages_before = cassette.hits + cassette.misses
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with quiet():
+                    articles = scraper.scrape_all_sections(args.max_articles)
+                total += time.perf_counter() - start
+            pages = (cassette.hits + cassette.misses - pages_before) / args.repeat
+            parse_per_run = parse_time[0] / args.repeat
+
+            # Allocations Python (hors mémoire native des moteurs C): un passage de plus sous tracemalloc
+            tracemalloc.start()
+            with quiet():
+                scraper.scrape_all_sections(args.max_articles)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            base_scraper.parse_html = parse_html
+
+        run_ms = total / args.repeat * 1000
+        parse_ms = parse_per_run / pages * 1000 if pages else 0
+        # Articles analysés en parallèle: la somme des analyses peut dépasser la durée du passage
+        other_ms = max(0.0, run_ms - parse_per_run * 1000) / pages if pages else 0
+        print(f"{site:<12} {source:<9} {pages:5.0f} {len(articles):8d} {run_ms:7.0f}ms "
+              f"{pages / (total / args.repeat):8.0f} {parse_ms:7.2f}ms {other_ms:6.2f}ms {peak / 2**20:7.1f}Mo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne du pipeline")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    normalize = commands.add_parser('normalize', help="Nettoyage + validation des articles")
+    normalize.add_argument('--articles', type=int, default=50000, help="Nombre d'articles synthétiques")
+    normalize.set_defaults(func=run_normalize)
+
+    parse = commands.add_parser('parse', help="Analyse HTML + extraction des scrapers sur pages enregistrées")
+    parse.add_argument('--repeat', type=int, default=20, help="Répétitions par page")
+    parse.add_argument('--backend', action='append', choices=['bs4', 'lxml', 'selectolax'],
+                       help="Moteur à mesurer (répétable, défaut: tous ceux installés)")
+    parse.add_argument('--fixtures', default=str(FIXTURES_DIR), help="Dossier des pages enregistrées")
+    parse.set_defaults(func=run_parse)
+
+    scrape = commands.add_parser('scrape', help="Scrapers complets rejoués depuis les cassettes (ou les pages enregistrées)")
+    scrape.add_argument('--site', action='append', choices=list(SCRAPERS), help="Site à mesurer (répétable)")
+    scrape.add_argument('--repeat', type=int, default=5, help="Passages par site")
+    scrape.add_argument('--max-articles', type=int, default=20, help="Articles max par rubrique")
+    scrape.add_argument('--backend', choices=['bs4', 'lxml', 'selectolax'], help="Moteur HTML (défaut: configuré)")
+    scrape.add_argument('--discovery', default='sections', choices=['auto', 'feeds', 'sections'],
+                        help="Mode de découverte des articles")
+    scrape.set_defaults(func=run_scrape)
+
+    record = commands.add_parser('record', help="Enregistre une cassette par site (accès réseau)")
+    record.add_argument('--site', action='append', choices=list(SCRAPERS), help="Site à enregistrer (répétable)")
+    record.add_argument('--max-articles', type=int, default=5, help="Articles max par rubrique")
+    record.add_argument('--discovery', default='sections', choices=['auto', 'feeds', 'sections'],
+                        help="Mode de découverte des articles")
+    record.set_defaults(func=run_record)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
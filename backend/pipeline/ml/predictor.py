@@ -6,11 +6,15 @@ Utilise un modèle pré-entraîné pour classifier automatiquement les articles
 Supporte: pickle (.pkl) et TensorFlow Lite (.tflite)
 """
 
+import logging
 import pickle
 import os
+import threading
 from pathlib import Path
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 class CategoryPredictor:
     """Prédit la catégorie d'un article avec un modèle ML"""
     
@@ -28,6 +32,8 @@ class CategoryPredictor:
         self.tflite_interpreter = None
         self.tflite_input_details = None
         self.tflite_output_details = None
+        # L'interpréteur TFLite n'est pas réentrant (prédicteur partagé entre passages)
+        self._tflite_lock = threading.Lock()
         
         # Chercher model.tflite en priorité
         if not tflite_model_path:
@@ -43,9 +49,9 @@ class CategoryPredictor:
                 self.tflite_interpreter.allocate_tensors()
                 self.tflite_input_details = self.tflite_interpreter.get_input_details()
                 self.tflite_output_details = self.tflite_interpreter.get_output_details()
-                print(f"✅ Modèle TFLite chargé: {tflite_model_path}")
+                logger.info("✅ Modèle TFLite chargé: %s", tflite_model_path)
             except Exception as e:
-                print(f"⚠️ Erreur chargement TFLite: {e}")
+                logger.warning("⚠️ Erreur chargement TFLite: %s", e)
                 self.tflite_interpreter = None
         
         # Chercher les fichiers pickle si TFLite non disponible
@@ -75,21 +81,21 @@ class CategoryPredictor:
                 try:
                     with open(model_path, 'rb') as f:
                         self.model = pickle.load(f)
-                    print(f"✅ Modèle chargé: {model_path}")
+                    logger.info("✅ Modèle chargé: %s", model_path)
                 except Exception as e:
-                    print(f"❌ Erreur chargement modèle: {e}")
+                    logger.error("❌ Erreur chargement modèle: %s", e)
             else:
-                print(f"⚠️ Modèle non trouvé: {model_path}")
+                logger.warning("⚠️ Modèle non trouvé: %s", model_path)
             
             if vectorizer_path and os.path.exists(vectorizer_path):
                 try:
                     with open(vectorizer_path, 'rb') as f:
                         self.vectorizer = pickle.load(f)
-                    print(f"✅ Vectorizer chargé: {vectorizer_path}")
+                    logger.info("✅ Vectorizer chargé: %s", vectorizer_path)
                 except Exception as e:
-                    print(f"❌ Erreur chargement vectorizer: {e}")
+                    logger.error("❌ Erreur chargement vectorizer: %s", e)
             else:
-                print(f"⚠️ Vectorizer non trouvé: {vectorizer_path}")
+                logger.warning("⚠️ Vectorizer non trouvé: %s", vectorizer_path)
         
         # Catégories EXACTES du modèle CamemBERT (8 classes)
         self.default_categories = [
@@ -128,26 +134,27 @@ class CategoryPredictor:
                 # Préparer les inputs CamemBERT (3 tenseurs INT32)
                 inputs = self._prepare_tflite_input(text)
                 
-                # Set les 3 tenseurs d'entrée
-                self.tflite_interpreter.set_tensor(
-                    self.tflite_input_details[0]['index'], 
-                    inputs['input_ids']
-                )
-                self.tflite_interpreter.set_tensor(
-                    self.tflite_input_details[1]['index'], 
-                    inputs['attention_mask']
-                )
-                if len(self.tflite_input_details) > 2:
+                with self._tflite_lock:
+                    # Set les 3 tenseurs d'entrée
                     self.tflite_interpreter.set_tensor(
-                        self.tflite_input_details[2]['index'], 
-                        inputs['token_type_ids']
+                        self.tflite_input_details[0]['index'], 
+                        inputs['input_ids']
                     )
-                
-                # Exécuter l'inférence
-                self.tflite_interpreter.invoke()
-                
-                # Récupérer le résultat
-                output_data = self.tflite_interpreter.get_tensor(self.tflite_output_details[0]['index'])
+                    self.tflite_interpreter.set_tensor(
+                        self.tflite_input_details[1]['index'], 
+                        inputs['attention_mask']
+                    )
+                    if len(self.tflite_input_details) > 2:
+                        self.tflite_interpreter.set_tensor(
+                            self.tflite_input_details[2]['index'], 
+                            inputs['token_type_ids']
+                        )
+                    
+                    # Exécuter l'inférence
+                    self.tflite_interpreter.invoke()
+                    
+                    # Récupérer le résultat
+                    output_data = self.tflite_interpreter.get_tensor(self.tflite_output_details[0]['index'])
                 predicted_index = np.argmax(output_data[0])
                 
                 if predicted_index < len(self.tflite_categories):
@@ -155,7 +162,7 @@ class CategoryPredictor:
                 else:
                     return 'Autre'
             except Exception as e:
-                print(f"⚠️ Erreur prédiction TFLite: {e}, fallback vers keywords")
+                logger.warning("⚠️ Erreur prédiction TFLite: %s, fallback vers keywords", e, extra={'sample': 50})
                 return self._fallback_prediction(text)
         
         # Sinon utiliser pickle
@@ -169,7 +176,7 @@ class CategoryPredictor:
                 
                 return category
             except Exception as e:
-                print(f"❌ Erreur prédiction: {e}")
+                logger.warning("❌ Erreur prédiction: %s", e, extra={'sample': 50})
                 return self._fallback_prediction(text)
         else:
             return self._fallback_prediction(text)
@@ -296,8 +303,6 @@ class CategoryPredictor:
         Returns:
             Liste d'articles avec 'categorie' ajoutée
         """
-        print(f"\n🤖 Prédiction des catégories pour {len(articles)} articles...")
-        
         for article in articles:
             # Combiner titre et contenu pour la prédiction
             text = f"{article.get('titre', '')} {article.get('contenu', '')}"
@@ -312,9 +317,9 @@ class CategoryPredictor:
             cat = article.get('categorie', 'Autre')
             categories[cat] = categories.get(cat, 0) + 1
         
-        print(f"✅ Catégories prédites:")
-        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
-            print(f"   - {cat}: {count}")
+        logger.info("🤖 Catégories prédites pour %d articles", len(articles), extra={
+            'categories': dict(sorted(categories.items(), key=lambda x: x[1], reverse=True))
+        })
         
         return articles
 
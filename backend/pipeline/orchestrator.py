@@ -2,12 +2,18 @@
 # -*- coding: utf-8 -*-
 """
 Orchestrateur principal du pipeline de scraping
-Coordonne: Scraping (Web + Facebook) → ML Prediction → Cleaning → Database Insertion → CSV Export
+Coordonne: Scraping (Web + Facebook) → ML Prediction → Cleaning → Database Insertion (→ journal d'audit optionnel)
+
+Le pipeline complet est en flux: les médias sont scrapés en parallèle et chaque lot
+d'articles traverse prédiction → nettoyage/validation → insertion pendant que les
+autres médias sont encore en cours de scraping (files bornées entre les étapes).
 """
 
 import sys
 import os
-import csv
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -24,37 +30,72 @@ from scrapers.web.sidwaya_scraper import SidwayaScraper
 from scrapers.web.fasopresse_scraper import FasoPresseScraper
 from scrapers.web.observateur_scraper import ObservateurScraper
 from scrapers.web.burkina24_scraper import Burkina24Scraper
+from scrapers.web.url_registry import UrlRegistry
 # Facebook scraper retiré - on utilise les JSON déjà scrapés
 from ml.predictor import CategoryPredictor
-from utils.cleaner import DataCleaner
 from utils.db_writer import DatabaseWriter
 from utils.date_manager import DateManager
+from utils.audit_sink import AuditSink
+from utils.normalizer import ArticleNormalizer
+from utils.streaming import END, Stage, bounded_queue, chunked
+from utils.metrics import METRICS
+from utils.log import configure_logging
 from supabase_client import get_supabase_client
 
 
+# Articles par lot circulant entre les étapes
+STREAM_BATCH_SIZE = 20
+# Lots en attente au maximum dans chaque file (borne la mémoire)
+STREAM_QUEUE_SIZE = 4
+# Exemples de titres conservés par motif de rejet
+REJECT_EXAMPLES = 3
+
+logger = logging.getLogger(__name__)
+
+
+def create_web_scrapers(media_names=None):
+    """
+    Instancie les scrapers web (sans requête réseau)
+    
+    Args:
+        media_names: Noms des médias à garder (défaut: tous)
+    """
+    scrapers = [
+        LeFasoScraper(),
+        SidwayaScraper(),
+        FasoPresseScraper(),
+        ObservateurScraper(),
+        Burkina24Scraper()
+    ]
+    if media_names is not None:
+        scrapers = [scraper for scraper in scrapers if scraper.media_name in media_names]
+    return scrapers
+
+
 class PipelineOrchestrator:
     """Orchestre l'exécution complète du pipeline de scraping"""
     
-    def __init__(self, include_facebook=False):
-        print(f"\n{'='*70}")
-        print(f"🚀 PIPELINE DE SCRAPING AUTOMATIQUE - MONITORING MÉDIATIQUE")
-        print(f"{'='*70}")
-        print(f"Démarré: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    def __init__(self, include_facebook=False, on_event=None, media_names=None,
+                 predictor=None, db_writer=None):
+        """
+        Args:
+            include_facebook: Ignoré (Facebook a son propre orchestrateur)
+            media_names: Médias à scraper (défaut: tous), pour les passages par média
+            on_event: Callback optionnel on_event(event_type, data) appelé à chaque étape
+                      ('progress') et pour les stats de chaque média ('media_stats')
+            predictor: CategoryPredictor déjà chargé (scheduler: modèle chargé une fois)
+            db_writer: DatabaseWriter partagé (scheduler: médias et catégories chargés une fois)
+        """
+        logger.info("🚀 Pipeline de scraping web: initialisation")
         
         # Initialiser le client Supabase
         self.supabase = get_supabase_client()
         
         # Initialiser le gestionnaire de dates
-        self.date_manager = DateManager()
+        self.date_manager = DateManager(media_names)
         
         # Initialiser les scrapers WEB
-        self.scrapers = [
-            LeFasoScraper(),
-            SidwayaScraper(),
-            FasoPresseScraper(),
-            ObservateurScraper(),
-            Burkina24Scraper()
-        ]
+        self.scrapers = create_web_scrapers(media_names)
         
         # Facebook scraping désactivé - on utilise les JSON déjà générés
         self.include_facebook = False
@@ -64,12 +105,18 @@ class PipelineOrchestrator:
         for scraper in self.scrapers:
             last_date = self.date_manager.get_last_date(scraper.media_name)
             scraper.set_last_publication_date(last_date)
-            print(f"📅 {scraper.media_name}: Dernière publication = {last_date.strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info("📅 %s: dernière publication = %s", scraper.media_name, last_date.strftime('%Y-%m-%d %H:%M:%S'),
+                        extra={'media': scraper.media_name})
         
         # Initialiser les modules
-        self.predictor = CategoryPredictor()
-        self.cleaner = DataCleaner()
-        self.db_writer = DatabaseWriter()
+        self.predictor = predictor or CategoryPredictor()
+        
+        # Mesures du passage (reportées dans le registre du processus exporté par /metrics)
+        self.metrics = METRICS.child()
+        self.db_writer = (db_writer or DatabaseWriter()).with_metrics(self.metrics)
+        self.normalizer = ArticleNormalizer(self.db_writer.get_media_id)
+        for scraper in self.scrapers:
+            scraper.set_metrics(self.metrics)
         
         # Statistiques
         self.stats = {
@@ -77,218 +124,83 @@ class PipelineOrchestrator:
             'total_cleaned': 0,
             'total_inserted': 0,
             'total_skipped': 0,
-            'total_errors': 0
+            'total_errors': 0,
+            'fetches_saved': 0,
+            'date_failures': 0
         }
         
+        # URLs demandées pendant le passage (toutes rubriques, tous médias)
+        self.url_registry = None
+        
         # Détails par média (pour scraping_media_details)
         self.media_stats = {}
         
         # ID du log en cours (pour enregistrement en BD)
         self.scraping_log_id = None
         
-        # Liste des fichiers CSV temporaires créés (pour suppression auto)
-        self.temp_csv_files = []
-    
-    def run_scraping(self, max_articles_per_section=20, facebook_max_posts=50):
-        """
-        Étape 1: Scrape tous les médias (Web + Facebook)
-        
-        Args:
-            max_articles_per_section: Nombre max d'articles par section (web)
-            facebook_max_posts: Nombre max de posts Facebook
-        
-        Returns:
-            Liste d'articles bruts
-        """
-        print(f"\n{'='*70}")
-        print(f"📰 ÉTAPE 1: SCRAPING DES MÉDIAS")
-        print(f"{'='*70}\n")
-        
-        all_articles = []
-        
-        # Scraper les sites web
-        for scraper in self.scrapers:
-            try:
-                articles = scraper.scrape_all_sections(max_articles_per_section)
-                all_articles.extend(articles)
-                
-                # Enregistrer les stats par média
-                media_name = scraper.media_name
-                if media_name not in self.media_stats:
-                    self.media_stats[media_name] = {
-                        'scraped': 0,
-                        'inserted': 0,
-                        'skipped': 0,
-                        'last_article_date': None
-                    }
-                
-                self.media_stats[media_name]['scraped'] = len(articles)
-                
-                # Trouver la date du dernier article
-                if articles:
-                    dates = [a.get('date') for a in articles if a.get('date')]
-                    if dates:
-                        self.media_stats[media_name]['last_article_date'] = max(dates)
-                
-                print(f"✅ {scraper.media_name}: {len(articles)} articles scrapés")
-            except Exception as e:
-                print(f"❌ Erreur scraping {scraper.media_name}: {e}")
-        
-        # Facebook scraping désactivé - utilisera les JSON via facebook_orchestrator.py séparé
+        # Journal d'audit des articles validés (désactivé sauf PIPELINE_AUDIT_DIR)
+        self.audit = AuditSink(prefix='articles_web')
         
-        self.stats['total_scraped'] = len(all_articles)
-        print(f"\n✅ Total scrapé: {len(all_articles)} articles de {len(self.scrapers)} sources")
-        
-        return all_articles
+        # Suivi en temps réel (flux SSE)
+        self.on_event = on_event
     
-    def run_prediction(self, articles):
-        """
-        Étape 2: Prédire les catégories avec ML
-        
-        Args:
-            articles: Liste d'articles
-        
-        Returns:
-            Liste d'articles avec catégories prédites
-        """
-        print(f"\n{'='*70}")
-        print(f"🤖 ÉTAPE 2: PRÉDICTION DES CATÉGORIES (ML)")
-        print(f"{'='*70}")
-        
-        articles = self.predictor.predict_batch(articles)
-        
-        return articles
+    def _emit(self, event_type, **data):
+        """Transmet un événement au callback de suivi s'il est défini"""
+        if self.on_event:
+            self.on_event(event_type, data)
     
-    def run_cleaning(self, articles):
-        """
-        Étape 3: Nettoyer et valider les données
-        
-        Args:
-            articles: Liste d'articles
-        
-        Returns:
-            Liste d'articles nettoyés et validés
-        """
-        print(f"\n{'='*70}")
-        print(f"🧹 ÉTAPE 3: NETTOYAGE ET VALIDATION")
-        print(f"{'='*70}")
-        
-        # Nettoyer
-        articles = self.cleaner.clean_batch(articles)
-        
-        # Supprimer les doublons
-        articles = self.cleaner.deduplicate(articles)
-        
-        self.stats['total_cleaned'] = len(articles)
-        
-        return articles
+    def _emit_media_stats(self, media_name):
+        stats = self.media_stats[media_name]
+        self._emit('media_stats', media=media_name, **{
+            key: value.isoformat() if hasattr(value, 'isoformat') else value
+            for key, value in stats.items()
+        })
     
-    def run_insertion(self, articles):
-        """
-        Étape 4: Insérer dans la base de données
-        
-        Args:
-            articles: Liste d'articles nettoyés
-        
-        Returns:
-            Statistiques d'insertion
-        """
-        print(f"\n{'='*70}")
-        print(f"💾 ÉTAPE 4: INSERTION DANS SUPABASE")
-        print(f"{'='*70}")
-        
-        stats = self.db_writer.insert_batch(articles)
-        
-        self.stats['total_inserted'] = stats['inserted']
-        self.stats['total_skipped'] = stats['skipped']
-        self.stats['total_errors'] = stats['errors']
-        
-        return stats
+    def _start_url_registry(self):
+        """Nouveau registre d'URLs partagé par les scrapers pour ce passage"""
+        self.url_registry = UrlRegistry()
+        for scraper in self.scrapers:
+            scraper.set_url_registry(self.url_registry)
     
-    def export_to_csv(self, articles, filename=None):
+    def _scrape_media(self, scraper, max_articles_per_section):
         """
-        Exporte les articles vers un fichier CSV avec validation stricte
-        
-        Args:
-            articles: Liste d'articles à exporter
-            filename: Nom du fichier CSV (optionnel)
+        Scrape un média et enregistre ses stats
         
         Returns:
-            str: Chemin du fichier CSV créé
+            Liste d'articles bruts (vide en cas d'erreur)
         """
-        print(f"\n{'='*70}")
-        print(f"📄 EXPORT CSV DES ARTICLES")
-        print(f"{'='*70}")
-        
-        if not filename:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'articles_export_{timestamp}.csv'
-        
-        # Chemin complet
-        csv_path = Path(__file__).parent / filename
-        
-        # Champs CSV (selon schéma BD exactement)
-        fieldnames = [
-            'id', 'media', 'titre', 'contenu', 'url', 'date', 
-            'categorie', 'type_source', 'plateforme',
-            'likes', 'commentaires', 'partages'
-        ]
-        
-        exported = 0
-        skipped = 0
-        
         try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for article in articles:
-                    try:
-                        # Validation stricte avant export
-                        is_valid, error_msg = self.db_writer.validate_article_for_db(article)
-                        if not is_valid:
-                            print(f"⚠️ Ligne ignorée (invalide): {error_msg}")
-                            skipped += 1
-                            continue
-                        
-                        # Préparer la ligne CSV (selon schéma BD)
-                        row = {
-                            'id': article.get('id', ''),
-                            'media': article.get('media', ''),
-                            'titre': article.get('titre', '').replace('\n', ' ').replace('\r', ''),
-                            'contenu': article.get('contenu', '').replace('\n', ' ').replace('\r', ''),
-                            'url': article.get('url', ''),
-                            'date': article['date'].isoformat() if hasattr(article['date'], 'isoformat') else str(article['date']),
-                            'categorie': article.get('categorie', ''),
-                            'type_source': article.get('type_source', 'article'),
-                            'plateforme': article.get('plateforme', 'web'),
-                            'likes': article.get('likes', 0),
-                            'commentaires': article.get('commentaires', 0),
-                            'partages': article.get('partages', 0)
-                        }
-                        
-                        writer.writerow(row)
-                        exported += 1
-                        
-                    except Exception as e:
-                        print(f"❌ Erreur export ligne: {e} - Article ignoré")
-                        skipped += 1
-                        continue
-            
-            print(f"✅ Export CSV terminé:")
-            print(f"   - Exportés: {exported}")
-            if skipped > 0:
-                print(f"   - Ignorés: {skipped}")
-            print(f"   - Fichier: {csv_path}")
-            
-            # Ajouter à la liste des fichiers temporaires pour suppression ultérieure
-            self.temp_csv_files.append(str(csv_path))
-            
-            return str(csv_path)
-            
+            with self.metrics.timer('scraper_media_seconds', media=scraper.media_name):
+                articles = scraper.scrape_all_sections(max_articles_per_section)
         except Exception as e:
-            print(f"❌ Erreur lors de la création du fichier CSV: {e}")
-            return None
+            logger.exception("❌ Erreur scraping %s: %s", scraper.media_name, e, extra={'media': scraper.media_name})
+            self.metrics.inc('scraper_failures_total', media=scraper.media_name)
+            return []
+        self.metrics.inc('scraper_articles_total', len(articles), media=scraper.media_name)
+        
+        # Enregistrer les stats par média
+        media_name = scraper.media_name
+        if media_name not in self.media_stats:
+            self.media_stats[media_name] = {
+                'scraped': 0,
+                'inserted': 0,
+                'skipped': 0,
+                'last_article_date': None,
+                'date_failures': 0
+            }
+        
+        self.media_stats[media_name]['scraped'] = len(articles)
+        # Dates illisibles: articles sans date plutôt qu'une date inventée
+        self.media_stats[media_name]['date_failures'] = len(scraper.date_failures)
+        
+        # Trouver la date du dernier article
+        if articles:
+            dates = [a.get('date') for a in articles if a.get('date')]
+            if dates:
+                self.media_stats[media_name]['last_article_date'] = max(dates)
+        
+        self._emit_media_stats(media_name)
+        return articles
     
     def run_full_pipeline(self, max_articles_per_section=20, facebook_max_posts=50):
         """
@@ -315,156 +227,185 @@ class PipelineOrchestrator:
             }).execute()
             
             self.scraping_log_id = log_entry.data[0]['id']
-            print(f"📝 Log de scraping créé: ID={self.scraping_log_id}")
+            logger.info("📝 Log de scraping créé: ID=%s", self.scraping_log_id)
         except Exception as e:
-            print(f"⚠️ Erreur création log scraping: {e}")
+            logger.warning("⚠️ Erreur création log scraping: %s", e)
             self.scraping_log_id = None
         
+        status = 'completed'
+        error_message = None
         try:
-            # 1. Scraping
-            articles = self.run_scraping(max_articles_per_section, facebook_max_posts)
-            
-            if not articles:
-                print("\n⚠️ Aucun article scrapé. Arrêt du pipeline.")
-                self._update_scraping_log(start_time, 'completed')
-                return self.stats
-            
-            # 2. Prédiction ML
-            articles = self.run_prediction(articles)
+            # 1 → 4. Scraping, prédiction, nettoyage/validation et insertion en flux
+            self._run_stream(max_articles_per_section)
             
-            # 3. Nettoyage
-            articles = self.run_cleaning(articles)
+            if not self.stats['total_scraped']:
+                logger.warning("⚠️ Aucun article scrapé")
+            elif not self.stats['total_cleaned']:
+                logger.warning("⚠️ Aucun article valide après nettoyage")
             
-            if not articles:
-                print("\n⚠️ Aucun article valide après nettoyage. Arrêt du pipeline.")
-                self._update_scraping_log(start_time, 'completed')
-                return self.stats
+            logger.info("✅ Validation terminée: %d articles valides, %d rejetés", self._validated_count,
+                        sum(r['count'] for r in self._rejections.values()))
             
-            # 4. Export CSV BRUT (avant validation BD)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            csv_brut_path = self.export_to_csv(articles, f'articles_brut_{timestamp}.csv')
-            if csv_brut_path:
-                print(f"✅ CSV brut exporté: {csv_brut_path}")
-            
-            # 5. Validation stricte selon schéma BD
-            print(f"\n{'='*70}")
-            print(f"🔧 VALIDATION STRICTE SELON SCHÉMA BD")
-            print(f"{'='*70}\n")
-            
-            validated_articles = []
-            rejected_articles = []
-            
-            print("🔍 Validation et nettoyage en cours...")
-            for i, article in enumerate(articles, 1):
-                # Nettoyer l'article
-                cleaned_article = self.db_writer.clean_article_for_db(article)
-                
-                # Valider strictement
-                is_valid, error_msg = self.db_writer.validate_article_for_db(cleaned_article)
-                
-                if is_valid:
-                    validated_articles.append(cleaned_article)
-                else:
-                    rejected_articles.append({
-                        'article': cleaned_article,
-                        'reason': error_msg
-                    })
-                    print(f"   ⊘ [{i}/{len(articles)}] Rejeté: {error_msg}")
-            
-            print(f"\n✅ Validation terminée:")
-            print(f"   - Articles valides: {len(validated_articles)}")
-            print(f"   - Articles rejetés: {len(rejected_articles)}")
-            
-            # 6. Rapport détaillé des rejets
-            if rejected_articles:
-                print(f"\n{'='*70}")
-                print(f"📋 RAPPORT DES ARTICLES REJETÉS")
-                print(f"{'='*70}\n")
-                
-                # Grouper les rejets par raison
-                reject_reasons = {}
-                for reject in rejected_articles:
-                    reason = reject['reason']
-                    if reason not in reject_reasons:
-                        reject_reasons[reason] = []
-                    reject_reasons[reason].append(reject['article'].get('titre', 'Sans titre')[:50])
-                
-                for reason, titles in sorted(reject_reasons.items(), key=lambda x: len(x[1]), reverse=True):
-                    print(f"❌ {reason} ({len(titles)} articles)")
-                    for title in titles[:3]:  # Montrer max 3 exemples
-                        print(f"   - {title}...")
-                    if len(titles) > 3:
-                        print(f"   ... et {len(titles)-3} autres")
-                    print()
-            
-            # 7. Export CSV VALIDÉ (seulement les articles 100% propres)
-            if validated_articles:
-                csv_valide_path = self.export_to_csv(validated_articles, f'articles_valides_{timestamp}.csv')
-                if csv_valide_path:
-                    print(f"\n✅ CSV validé exporté: {csv_valide_path}")
-                    self.stats['csv_exported'] = csv_valide_path
-            else:
-                print("\n⚠️ Aucun article valide à exporter !")
+            # 5. Rapport des rejets: un message par motif (nombre et exemples de titres)
+            for reason, reject in sorted(self._rejections.items(), key=lambda x: x[1]['count'], reverse=True):
+                logger.info("❌ Rejet: %s (%d articles)", reason, reject['count'],
+                            extra={'reason': reason, 'count': reject['count'], 'examples': reject['examples']})
             
-            # 8. Insertion DB (seulement les articles validés)
-            if validated_articles:
-                insertion_stats = self.run_insertion(validated_articles)
-                
-                # Mettre à jour les stats par média avec les résultats d'insertion
-                if 'by_media' in insertion_stats:
-                    for media_name, media_insertion in insertion_stats['by_media'].items():
-                        if media_name in self.media_stats:
-                            self.media_stats[media_name]['inserted'] = media_insertion['inserted']
-                            self.media_stats[media_name]['skipped'] = media_insertion['skipped']
-                
-                # Enregistrer les détails par média dans la BD
+            # 6. Détails par média (seulement si des articles ont été validés)
+            if self._validated_count:
                 self._save_media_details()
             else:
-                print("\n⚠️ Aucun article valide pour insertion. Arrêt.")
+                logger.warning("⚠️ Aucun article valide pour insertion")
             
         except Exception as e:
-            print(f"\n❌ ERREUR CRITIQUE DANS LE PIPELINE: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Erreur critique dans le pipeline: %s", e)
             
-            # Mettre à jour le log avec l'erreur
-            self._update_scraping_log(start_time, 'failed', error_message=str(e))
+            status = 'failed'
+            error_message = str(e)
         
         finally:
-            # Mettre à jour le log avec les stats finales
-            if self.scraping_log_id:
-                self._update_scraping_log(start_time, 'completed')
-            
-            # Supprimer les fichiers CSV temporaires
-            self._cleanup_temp_csv_files()
-            
-            # Afficher le résumé
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
+            self._record_run_metrics(duration, status)
+            
+            # Mettre à jour le log avec les stats finales et les mesures (ou l'erreur)
+            if self.scraping_log_id:
+                self._update_scraping_log(start_time, status, error_message=error_message)
             
-            print(f"\n{'='*70}")
-            print(f"📊 RÉSUMÉ DU PIPELINE")
-            print(f"{'='*70}")
-            print(f"Durée totale: {duration:.1f} secondes")
-            print(f"\nStatistiques:")
-            print(f"  📰 Articles scrapés: {self.stats['total_scraped']}")
-            print(f"  ✅ Articles nettoyés: {self.stats['total_cleaned']}")
-            print(f"  💾 Articles insérés: {self.stats['total_inserted']}")
-            print(f"  ⏭️  Articles ignorés (doublons): {self.stats['total_skipped']}")
-            if self.stats['total_errors'] > 0:
-                print(f"  ❌ Erreurs: {self.stats['total_errors']}")
-            if 'csv_exported' in self.stats:
-                print(f"  📄 CSV exporté: {self.stats['csv_exported']}")
+            self.audit.close()
             
+            # Résumé: statistiques du passage et temps par étape en champs structurés
             success_rate = (self.stats['total_inserted'] / self.stats['total_scraped'] * 100) if self.stats['total_scraped'] > 0 else 0
-            print(f"\n  🎯 Taux de réussite: {success_rate:.1f}%")
-            
-            print(f"\n{'='*70}")
-            print(f"🎉 PIPELINE TERMINÉ")
-            print(f"{'='*70}\n")
+            summary = {
+                **self.stats,
+                'status': status,
+                'duration_seconds': round(duration, 1),
+                'success_rate': round(success_rate, 1),
+                'timings': self._stage_timings()
+            }
+            if self.audit.enabled:
+                summary['audit_written'] = self.audit.written
+            logger.info("📊 Pipeline terminé en %.1fs: %d scrapés, %d insérés, %d doublons, %d erreurs",
+                        duration, self.stats['total_scraped'], self.stats['total_inserted'],
+                        self.stats['total_skipped'], self.stats['total_errors'], extra={'summary': summary})
         
         return self.stats
     
+    def _run_stream(self, max_articles_per_section):
+        """
+        Pipeline en flux: scraping → prédiction → nettoyage/validation → insertion
+        
+        Les médias sont scrapés en parallèle; dès qu'un média est terminé, ses articles
+        partent par lots de STREAM_BATCH_SIZE dans les étapes suivantes, chacune dans son
+        thread. Les files entre étapes contiennent au plus STREAM_QUEUE_SIZE lots.
+        """
+        logger.info("🌊 Pipeline en flux: scraping → prédiction → validation → insertion")
+        
+        self._seen_urls = set()
+        self._start_url_registry()
+        self._rejections = {}
+        self._validated_count = 0
+        stats_lock = threading.Lock()
+        
+        scraped = bounded_queue(STREAM_QUEUE_SIZE)
+        predicted = bounded_queue(STREAM_QUEUE_SIZE)
+        validated = bounded_queue(STREAM_QUEUE_SIZE)
+        stages = [
+            Stage(name, self.metrics.timed('pipeline_stage_seconds', process, pipeline='web', stage=name), inbox, outbox)
+            for name, process, inbox, outbox in (
+                ('prediction', self.predictor.predict_batch, scraped, predicted),
+                ('validation', self._clean_and_validate, predicted, validated),
+                ('insertion', self._insert_stream_batch, validated, None)
+            )
+        ]
+        for stage in stages:
+            stage.start()
+        
+        def scrape(scraper):
+            articles = self._scrape_media(scraper, max_articles_per_section)
+            with stats_lock:
+                self.stats['total_scraped'] += len(articles)
+            for batch in chunked(articles, STREAM_BATCH_SIZE):
+                scraped.put(batch)
+        
+        self._emit('progress', status='web_scraping',
+                   message=f"📰 Scraping de {len(self.scrapers)} médias en parallèle...")
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(self.scrapers)), thread_name_prefix='scraper') as pool:
+                list(pool.map(scrape, self.scrapers))
+        finally:
+            # Fin du flux: chaque étape termine ses lots puis prévient la suivante
+            scraped.put(END)
+            for stage in stages:
+                stage.join()
+        
+        self.stats['fetches_saved'] = self.url_registry.saved
+        self.stats['date_failures'] = sum(stats.get('date_failures', 0) for stats in self.media_stats.values())
+        logger.info("✅ Total scrapé: %d articles de %d sources", self.stats['total_scraped'], len(self.scrapers))
+        
+        for stage in stages:
+            if stage.error is not None:
+                raise stage.error
+    
+    def _record_run_metrics(self, duration, status):
+        """Durée, issue et volumes du passage"""
+        self.metrics.observe('pipeline_run_seconds', duration, pipeline='web')
+        self.metrics.inc('pipeline_runs_total', pipeline='web', status=status)
+        for key in ('total_scraped', 'total_cleaned', 'total_inserted', 'total_skipped', 'total_errors'):
+            if self.stats[key]:
+                self.metrics.inc('pipeline_articles_total', self.stats[key], pipeline='web', result=key[len('total_'):])
+    
+    def _stage_timings(self):
+        """Temps cumulé par étape et par média (étapes du flux concurrentes: leur somme dépasse la durée totale)"""
+        timings = {
+            f"scraping {media_name}": {
+                'seconds': round(self.metrics.seconds('scraper_media_seconds', media=media_name), 1),
+                'requests': int(self.metrics.total('scraper_requests_total', media=media_name)),
+                'megabytes': round(self.metrics.total('scraper_bytes_total', media=media_name) / 2**20, 1)
+            }
+            for media_name in self.media_stats
+        }
+        for stage in ('prediction', 'validation', 'insertion'):
+            timings[stage] = {'seconds': round(self.metrics.seconds('pipeline_stage_seconds', pipeline='web', stage=stage), 1)}
+        return timings
+    
+    def _clean_and_validate(self, articles):
+        """Étape du flux: nettoyage, validation stricte et dédoublonnage d'un lot (une passe)"""
+        records, rejected, duplicates = self.normalizer.normalize_batch(articles, self._seen_urls)
+        if duplicates:
+            logger.debug("🔄 %d doublons supprimés", duplicates)
+        
+        for article, error_msg in rejected:
+            # Seuls le nombre et quelques titres sont gardés pour le rapport
+            reject = self._rejections.setdefault(error_msg, {'count': 0, 'examples': []})
+            reject['count'] += 1
+            if len(reject['examples']) < REJECT_EXAMPLES:
+                titre = article.get('titre') if isinstance(article, dict) else None
+                reject['examples'].append(str(titre or 'Sans titre')[:50])
+        
+        self.stats['total_cleaned'] += len(records)
+        self._validated_count += len(records)
+        return [record.to_dict() for record in records]
+    
+    def _insert_stream_batch(self, articles):
+        """Étape du flux: insertion d'un lot validé et mise à jour des stats par média"""
+        # Audit: une seule écriture, des articles déjà validés
+        self.audit.write(articles, source='web')
+        
+        self._emit('progress', status='web_insertion',
+                   message=f"💾 Insertion en cours ({self.stats['total_inserted']} articles insérés)...")
+        stats = self.db_writer.insert_batch(articles, validated=True)
+        
+        self.stats['total_inserted'] += stats['inserted']
+        self.stats['total_skipped'] += stats['skipped']
+        self.stats['total_errors'] += stats['errors']
+        
+        for media_name, media_insertion in stats.get('by_media', {}).items():
+            if media_name in self.media_stats:
+                self.media_stats[media_name]['inserted'] += media_insertion['inserted']
+                self.media_stats[media_name]['skipped'] += media_insertion['skipped']
+                self._emit_media_stats(media_name)
+    
     def _update_scraping_log(self, start_time, status, error_message=None):
         """
         Met à jour l'entrée dans scraping_logs
@@ -494,14 +435,17 @@ class PipelineOrchestrator:
             if error_message:
                 update_data['error_message'] = error_message
             
+            # Temps par étape, requêtes, octets... (pour repérer les étapes coûteuses)
+            update_data['details'] = {'metrics': self.metrics.snapshot()}
+            
             self.supabase.table('scraping_logs')\
                 .update(update_data)\
                 .eq('id', self.scraping_log_id)\
                 .execute()
             
-            print(f"✅ Log de scraping mis à jour: ID={self.scraping_log_id}, status={status}")
+            logger.info("✅ Log de scraping mis à jour: ID=%s, status=%s", self.scraping_log_id, status)
         except Exception as e:
-            print(f"⚠️ Erreur mise à jour log scraping: {e}")
+            logger.warning("⚠️ Erreur mise à jour log scraping: %s", e)
     
     def _save_media_details(self):
         """
@@ -520,7 +464,7 @@ class PipelineOrchestrator:
                 # Trouver l'ID du média
                 media_id = media_name_to_id.get(media_name)
                 if not media_id:
-                    print(f"⚠️ Média non trouvé en BD: {media_name}")
+                    logger.warning("⚠️ Média non trouvé en BD: %s", media_name)
                     continue
                 
                 # Préparer les données
@@ -543,50 +487,15 @@ class PipelineOrchestrator:
                 # Insérer dans la table
                 self.supabase.table('scraping_media_details').insert(detail_data).execute()
             
-            print(f"✅ Détails par média enregistrés ({len(self.media_stats)} médias)")
+            logger.info("✅ Détails par média enregistrés (%d médias)", len(self.media_stats))
         except Exception as e:
-            print(f"⚠️ Erreur enregistrement détails par média: {e}")
-            import traceback
-            traceback.print_exc()
-    
-    def _cleanup_temp_csv_files(self):
-        """
-        Supprime automatiquement les fichiers CSV temporaires après utilisation
-        """
-        if not self.temp_csv_files:
-            return
-        
-        print(f"\n{'='*70}")
-        print(f"🧹 NETTOYAGE DES FICHIERS TEMPORAIRES")
-        print(f"{'='*70}")
-        
-        deleted_count = 0
-        failed_count = 0
-        
-        for csv_file in self.temp_csv_files:
-            try:
-                csv_path = Path(csv_file)
-                if csv_path.exists():
-                    csv_path.unlink()  # Supprime le fichier
-                    print(f"✅ Supprimé: {csv_path.name}")
-                    deleted_count += 1
-                else:
-                    print(f"⚠️ Fichier introuvable: {csv_path.name}")
-            except Exception as e:
-                print(f"❌ Erreur suppression {csv_path.name}: {e}")
-                failed_count += 1
-        
-        print(f"\n📊 Résumé nettoyage:")
-        print(f"   - Fichiers supprimés: {deleted_count}")
-        if failed_count > 0:
-            print(f"   - Échecs: {failed_count}")
-        
-        # Vider la liste
-        self.temp_csv_files = []
+            logger.exception("⚠️ Erreur enregistrement détails par média: %s", e)
 
 
 def main():
     """Point d'entrée principal"""
+    configure_logging()
+    
     # Orchestrateur Web uniquement - Facebook a son propre système
     orchestrator = PipelineOrchestrator()
     
@@ -2,14 +2,13 @@
 # -*- coding: utf-8 -*-
 """
 Orchestrateur du Pipeline Facebook
-Transforme les JSON Facebook → CSV → Supabase
+Transforme les JSON Facebook → Supabase (→ journal d'audit optionnel)
 Similaire au pipeline Web mais adapté pour les posts Facebook
 """
 
 import sys
 import json
-import csv
-import os
+import logging
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict
@@ -19,35 +18,43 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from ml.predictor import CategoryPredictor
-from utils.cleaner import DataCleaner
+from utils.normalizer import ArticleNormalizer
 from utils.db_writer import DatabaseWriter
+from utils.audit_sink import AuditSink
+from utils.metrics import METRICS
 from supabase_client import get_supabase_client
+from utils.log import configure_logging
+
+logger = logging.getLogger(__name__)
 
 
 class FacebookOrchestrator:
     """Orchestre le traitement des données Facebook"""
     
-    def __init__(self, json_source='consolidated'):
+    def __init__(self, json_source='consolidated', on_event=None, predictor=None, db_writer=None):
         """
         Initialise l'orchestrateur
         
         Args:
             json_source: 'consolidated' pour all_media_consolidated.json
                         ou 'individual' pour les JSON séparés
+            on_event: Callback optionnel on_event(event_type, data) pour le suivi en temps réel
+            predictor: CategoryPredictor déjà chargé (scheduler)
+            db_writer: DatabaseWriter partagé (scheduler)
         """
-        print(f"\n{'='*70}")
-        print(f"📘 PIPELINE FACEBOOK - TRAITEMENT DES POSTS")
-        print(f"{'='*70}")
-        print(f"Démarré: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        logger.info("📘 Pipeline Facebook: traitement des posts (%s)", json_source)
         
         self.base_path = Path(__file__).parent
         self.json_source = json_source
         
         # Initialiser les modules
         self.supabase = get_supabase_client()
-        self.predictor = CategoryPredictor()
-        self.cleaner = DataCleaner()
-        self.db_writer = DatabaseWriter()
+        self.predictor = predictor or CategoryPredictor()
+        
+        # Mesures du passage (reportées dans le registre du processus exporté par /metrics)
+        self.metrics = METRICS.child()
+        self.db_writer = (db_writer or DatabaseWriter()).with_metrics(self.metrics)
+        self.normalizer = ArticleNormalizer(self.db_writer.get_media_id)
         
         # Mapping des noms Facebook → Supabase (pour gérer les variations)
         self.media_name_mapping = {
@@ -79,6 +86,17 @@ class FacebookOrchestrator:
         
         # ID du log
         self.scraping_log_id = None
+        
+        # Suivi en temps réel (flux SSE)
+        self.on_event = on_event
+        
+        # Journal d'audit des posts validés (désactivé sauf PIPELINE_AUDIT_DIR)
+        self.audit = AuditSink(prefix='posts_facebook')
+    
+    def _emit(self, event_type, **data):
+        """Transmet un événement au callback de suivi s'il est défini"""
+        if self.on_event:
+            self.on_event(event_type, data)
     
     def read_json_data(self) -> List[Dict]:
         """
@@ -87,9 +105,7 @@ class FacebookOrchestrator:
         Returns:
             Liste de posts bruts
         """
-        print(f"\n{'='*70}")
-        print(f"📂 ÉTAPE 1: LECTURE DES JSON")
-        print(f"{'='*70}\n")
+        logger.info("📂 Étape 1: lecture des JSON")
         
         all_posts = []
         
@@ -98,7 +114,7 @@ class FacebookOrchestrator:
             json_file = self.base_path / 'all_media_consolidated.json'
             
             if not json_file.exists():
-                print(f"❌ Fichier non trouvé: {json_file}")
+                logger.error("❌ Fichier non trouvé: %s", json_file)
                 return []
             
             try:
@@ -106,15 +122,14 @@ class FacebookOrchestrator:
                     data = json.load(f)
                 
                 all_posts = data.get('all_posts', [])
-                print(f"✅ {len(all_posts)} posts chargés depuis {json_file.name}")
-                
                 # Stats par média
                 media_stats = data.get('media_stats', {})
-                for media_name, stats in media_stats.items():
-                    print(f"   📊 {media_name}: {stats.get('total_posts', 0)} posts")
+                logger.info("✅ %d posts chargés depuis %s", len(all_posts), json_file.name, extra={
+                    'posts_by_media': {media_name: stats.get('total_posts', 0) for media_name, stats in media_stats.items()}
+                })
                 
             except Exception as e:
-                print(f"❌ Erreur lecture JSON: {e}")
+                logger.error("❌ Erreur lecture JSON: %s", e)
                 return []
         
         else:
@@ -131,7 +146,7 @@ class FacebookOrchestrator:
                 file_path = self.base_path / json_path
                 
                 if not file_path.exists():
-                    print(f"⚠️  {media_name}: fichier non trouvé ({json_path})")
+                    logger.warning("⚠️  %s: fichier non trouvé (%s)", media_name, json_path)
                     continue
                 
                 try:
@@ -145,13 +160,13 @@ class FacebookOrchestrator:
                         post['media_source'] = media_name
                     
                     all_posts.extend(posts)
-                    print(f"✅ {media_name}: {len(posts)} posts")
+                    logger.info("✅ %s: %d posts", media_name, len(posts), extra={'media': media_name})
                     
                 except Exception as e:
-                    print(f"❌ Erreur {media_name}: {e}")
+                    logger.error("❌ Erreur %s: %s", media_name, e, extra={'media': media_name})
         
         self.stats['total_posts'] = len(all_posts)
-        print(f"\n✅ Total: {len(all_posts)} posts chargés")
+        logger.info("✅ Total: %d posts chargés", len(all_posts))
         
         return all_posts
     
@@ -165,9 +180,7 @@ class FacebookOrchestrator:
         Returns:
             Articles transformés
         """
-        print(f"\n{'='*70}")
-        print(f"🔄 ÉTAPE 2: TRANSFORMATION DES POSTS")
-        print(f"{'='*70}\n")
+        logger.info("🔄 Étape 2: transformation de %d posts", len(posts))
         
         articles = []
         
@@ -201,12 +214,12 @@ class FacebookOrchestrator:
                 articles.append(article)
                 
             except Exception as e:
-                print(f"⚠️  Erreur transformation post: {e}")
+                logger.warning("⚠️  Erreur transformation post: %s", e, extra={'sample': 20})
                 self.stats['total_errors'] += 1
                 continue
         
         self.stats['total_transformed'] = len(articles)
-        print(f"✅ {len(articles)} posts transformés")
+        logger.info("✅ %d posts transformés", len(articles))
         
         return articles
     
@@ -233,9 +246,7 @@ class FacebookOrchestrator:
         Returns:
             Articles avec catégories prédites
         """
-        print(f"\n{'='*70}")
-        print(f"🤖 ÉTAPE 3: PRÉDICTION DES CATÉGORIES (ML)")
-        print(f"{'='*70}")
+        logger.info("🤖 Étape 3: prédiction des catégories (ML)")
         
         articles = self.predictor.predict_batch(articles)
         
@@ -243,89 +254,24 @@ class FacebookOrchestrator:
     
     def run_cleaning(self, articles: List[Dict]) -> List[Dict]:
         """
-        Nettoyage et validation
+        Nettoyage, validation stricte selon le schéma BD et dédoublonnage (une passe)
         
         Args:
             articles: Articles à nettoyer
             
         Returns:
-            Articles nettoyés
-        """
-        print(f"\n{'='*70}")
-        print(f"🧹 ÉTAPE 4: NETTOYAGE ET VALIDATION")
-        print(f"{'='*70}")
-        
-        # Nettoyer
-        articles = self.cleaner.clean_batch(articles)
-        
-        # Supprimer les doublons
-        articles = self.cleaner.deduplicate(articles)
-        
-        self.stats['total_cleaned'] = len(articles)
-        
-        return articles
-    
-    def cleanup_temp_csv(self, csv_path: str):
+            Articles nettoyés et validés
         """
-        Supprime un fichier CSV temporaire
+        logger.info("🧹 Étape 4: nettoyage et validation")
         
-        Args:
-            csv_path: Chemin du fichier à supprimer
-        """
-        try:
-            if os.path.exists(csv_path):
-                os.remove(csv_path)
-                print(f"🗑️  Fichier temporaire supprimé: {os.path.basename(csv_path)}")
-        except Exception as e:
-            print(f"⚠️  Erreur suppression {csv_path}: {e}")
-    
-    def export_to_csv(self, articles: List[Dict], filename: str) -> str:
-        """
-        Exporte en CSV
+        records, rejected, duplicates = self.normalizer.normalize_batch(articles)
         
-        Args:
-            articles: Articles à exporter
-            filename: Nom du fichier
-            
-        Returns:
-            Chemin du fichier créé
-        """
-        csv_path = self.base_path / filename
+        logger.info("✅ %d posts valides, %d rejetés (invalides), %d doublons supprimés",
+                    len(records), len(rejected), duplicates)
         
-        fieldnames = [
-            'id', 'media', 'titre', 'contenu', 'url', 'date', 
-            'categorie', 'type_source', 'plateforme',
-            'likes', 'commentaires', 'partages'
-        ]
+        self.stats['total_cleaned'] = len(records)
         
-        try:
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for article in articles:
-                    row = {
-                        'id': article.get('id', ''),
-                        'media': article.get('media', ''),
-                        'titre': article.get('titre', '').replace('\n', ' ')[:100],
-                        'contenu': article.get('contenu', '').replace('\n', ' '),
-                        'url': article.get('url', ''),
-                        'date': article['date'].isoformat() if hasattr(article.get('date'), 'isoformat') else str(article.get('date')),
-                        'categorie': article.get('categorie', ''),
-                        'type_source': article.get('type_source', 'post'),
-                        'plateforme': article.get('plateforme', 'facebook'),
-                        'likes': article.get('likes', 0),
-                        'commentaires': article.get('commentaires', 0),
-                        'partages': article.get('partages', 0)
-                    }
-                    writer.writerow(row)
-            
-            print(f"✅ CSV exporté: {csv_path}")
-            return str(csv_path)
-            
-        except Exception as e:
-            print(f"❌ Erreur export CSV: {e}")
-            return None
+        return [record.to_dict() for record in records]
     
     def run_insertion(self, articles: List[Dict]):
         """
@@ -334,119 +280,104 @@ class FacebookOrchestrator:
         Args:
             articles: Articles à insérer
         """
-        print(f"\n{'='*70}")
-        print(f"💾 ÉTAPE 5: INSERTION DANS SUPABASE")
-        print(f"{'='*70}")
+        logger.info("💾 Étape 5: insertion de %d posts dans Supabase", len(articles))
         
-        stats = self.db_writer.insert_batch(articles)
+        self._emit('progress', status='facebook_insertion', message=f"💾 Insertion de {len(articles)} posts Facebook...")
+        stats = self.db_writer.insert_batch(articles, validated=True)
         
         self.stats['total_inserted'] = stats['inserted']
         self.stats['total_skipped'] = stats['skipped']
         self.stats['total_errors'] += stats['errors']
         
+        for media_name, media_insertion in stats.get('by_media', {}).items():
+            self._emit('media_stats', media=media_name, inserted=media_insertion['inserted'],
+                       skipped=media_insertion['skipped'])
+        
         return stats
     
+    def _stage(self, stage):
+        """Chronomètre d'une étape du pipeline Facebook"""
+        return self.metrics.timer('pipeline_stage_seconds', pipeline='facebook', stage=stage)
+    
     def run_full_pipeline(self):
         """Exécute le pipeline complet"""
         start_time = datetime.now()
+        status = 'completed'
         
         try:
             # 1. Lecture JSON
-            posts = self.read_json_data()
+            with self._stage('reading'):
+                posts = self.read_json_data()
             
             if not posts:
-                print("\n⚠️  Aucun post trouvé. Arrêt.")
+                logger.warning("⚠️  Aucun post trouvé. Arrêt.")
                 return self.stats
             
             # 2. Transformation
-            articles = self.transform_posts(posts)
+            with self._stage('transform'):
+                articles = self.transform_posts(posts)
             
             if not articles:
-                print("\n⚠️  Aucun article transformé. Arrêt.")
+                logger.warning("⚠️  Aucun article transformé. Arrêt.")
                 return self.stats
             
             # 3. Prédiction ML
-            articles = self.run_prediction(articles)
+            self._emit('progress', status='facebook_prediction', message=f"🤖 Prédiction des catégories ({len(articles)} posts)...")
+            with self._stage('prediction'):
+                articles = self.run_prediction(articles)
             
-            # 4. Nettoyage
-            articles = self.run_cleaning(articles)
+            # 4. Nettoyage et validation
+            self._emit('progress', status='facebook_cleaning', message="🧹 Nettoyage des posts Facebook...")
+            with self._stage('validation'):
+                articles = self.run_cleaning(articles)
             
             if not articles:
-                print("\n⚠️  Aucun article valide après nettoyage. Arrêt.")
+                logger.warning("⚠️  Aucun article valide après nettoyage. Arrêt.")
                 return self.stats
             
-            # 5. Export CSV brut
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            csv_brut = self.export_to_csv(articles, f'facebook_posts_brut_{timestamp}.csv')
-            
-            # 6. Validation stricte
-            print(f"\n{'='*70}")
-            print(f"🔧 VALIDATION STRICTE SELON SCHÉMA BD")
-            print(f"{'='*70}\n")
-            
-            validated_articles = []
-            for article in articles:
-                cleaned = self.db_writer.clean_article_for_db(article)
-                is_valid, error_msg = self.db_writer.validate_article_for_db(cleaned)
-                
-                if is_valid:
-                    validated_articles.append(cleaned)
-            
-            print(f"✅ Articles validés: {len(validated_articles)}/{len(articles)}")
-            
-            # 7. Export CSV validé
-            if validated_articles:
-                csv_valide = self.export_to_csv(validated_articles, f'facebook_posts_valides_{timestamp}.csv')
-            
-            # 8. Insertion BD
-            if validated_articles:
-                self.run_insertion(validated_articles)
-            else:
-                print("\n⚠️  Aucun article valide pour insertion.")
+            # 5. Audit (une seule écriture, des posts déjà validés) puis insertion BD
+            self.audit.write(articles, source='facebook')
+            with self._stage('insertion'):
+                self.run_insertion(articles)
         
         except Exception as e:
-            print(f"\n❌ ERREUR CRITIQUE: {e}")
-            import traceback
-            traceback.print_exc()
+            status = 'failed'
+            logger.exception("❌ Erreur critique du pipeline Facebook: %s", e)
         
         finally:
             # Résumé
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
-            
-            print(f"\n{'='*70}")
-            print(f"📊 RÉSUMÉ DU PIPELINE FACEBOOK")
-            print(f"{'='*70}")
-            print(f"Durée: {duration:.1f}s")
-            print(f"\n📊 Statistiques:")
-            print(f"  📘 Posts chargés: {self.stats['total_posts']}")
-            print(f"  🔄 Posts transformés: {self.stats['total_transformed']}")
-            print(f"  ✅ Posts nettoyés: {self.stats['total_cleaned']}")
-            print(f"  💾 Posts insérés: {self.stats['total_inserted']}")
-            print(f"  ⏭️  Posts ignorés (doublons): {self.stats['total_skipped']}")
-            if self.stats['total_errors'] > 0:
-                print(f"  ❌ Erreurs: {self.stats['total_errors']}")
+            self.metrics.observe('pipeline_run_seconds', duration, pipeline='facebook')
+            self.metrics.inc('pipeline_runs_total', pipeline='facebook', status=status)
+            for key in ('total_posts', 'total_cleaned', 'total_inserted', 'total_skipped', 'total_errors'):
+                if self.stats[key]:
+                    self.metrics.inc('pipeline_articles_total', self.stats[key], pipeline='facebook',
+                                     result=key[len('total_'):])
             
             success_rate = (self.stats['total_inserted'] / self.stats['total_posts'] * 100) if self.stats['total_posts'] > 0 else 0
-            print(f"\n  🎯 Taux de réussite: {success_rate:.1f}%")
-            
-            print(f"\n{'='*70}")
-            print(f"🎉 PIPELINE FACEBOOK TERMINÉ")
-            print(f"{'='*70}\n")
+            summary = {
+                **self.stats,
+                'status': status,
+                'duration_seconds': round(duration, 1),
+                'success_rate': round(success_rate, 1),
+                'timings': {
+                    stage: round(self.metrics.seconds('pipeline_stage_seconds', pipeline='facebook', stage=stage), 1)
+                    for stage in ('reading', 'transform', 'prediction', 'validation', 'insertion')
+                }
+            }
+            logger.info("📊 Pipeline Facebook terminé en %.1fs: %d posts, %d insérés, %d doublons, %d erreurs",
+                        duration, self.stats['total_posts'], self.stats['total_inserted'],
+                        self.stats['total_skipped'], self.stats['total_errors'], extra={'summary': summary})
             
-            # Nettoyage des fichiers CSV temporaires
-            print(f"\n🧹 Nettoyage des fichiers temporaires...")
-            if 'csv_brut' in locals():
-                self.cleanup_temp_csv(csv_brut)
-            if 'csv_valide' in locals():
-                self.cleanup_temp_csv(csv_valide)
-            print(f"✅ Nettoyage terminé\n")
+            self.audit.close()
         
         return self.stats
 
 
 def main():
     """Point d'entrée principal"""
+    configure_logging()
     orchestrator = FacebookOrchestrator(json_source='consolidated')
     stats = orchestrator.run_full_pipeline()
     return stats
@@ -6,12 +6,45 @@ Fournit les méthodes communes: requêtes HTTP, parsing de dates, etc.
 """
 
 import requests
-from bs4 import BeautifulSoup
 import hashlib
-from datetime import datetime
+import html
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta, timezone
+from time import perf_counter
+from urllib.parse import urlencode, urljoin
 from abc import ABC, abstractmethod
 import re
 
+from .date_parser import try_parse_date
+from .feeds import parse_feed
+from .host_controller import MAX_CONCURRENCY, HostControllers
+from .html_document import default_backend, parse_html
+from .url_registry import UrlRegistry, canonical_url
+from utils.metrics import METRICS
+
+# Index de sitemaps: nombre maximal de sitemaps enfants lus (les plus récents)
+MAX_CHILD_SITEMAPS = 2
+
+# Pages de rubrique suivies au plus (passages incrémentaux seulement)
+MAX_LISTING_PAGES = 3
+# Articles antérieurs consécutifs avant l'arrêt (tolère les articles épinglés en tête)
+OLD_ENTRIES_BEFORE_STOP = 3
+# Lien vers la page suivante d'une rubrique (WordPress et SPIP)
+NEXT_PAGE_SELECTOR = 'link[rel="next"], a[rel="next"]'
+
+# Dates illisibles affichées au plus par passage (toutes sont comptées)
+MAX_DATE_FAILURES_SHOWN = 3
+
+# API REST WordPress: articles par page (maximum autorisé par WordPress) et champs demandés
+WP_PER_PAGE = 100
+WP_FIELDS = 'link,date_gmt,title,content'
+_TAGS = re.compile(r'<[^>]+>')
+
+logger = logging.getLogger(__name__)
+
 class BaseWebScraper(ABC):
     """Classe abstraite pour les scrapers web"""
     
@@ -23,13 +56,40 @@ class BaseWebScraper(ABC):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         }
+        # Session HTTP (connexions réutilisées); remplaçable par une cassette (rejeu hors ligne)
+        self.session = requests.Session()
         # Date de la dernière publication (sera initialisée par l'orchestrateur)
         self.last_publication_date = None
+        # Moteur d'analyse HTML (SCRAPER_HTML_PARSER, défaut: le plus rapide installé)
+        self.html_backend = default_backend()
+        # Flux RSS/Atom ou sitemaps du média, essayés dans l'ordre (définis par chaque scraper)
+        self.feeds = []
+        # URLs déjà demandées pendant le passage (partagé entre médias par l'orchestrateur)
+        self.url_registry = None
+        # API REST WordPress du média (.../wp-json/wp/v2/posts), None si le site n'est pas WordPress
+        self.wp_api = None
+        # 'auto': API WordPress, puis flux, puis rubriques si nécessaire
+        # 'feeds': flux puis rubriques, 'sections': rubriques seules
+        self.discovery = os.getenv('SCRAPER_DISCOVERY', 'auto')
+        # Dates illisibles du passage (signalées plutôt que remplacées par maintenant)
+        self.date_failures = []
+        # Débit et disjoncteur par site, remis à zéro à chaque passage
+        self.hosts = HostControllers()
+        # Mesures (registre du passage fourni par l'orchestrateur, sinon celui du processus)
+        self.metrics = METRICS
     
     def set_last_publication_date(self, last_date):
         """Définir la date de la dernière publication"""
         self.last_publication_date = last_date
     
+    def set_url_registry(self, registry):
+        """Partager le registre d'URLs du passage (dédoublonnage entre médias)"""
+        self.url_registry = registry
+    
+    def set_metrics(self, metrics):
+        """Utiliser le registre de mesures du passage"""
+        self.metrics = metrics
+    
     def should_scrape_article(self, article_date):
         """Vérifier si l'article doit être scrapé basé sur sa date"""
         if self.last_publication_date is None:
@@ -41,14 +101,47 @@ class BaseWebScraper(ABC):
         # Scraper si l'article est du même jour ou plus récent
         return article_date.date() >= self.last_publication_date.date()
     
-    def make_request(self, url):
-        """Effectue une requête HTTP avec gestion d'erreurs"""
+    def fetch(self, url):
+        """
+        Effectue une requête HTTP avec gestion d'erreurs, renvoie le contenu brut
+        (None aussi si le disjoncteur du site est ouvert: pas d'attente du délai d'expiration)
+        """
+        host = self.hosts.for_url(url)
+        if not host.acquire():
+            self.metrics.inc('scraper_requests_total', media=self.media_name, outcome='skipped')
+            return None
+        
+        start = perf_counter()
+        ok = False
+        outcome = 'error'
         try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            response = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            # 404 & co: le site répond, seuls 429 et 5xx signalent un site en difficulté
+            ok = response.status_code != 429 and response.status_code < 500
+            outcome = 'http_error'
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            outcome = 'ok'
+            self.metrics.inc('scraper_bytes_total', len(response.content), media=self.media_name)
+            return response.content
+        except Exception as e:
+            logger.warning("❌ Erreur requête %s: %s", url, e, extra={'media': self.media_name, 'sample': 10})
+            return None
+        finally:
+            latency = perf_counter() - start
+            host.release(latency, ok)
+            self.metrics.inc('scraper_requests_total', media=self.media_name, outcome=outcome)
+            self.metrics.observe('scraper_request_seconds', latency, media=self.media_name)
+    
+    def make_request(self, url):
+        """Effectue une requête HTTP avec gestion d'erreurs, renvoie le document analysé"""
+        content = self.fetch(url)
+        if content is None:
+            return None
+        try:
+            with self.metrics.timer('scraper_parse_seconds', media=self.media_name):
+                return parse_html(content, self.html_backend)
         except Exception as e:
-            print(f"❌ Erreur requête {url}: {e}")
+            logger.warning("❌ Erreur analyse %s: %s", url, e, extra={'media': self.media_name})
             return None
     
     def generate_id(self, url):
@@ -56,41 +149,22 @@ class BaseWebScraper(ABC):
         return hashlib.sha256(url.encode()).hexdigest()
     
     def parse_french_date(self, date_str):
-        """Parse une date en français vers datetime"""
-        if not date_str:
-            return datetime.now()
-        
-        mois_fr = {
-            'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
-            'mai': 5, 'juin': 6, 'juillet': 7, 'août': 8,
-            'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12
-        }
-        
-        try:
-            # Nettoyer la chaîne
-            date_str = date_str.strip().lower()
-            
-            # Supprimer le jour de la semaine
-            for jour in ['lundi', 'mardi', 'mercredi', 'jeudi', 'vendredi', 'samedi', 'dimanche']:
-                date_str = date_str.replace(jour, '').strip()
-            
-            # Remplacer "1er" par "1"
-            date_str = date_str.replace('1er', '1')
-            
-            # Extraire: jour mois année
-            parts = date_str.split()
-            if len(parts) >= 3:
-                jour = int(parts[0])
-                mois_nom = parts[1]
-                annee = int(parts[2])
-                
-                if mois_nom in mois_fr:
-                    mois = mois_fr[mois_nom]
-                    return datetime(annee, mois, jour)
-        except:
-            pass
-        
-        return datetime.now()
+        """Parse une date en français (absolue ou relative) vers datetime, None si illisible"""
+        date = try_parse_date(date_str)
+        if date is None and date_str:
+            self.report_date_failure(date_str)
+        return date
+    
+    def report_date_failure(self, date_str):
+        """Signale une date illisible (comptée pour le passage, quelques exemples affichés)"""
+        self.date_failures.append(date_str.strip())
+        self.metrics.inc('scraper_date_failures_total', media=self.media_name)
+        if len(self.date_failures) <= MAX_DATE_FAILURES_SHOWN:
+            logger.warning("⚠️ Date illisible: %r", date_str.strip(), extra={'media': self.media_name})
+    
+    def parse_iso_date(self, time_tag):
+        """Date ISO de l'attribut datetime d'une balise <time>, None si absente ou illisible"""
+        return self.parse_french_date(time_tag.attr('datetime'))
     
     def create_article_dict(self, url, titre, contenu, date=None, auteur=None, commentaires=0):
         """Crée un dictionnaire article standardisé"""
@@ -98,7 +172,7 @@ class BaseWebScraper(ABC):
             'id': self.generate_id(url),
             'media': self.media_name,
             'titre': titre.strip() if titre else 'Sans titre',
-            'date': date if date else datetime.now(),
+            'date': date,  # None si inconnue (jamais inventée)
             'url': url,
             'contenu': contenu.strip() if contenu else '',
             'categorie': None,  # Sera prédite par le modèle ML
@@ -111,26 +185,303 @@ class BaseWebScraper(ABC):
         }
     
     @abstractmethod
-    def get_article_urls(self, section_url, max_articles=20):
-        """Méthode abstraite: récupérer les URLs des articles d'une section"""
+    def extract_listing(self, doc):
+        """Méthode abstraite: (url, date ou None) des articles d'une page de section, dans l'ordre"""
         pass
     
     @abstractmethod
-    def scrape_article(self, url):
-        """Méthode abstraite: scraper un article complet"""
+    def extract_article(self, doc, url):
+        """Méthode abstraite: article complet depuis sa page déjà analysée"""
         pass
     
-    def scrape_section(self, section_url, max_articles=20):
-        """Scrape une section complète"""
-        print(f"📰 Scraping: {section_url}")
-        urls = self.get_article_urls(section_url, max_articles)
-        print(f"   → {len(urls)} URLs trouvées")
+    def iter_dated_links(self, doc, link_css, date_css, parse_date):
+        """
+        (href, date) d'une liste où la date de chaque article suit son lien
+        
+        Liens et dates sont lus dans l'ordre du document; une date s'applique aux liens
+        rencontrés depuis la date précédente.
+        """
+        pending = []
+        for node in doc.select(f"{link_css}, {date_css}"):
+            if node.tag == 'a':
+                href = node.attr('href')
+                if href:
+                    pending.append(href)
+            else:
+                date = parse_date(node)
+                for href in pending:
+                    yield href, date
+                pending = []
+        for href in pending:
+            yield href, None
+    
+    def next_listing_page(self, doc, page_url):
+        """URL de la page suivante d'une rubrique, None si dernière page"""
+        link = doc.select_one(NEXT_PAGE_SELECTOR)
+        href = link.attr('href') if link else None
+        return urljoin(page_url, href) if href else None
+    
+    def iter_listing(self, section_url):
+        """
+        (url, date) des pages successives d'une rubrique, téléchargées à la demande
+        Une page n'est demandée que si les précédentes n'ont pas suffi
+        """
+        page_url = section_url
+        max_pages = MAX_LISTING_PAGES if self.last_publication_date else 1
+        for _ in range(max_pages):
+            doc = self.make_request(page_url)
+            if not doc:
+                return
+            yield from self.extract_listing(doc)
+            page_url = self.next_listing_page(doc, page_url)
+            if not page_url:
+                return
+    
+    def take_new_urls(self, entries, max_articles):
+        """
+        URLs des articles plus récents que la dernière publication
+        
+        Les listes vont du plus récent au plus ancien: la lecture s'arrête après
+        OLD_ENTRIES_BEFORE_STOP articles antérieurs consécutifs.
         
+        Returns:
+            tuple: (urls, arrêt sur la dernière publication)
+        """
+        urls = []
+        seen = set()
+        old_in_a_row = 0
+        for url, date in entries:
+            if date is not None and not self.should_scrape_article(date):
+                old_in_a_row += 1
+                if old_in_a_row >= OLD_ENTRIES_BEFORE_STOP:
+                    return urls, True
+                continue
+            
+            old_in_a_row = 0
+            # Un même article peut être lié plusieurs fois (titre, image, "#forum"...)
+            key = canonical_url(url)
+            if key not in seen:
+                seen.add(key)
+                urls.append(url)
+            if len(urls) >= max_articles:
+                break
+        return urls, False
+    
+    def extract_article_urls(self, doc, max_articles=20):
+        """URLs des nouveaux articles d'une page de section déjà analysée"""
+        urls, _ = self.take_new_urls(self.extract_listing(doc), max_articles)
+        return urls
+    
+    def get_article_urls(self, section_url, max_articles=20):
+        """Récupère les URLs des nouveaux articles d'une section (arrêt anticipé)"""
+        urls, stopped = self.take_new_urls(self.iter_listing(section_url), max_articles)
+        if stopped:
+            logger.debug("⏹️ Arrêt à la dernière publication (%d nouveaux articles)", len(urls),
+                         extra={'media': self.media_name, 'section': section_url})
+        return urls
+    
+    def scrape_article(self, url):
+        """Scrape un article complet"""
+        doc = self.make_request(url)
+        if not doc:
+            return None
+        return self.extract_article(doc, url)
+    
+    def scrape_articles(self, urls):
+        """Scrape des articles en parallèle (concurrence réglée par le contrôleur du site), dans l'ordre"""
+        if len(urls) <= 1:
+            articles = [self.scrape_article(url) for url in urls]
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(urls))) as pool:
+                articles = list(pool.map(self.scrape_article, urls))
+        return [article for article in articles if article]
+    
+    def read_feed(self, feed_url):
+        """
+        URLs datées d'un flux ou d'un sitemap (index suivi vers ses sitemaps récents)
+        
+        Returns:
+            list: [(url, date ou None)], None si le flux est illisible
+        """
+        content = self.fetch(feed_url)
+        parsed = parse_feed(content) if content else None
+        if parsed is None:
+            return None
+        
+        kind, entries = parsed
+        if kind == 'articles':
+            return entries
+        
+        # Index: seuls les sitemaps modifiés depuis la dernière publication sont lus
+        recent = [(url, date) for url, date in entries if date and self.should_scrape_article(date)]
+        recent.sort(key=lambda entry: entry[1].timestamp(), reverse=True)
         articles = []
-        for url in urls:
-            article = self.scrape_article(url)
-            if article:
-                articles.append(article)
+        for sitemap_url, _ in recent[:MAX_CHILD_SITEMAPS]:
+            child = self.read_feed(sitemap_url)
+            if child:
+                articles.extend(child)
+        return articles
+    
+    def discover_article_urls(self, max_articles):
+        """
+        URLs des nouveaux articles depuis le premier flux lisible du média
+        
+        Les articles antérieurs à last_publication_date sont écartés sans être téléchargés.
+        
+        Returns:
+            list: URLs à scraper (les plus récentes d'abord), None si les flux ne
+                  suffisent pas (aucun flux lisible, premier passage, ou flux trop court
+                  pour remonter jusqu'à la dernière publication)
+        """
+        if self.last_publication_date is None:
+            # Premier passage: un flux (10 à 50 articles) ne remplace pas les rubriques
+            return None
+        
+        # Liens du média uniquement (les flux peuvent citer des sites partenaires)
+        host = self.base_url.split('://', 1)[-1].replace('www.', '')
+        for feed_url in self.feeds:
+            entries = self.read_feed(feed_url)
+            if not entries:
+                continue
+            entries = [(url, date) for url, date in entries if host in url]
+            
+            # Le flux couvre l'intervalle s'il contient un article antérieur à la dernière publication
+            covered = any(date and not self.should_scrape_article(date) for _, date in entries)
+            if not covered:
+                logger.info("⚠️ Flux %s insuffisant (ne remonte pas à la dernière publication)", feed_url,
+                            extra={'media': self.media_name})
+                continue
+            
+            new_entries = [(url, date) for url, date in entries if self.should_scrape_article(date)]
+            new_entries.sort(key=lambda entry: entry[1].timestamp() if entry[1] else float('inf'), reverse=True)
+            
+            urls = []
+            for url, _ in new_entries:
+                if url not in urls:
+                    urls.append(url)
+            logger.info("📡 Flux %s: %d nouveaux articles sur %d", feed_url, len(urls), len(entries),
+                        extra={'media': self.media_name})
+            return urls[:max_articles]
+        
+        return None
+    
+    def scrape_wp_api(self, max_articles):
+        """
+        Nouveaux articles via l'API REST WordPress: dates exactes et contenu complet,
+        une requête JSON pour 100 articles au lieu d'une page HTML par article
         
-        print(f"   ✅ {len(articles)} articles scrapés")
+        Returns:
+            list: Articles (les plus récents d'abord), None si l'API est indisponible
+        """
+        params = {'per_page': min(WP_PER_PAGE, max_articles), '_fields': WP_FIELDS}
+        if self.last_publication_date:
+            # Même granularité que should_scrape_article: depuis le début du jour de la dernière publication
+            day_start = datetime.combine(self.last_publication_date.date(), time.min)
+            params['after'] = (day_start - timedelta(seconds=1)).strftime('%Y-%m-%dT%H:%M:%S')
+        
+        articles = []
+        page = 1
+        while len(articles) < max_articles:
+            params['page'] = page
+            content = self.fetch(f"{self.wp_api}?{urlencode(params)}")
+            try:
+                posts = json.loads(content) if content else None
+            except ValueError:
+                posts = None
+            if not isinstance(posts, list):
+                # Première page illisible: API désactivée ou protégée
+                return None if page == 1 else articles
+            
+            for post in posts:
+                article = self.wp_post_to_article(post)
+                if article and self.should_scrape_article(article['date']):
+                    articles.append(article)
+            
+            if len(posts) < params['per_page']:
+                break
+            page += 1
+        
+        logger.info("🔌 API WordPress: %d nouveaux articles en %d requête(s)", len(articles), page,
+                    extra={'media': self.media_name})
+        return articles[:max_articles]
+    
+    def wp_post_to_article(self, post):
+        """Article standardisé depuis un post de l'API REST WordPress"""
+        url = post.get('link')
+        if not url:
+            return None
+        
+        titre = html.unescape(_TAGS.sub('', (post.get('title') or {}).get('rendered', '')))
+        
+        contenu = ''
+        rendered = (post.get('content') or {}).get('rendered', '')
+        if rendered.strip():
+            paragraphes = (p.text() for p in parse_html(rendered, self.html_backend).select('p'))
+            contenu = '\n\n'.join([html.unescape(texte) for texte in paragraphes if texte])
+        
+        date = None
+        if post.get('date_gmt'):
+            try:
+                date = datetime.fromisoformat(post['date_gmt']).replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+        
+        return self.create_article_dict(url=url, titre=titre, contenu=contenu, date=date)
+    
+    def scrape_section(self, section_url, max_articles=20, registry=None):
+        """Scrape une section complète (sans retélécharger les URLs du registre)"""
+        urls = self.get_article_urls(section_url, max_articles)
+        found = len(urls)
+        if registry is not None:
+            urls = registry.filter_new(urls, self.media_name)
+        
+        articles = self.scrape_articles(urls)
+        logger.debug("📰 Section %s: %d URLs trouvées (%d déjà vues), %d articles scrapés",
+                     section_url, found, found - len(urls), len(articles),
+                     extra={'media': self.media_name})
         return articles
+    
+    def scrape_all_sections(self, max_articles_per_section=20):
+        """Scrape les nouveaux articles: par l'API WordPress ou les flux si possible, sinon toutes les sections"""
+        logger.info("🔍 Scraping de %s", self.media_name, extra={'media': self.media_name})
+        
+        max_articles = max_articles_per_section * len(self.sections)
+        self.date_failures = []
+        self.hosts = HostControllers()
+        # Registre du passage, ou propre à ce média si le scraper est utilisé seul
+        registry = self.url_registry or UrlRegistry()
+        saved_before = registry.saved_by_media.get(self.media_name, 0)
+        
+        all_articles = None
+        if self.discovery == 'auto' and self.wp_api:
+            articles = self.scrape_wp_api(max_articles)
+            if articles is not None:
+                all_articles = [a for a in articles if registry.claim(a['url'], self.media_name)]
+            else:
+                logger.info("↩️ API WordPress indisponible", extra={'media': self.media_name})
+        
+        if all_articles is None:
+            all_articles = []
+            urls = None
+            if self.discovery in ('auto', 'feeds') and self.feeds:
+                urls = self.discover_article_urls(max_articles)
+                if urls is None and self.last_publication_date:
+                    logger.info("↩️ Aucun flux exploitable, scraping par rubriques", extra={'media': self.media_name})
+            
+            if urls is not None:
+                all_articles = self.scrape_articles(registry.filter_new(urls, self.media_name))
+            else:
+                for url_section in self.sections.values():
+                    articles = self.scrape_section(url_section, max_articles_per_section, registry)
+                    all_articles.extend(articles)
+        
+        # Téléchargements évités (URLs déjà vues), requêtes ignorées (site indisponible),
+        # dates illisibles (articles sans date)
+        logger.info("✅ %d articles scrapés de %s", len(all_articles), self.media_name, extra={
+            'media': self.media_name,
+            'articles': len(all_articles),
+            'fetches_saved': registry.saved_by_media.get(self.media_name, 0) - saved_before,
+            'requests_skipped': self.hosts.skipped,
+            'date_failures': len(self.date_failures)
+        })
+        return all_articles
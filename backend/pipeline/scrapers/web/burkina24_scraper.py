@@ -6,7 +6,6 @@ Scraper pour burkina24.com
 
 from .base_scraper import BaseWebScraper
 import html
-from datetime import datetime, timedelta
 
 class Burkina24Scraper(BaseWebScraper):
     
@@ -23,67 +22,38 @@ class Burkina24Scraper(BaseWebScraper):
             'Education': 'https://burkina24.com/category/actualite/education/',
             'Société': 'https://burkina24.com/category/actualite/societe/societe-societe/',
         }
+        # Flux RSS WordPress, puis index des sitemaps
+        self.feeds = [
+            'https://burkina24.com/feed/',
+            'https://burkina24.com/sitemap_index.xml',
+        ]
+        # Site WordPress: articles datés et complets en JSON
+        self.wp_api = 'https://burkina24.com/wp-json/wp/v2/posts'
     
-    def parse_relative_date(self, date_text):
-        """Convertit les dates relatives en datetime"""
-        try:
-            maintenant = datetime.now()
-            date_text = date_text.lower().strip()
-            
-            if "il y a" in date_text:
-                if "minute" in date_text:
-                    return maintenant
-                elif "heure" in date_text:
-                    hours = int(''.join(filter(str.isdigit, date_text.split("heure")[0]))) if any(c.isdigit() for c in date_text) else 1
-                    return maintenant - timedelta(hours=hours)
-                elif "jour" in date_text:
-                    days = int(''.join(filter(str.isdigit, date_text.split("jour")[0])))
-                    return maintenant - timedelta(days=days)
-                elif "semaine" in date_text:
-                    weeks = int(''.join(filter(str.isdigit, date_text.split("semaine")[0]))) if any(c.isdigit() for c in date_text) else 1
-                    return maintenant - timedelta(weeks=weeks)
-                elif "mois" in date_text:
-                    months = int(''.join(filter(str.isdigit, date_text.split("mois")[0]))) if any(c.isdigit() for c in date_text) else 1
-                    return maintenant - timedelta(days=months*30)
-            
-            return maintenant
-        except:
-            return datetime.now()
-    
-    def get_article_urls(self, section_url, max_articles=20):
-        """Récupère les URLs des articles"""
-        soup = self.make_request(section_url)
-        if not soup:
-            return []
-        
-        urls = []
-        for article in soup.select('li.post-item h2.post-title a'):
-            href = article.get('href')
-            if href and href not in urls:
-                urls.append(href)
-            if len(urls) >= max_articles:
-                break
-        
-        return urls[:max_articles]
+    def extract_listing(self, doc):
+        """(url, date) des articles d'une page de catégorie"""
+        for item in doc.select('li.post-item'):
+            link = item.select_one('h2.post-title a')
+            href = link.attr('href') if link else None
+            if not href:
+                continue
+            date_tag = item.select_one('span.date')
+            yield href, self.parse_french_date(date_tag.text()) if date_tag else None
     
-    def scrape_article(self, url):
-        """Scrape un article de Burkina24"""
-        soup = self.make_request(url)
-        if not soup:
-            return None
-        
+    def extract_article(self, doc, url):
+        """Article de Burkina24 depuis sa page"""
         # TITRE
         titre = ''
-        titre_tag = soup.find('h1', class_='post-title')
+        titre_tag = doc.select_one('h1.post-title')
         if titre_tag:
-            titre = html.unescape(titre_tag.get_text(strip=True))
+            titre = html.unescape(titre_tag.text())
         
         # DATE
         date = None
-        date_tag = soup.find('span', class_='date')
+        date_tag = doc.select_one('span.date')
         if date_tag:
-            date_str = date_tag.get_text(strip=True)
-            date = self.parse_relative_date(date_str)
+            date_str = date_tag.text()
+            date = self.parse_french_date(date_str)
         
         # Vérifier si on doit scraper cet article basé sur sa date
         if not self.should_scrape_article(date):
@@ -92,19 +62,19 @@ class Burkina24Scraper(BaseWebScraper):
         # COMMENTAIRES
         commentaires = 0
         try:
-            comments_tag = soup.find('span', class_='meta-comment')
+            comments_tag = doc.select_one('span.meta-comment')
             if comments_tag:
-                comment_text = comments_tag.get_text(strip=True)
+                comment_text = comments_tag.text()
                 commentaires = int(''.join(filter(str.isdigit, comment_text))) if comment_text else 0
         except:
             pass
         
         # CONTENU
         contenu = ''
-        contenu_div = soup.find('div', class_='entry-content')
+        contenu_div = doc.select_one('div.entry-content')
         if contenu_div:
-            paragraphes = contenu_div.find_all('p')
-            contenu = '\n\n'.join([html.unescape(p.get_text(strip=True)) for p in paragraphes if p.get_text(strip=True)])
+            paragraphes = (p.text() for p in contenu_div.select('p'))
+            contenu = '\n\n'.join([html.unescape(texte) for texte in paragraphes if texte])
         
         return self.create_article_dict(
             url=url,
@@ -113,18 +83,3 @@ class Burkina24Scraper(BaseWebScraper):
             date=date,
             commentaires=commentaires
         )
-    
-    def scrape_all_sections(self, max_articles_per_section=20):
-        """Scrape toutes les sections"""
-        print(f"\n{'='*70}")
-        print(f"🔍 SCRAPING: {self.media_name.upper()}")
-        print(f"{'='*70}")
-        
-        all_articles = []
-        for nom_section, url_section in self.sections.items():
-            print(f"\n📂 Section: {nom_section}")
-            articles = self.scrape_section(url_section, max_articles_per_section)
-            all_articles.extend(articles)
-        
-        print(f"\n✅ Total: {len(all_articles)} articles scrapés de {self.media_name}")
-        return all_articles
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enregistrement et rejeu des réponses HTTP des scrapers (cassettes)
+Une cassette remplace la session HTTP d'un scraper (scraper.session):
+- mode 'record': requêtes réelles, réponses enregistrées dans le fichier
+- mode 'replay': réponses servies depuis le fichier, sans réseau
+
+Format: JSON compressé (gzip), {url: {status, content_type, body | body_base64}}
+"""
+
+import base64
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+
+
+class CassetteMiss(Exception):
+    """URL absente de la cassette en mode rejeu"""
+
+
+class CassetteResponse:
+    """Réponse minimale compatible avec l'usage qu'en font les scrapers"""
+
+    def __init__(self, url, status_code, content, content_type=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'Content-Type': content_type} if content_type else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise CassetteMiss(f"{self.status_code} (cassette) pour {self.url}")
+
+
+class Cassette:
+    """Session HTTP enregistrée ou rejouée"""
+
+    def __init__(self, path=None, mode='replay', session=None):
+        """
+        Args:
+            path: Fichier de la cassette (None: cassette en mémoire, voir add)
+            mode: 'record' ou 'replay'
+            session: Session réelle utilisée en enregistrement (défaut: requests.Session())
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Mode de cassette inconnu: {mode}")
+        self.path = Path(path) if path else None
+        self.mode = mode
+        self._session = session
+        self._lock = threading.Lock()
+        self.interactions = {}
+        self.hits = 0
+        self.misses = 0
+        # Temps passé dans get() (réseau en enregistrement, lecture mémoire en rejeu)
+        self.elapsed = 0.0
+
+        if mode == 'replay' and self.path:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                self.interactions = json.load(f)
+        elif mode == 'record' and session is None:
+            import requests
+            self._session = requests.Session()
+
+    def add(self, url, content, status=200, content_type='text/html; charset=utf-8'):
+        """Ajoute une réponse (construction de cassettes à partir de pages enregistrées)"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        with self._lock:
+            self.interactions[url] = _encode(status, content, content_type)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            if self.mode == 'record':
+                response = self._session.get(url, headers=headers, timeout=timeout, **kwargs)
+                self.add(url, response.content, response.status_code, response.headers.get('Content-Type'))
+                return response
+
+            interaction = self.interactions.get(url)
+            if interaction is None:
+                self.misses += 1
+                return CassetteResponse(url, 404, b'')
+            self.hits += 1
+            return _decode(url, interaction)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def save(self):
+        """Écrit la cassette (mode enregistrement)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump(self.interactions, f, ensure_ascii=False, sort_keys=True)
+
+
+def _encode(status, content, content_type):
+    interaction = {'status': status, 'content_type': content_type}
+    try:
+        interaction['body'] = content.decode('utf-8')
+    except UnicodeDecodeError:
+        interaction['body_base64'] = base64.b64encode(content).decode('ascii')
+    return interaction
+
+
+def _decode(url, interaction):
+    if 'body' in interaction:
+        content = interaction['body'].encode('utf-8')
+    else:
+        content = base64.b64decode(interaction['body_base64'])
+    return CassetteResponse(url, interaction['status'], content, interaction.get('content_type'))
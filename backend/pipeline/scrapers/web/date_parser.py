@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse des dates des médias: françaises absolues, numériques, ISO et relatives
+- "mardi 11 mars 2025 à 10h30", "Mardi, 11 Mars 2025 10:00", "1er févr. 2025"
+- "11/03/2025 à 10:30", "2025-03-11T10:00:00+00:00"
+- "il y a 3 heures", "il y a une semaine", "hier à 18h", "aujourd'hui"
+
+Une expression régulière précompilée par format, résultat mémorisé par texte (les
+dates relatives sont mémorisées comme décalage, appliqué à l'heure courante).
+Une date illisible lève DateParseError (ou donne None avec try_parse_date) au lieu
+de devenir datetime.now(): une date inventée fausse la coupure incrémentale
+(last_publication_date).
+"""
+
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+MONTHS = {
+    'janvier': 1, 'janv': 1, 'jan': 1,
+    'février': 2, 'fevrier': 2, 'févr': 2, 'fevr': 2, 'fév': 2, 'fev': 2,
+    'mars': 3, 'mar': 3,
+    'avril': 4, 'avr': 4,
+    'mai': 5,
+    'juin': 6,
+    'juillet': 7, 'juil': 7,
+    'août': 8, 'aout': 8,
+    'septembre': 9, 'sept': 9, 'sep': 9,
+    'octobre': 10, 'oct': 10,
+    'novembre': 11, 'nov': 11,
+    'décembre': 12, 'decembre': 12, 'déc': 12, 'dec': 12,
+}
+
+# Heure optionnelle après la date: "à 10h30", ", 10:30", "10h", "- 10 h 30 min"
+_TIME = r'(?:\s*(?:à|a|,|-)?\s*(\d{1,2})\s*(?:h|:)\s*(\d{2})?)?'
+# Nom de mois le plus long d'abord (septembre avant sept avant sep)
+_MONTH_NAMES = '|'.join(sorted(MONTHS, key=len, reverse=True))
+
+_FRENCH = re.compile(rf'(?<!\d)(\d{{1,2}})(?:er)?\s+({_MONTH_NAMES})\.?\s+(\d{{4}}){_TIME}')
+_NUMERIC = re.compile(rf'(?<!\d)(\d{{1,2}})[/.](\d{{1,2}})[/.](\d{{4}}){_TIME}')
+_ISO = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:z|[+-]\d{2}:?\d{2})?$')
+_RELATIVE = re.compile(
+    r"il y a\s+(?:(\d+)|(une?|quelques))?\s*(seconde|minute|min|heure|h|jour|semaine|mois|an|année)s?\b"
+)
+_DAY_WORD = re.compile(rf"(aujourd'hui|aujourd’hui|hier|avant-hier){_TIME}")
+_JUST_NOW = re.compile(r"à l'instant|à l’instant|maintenant")
+
+_UNITS = {
+    'seconde': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'min': timedelta(minutes=1),
+    'heure': timedelta(hours=1),
+    'h': timedelta(hours=1),
+    'jour': timedelta(days=1),
+    'semaine': timedelta(weeks=1),
+    # Approximations (comme l'ancien parse_relative_date)
+    'mois': timedelta(days=30),
+    'an': timedelta(days=365),
+    'année': timedelta(days=365),
+}
+_DAY_OFFSETS = {"aujourd'hui": 0, 'aujourd’hui': 0, 'hier': 1, 'avant-hier': 2}
+
+
+class DateParseError(ValueError):
+    """Texte de date illisible"""
+
+
+def _time_of_day(hour, minute):
+    return int(hour) if hour else 0, int(minute) if minute else 0
+
+
+@lru_cache(maxsize=4096)
+def _parse_normalized(text):
+    """
+    Analyse d'un texte normalisé (minuscules, espaces simples), mémorisée
+
+    Returns:
+        tuple: ('absolute', datetime), ('relative', timedelta), ('day', (jours, heure, minute)),
+               ou None si illisible
+    """
+    if _ISO.match(text):
+        try:
+            return 'absolute', datetime.fromisoformat(text.upper().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    match = _FRENCH.search(text)
+    if match:
+        day, month, year, hour, minute = match.groups()
+        try:
+            return 'absolute', datetime(int(year), MONTHS[month], int(day), *_time_of_day(hour, minute))
+        except ValueError:
+            return None
+
+    match = _NUMERIC.search(text)
+    if match:
+        day, month, year, hour, minute = match.groups()
+        try:
+            return 'absolute', datetime(int(year), int(month), int(day), *_time_of_day(hour, minute))
+        except ValueError:
+            return None
+
+    match = _RELATIVE.search(text)
+    if match:
+        number, word, unit = match.groups()
+        # "une heure", "un jour", "quelques minutes" (compté comme 1)
+        amount = int(number) if number else 1
+        return 'relative', _UNITS[unit] * amount
+
+    match = _DAY_WORD.search(text)
+    if match:
+        word, hour, minute = match.groups()
+        return 'day', (_DAY_OFFSETS[word], hour, minute)
+
+    if _JUST_NOW.search(text):
+        return 'relative', timedelta(0)
+
+    return None
+
+
+def parse_date(text, now=None):
+    """
+    Analyse une date de média
+
+    Args:
+        text: Texte de la date
+        now: Heure de référence des dates relatives (défaut: maintenant)
+
+    Returns:
+        datetime
+
+    Raises:
+        DateParseError: texte vide ou format non reconnu
+    """
+    if not text or not isinstance(text, str):
+        raise DateParseError(f"Date vide: {text!r}")
+
+    parsed = _parse_normalized(' '.join(text.lower().split()))
+    if parsed is None:
+        raise DateParseError(f"Date illisible: {text!r}")
+
+    kind, value = parsed
+    if kind == 'absolute':
+        return value
+
+    now = now or datetime.now()
+    if kind == 'relative':
+        return now - value
+
+    days, hour, minute = value
+    day = now - timedelta(days=days)
+    if hour:
+        return day.replace(hour=int(hour), minute=int(minute) if minute else 0, second=0, microsecond=0)
+    return day.replace(hour=0, minute=0, second=0, microsecond=0) if days else now
+
+
+def try_parse_date(text, now=None):
+    """Comme parse_date, mais None si la date est illisible"""
+    try:
+        return parse_date(text, now)
+    except DateParseError:
+        return None
@@ -7,6 +7,10 @@ Scraper pour fasopresse.net
 from .base_scraper import BaseWebScraper
 import html
 
+# Rubriques dont les liens sont des articles
+ARTICLE_PATHS = ('/politique/', '/societe/', '/economie/', '/sports/', '/sante-et-social/',
+                 '/international/', '/conseils-des-ministres/')
+
 class FasoPresseScraper(BaseWebScraper):
     
     def __init__(self):
@@ -20,54 +24,46 @@ class FasoPresseScraper(BaseWebScraper):
             "International": "https://www.fasopresse.net/international",
             "Sports": "https://www.fasopresse.net/sports",
         }
+        # Flux RSS Joomla
+        self.feeds = [
+            'https://www.fasopresse.net/index2.php?option=com_rss&feed=RSS2.0&no_html=1',
+        ]
     
-    def get_article_urls(self, section_url, max_articles=20):
-        """Récupère les URLs des articles"""
-        soup = self.make_request(section_url)
-        if not soup:
-            return []
-        
-        urls = []
+    def extract_listing(self, doc):
+        """(url, date) des articles d'une page de rubrique (td.createdate après le titre)"""
         # FasoPresse utilise <a class="contentpagetitle"> pour les liens d'articles
-        for link in soup.select('a.contentpagetitle, a.blogsection'):
-            href = link.get('href')
-            if href:
-                # Supprimer les paramètres de session
-                if '?' in href:
-                    href = href.split('?')[0]
-                # Convertir les liens relatifs en absolus
-                if href.startswith('/'):
-                    href = self.base_url + href
-                if href not in urls and ('/politique/' in href or '/societe/' in href or '/economie/' in href or '/sports/' in href or '/sante-et-social/' in href or '/international/' in href or '/conseils-des-ministres/' in href):
-                    urls.append(href)
-            if len(urls) >= max_articles:
-                break
-        
-        return urls[:max_articles]
+        links = self.iter_dated_links(doc, 'a.contentpagetitle, a.blogsection', 'td.createdate',
+                                      lambda date_tag: self.parse_french_date(date_tag.text()))
+        seen = set()
+        for href, date in links:
+            # Supprimer les paramètres de session
+            if '?' in href:
+                href = href.split('?')[0]
+            # Convertir les liens relatifs en absolus
+            if href.startswith('/'):
+                href = self.base_url + href
+            # "Lire la suite" (a.blogsection) suit la date: seul le titre porte la bonne date
+            if href not in seen and any(rubrique in href for rubrique in ARTICLE_PATHS):
+                seen.add(href)
+                yield href, date
     
-    def scrape_article(self, url):
-        """Scrape un article de FasoPresse"""
-        soup = self.make_request(url)
-        if not soup:
-            return None
-        
+    def extract_article(self, doc, url):
+        """Article de FasoPresse depuis sa page"""
         # TITRE - Dans <a class="contentpagetitle"> ou <td class="contentheading">
         titre = ''
-        titre_tag = soup.find('a', class_='contentpagetitle')
+        titre_tag = doc.select_one('a.contentpagetitle')
         if not titre_tag:
-            titre_tag = soup.find('td', class_='contentheading')
-            if titre_tag:
-                titre_link = titre_tag.find('a')
-                if titre_link:
-                    titre = html.unescape(titre_link.get_text(strip=True))
+            titre_link = doc.select_one('td.contentheading a')
+            if titre_link:
+                titre = html.unescape(titre_link.text())
         else:
-            titre = html.unescape(titre_tag.get_text(strip=True))
+            titre = html.unescape(titre_tag.text())
         
         # DATE - Dans <td class="createdate">
         date = None
-        date_tag = soup.find('td', class_='createdate')
+        date_tag = doc.select_one('td.createdate')
         if date_tag:
-            date_str = date_tag.get_text(strip=True)
+            date_str = date_tag.text()
             date = self.parse_french_date(date_str)
         
         # Vérifier si on doit scraper cet article basé sur sa date
@@ -76,15 +72,15 @@ class FasoPresseScraper(BaseWebScraper):
         
         # AUTEUR - Dans <span class="small">Écrit par ...</span>
         auteur = None
-        auteur_span = soup.find('span', class_='small')
+        auteur_span = doc.select_one('span.small')
         if auteur_span:
-            texte_auteur = auteur_span.get_text(strip=True)
+            texte_auteur = auteur_span.text()
             if 'Écrit par' in texte_auteur:
                 auteur = texte_auteur.replace('Écrit par', '').strip()
         
         # CONTENU - Dans les paragraphes de la 2ème table contentpaneopen
         contenu = ''
-        content_tables = soup.find_all('table', class_='contentpaneopen')
+        content_tables = doc.select('table.contentpaneopen')
         # Généralement la 2ème table contient le contenu de l'article
         if len(content_tables) >= 2:
             content_table = content_tables[1]
@@ -95,10 +91,9 @@ class FasoPresseScraper(BaseWebScraper):
             
         if content_table:
             # Chercher tous les <p> dans la table
-            paragraphes = content_table.find_all('p')
             contenu_parts = []
-            for p in paragraphes:
-                texte = html.unescape(p.get_text(strip=True))
+            for p in content_table.select('p'):
+                texte = html.unescape(p.text())
                 if texte and len(texte) > 20:
                     contenu_parts.append(texte)
             contenu = '\n\n'.join(contenu_parts)
@@ -110,18 +105,3 @@ class FasoPresseScraper(BaseWebScraper):
             date=date,
             auteur=auteur
         )
-    
-    def scrape_all_sections(self, max_articles_per_section=20):
-        """Scrape toutes les sections"""
-        print(f"\n{'='*70}")
-        print(f"🔍 SCRAPING: {self.media_name.upper()}")
-        print(f"{'='*70}")
-        
-        all_articles = []
-        for nom_section, url_section in self.sections.items():
-            print(f"\n📂 Section: {nom_section}")
-            articles = self.scrape_section(url_section, max_articles_per_section)
-            all_articles.extend(articles)
-        
-        print(f"\n✅ Total: {len(all_articles)} articles scrapés de {self.media_name}")
-        return all_articles
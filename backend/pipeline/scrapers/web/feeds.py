@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lecture des flux RSS/Atom et des sitemaps (classiques ou Google News)
+Une seule petite requête par média donne les URLs récentes avec leur date de
+publication, sans télécharger les pages de rubriques.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+# Balises de date par type de document, par ordre de préférence
+ITEM_DATE_TAGS = ('pubDate', 'date', 'published', 'updated', 'publication_date', 'lastmod')
+
+
+def _local(tag):
+    """Nom de balise sans espace de noms ({http://...}link -> link)"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element, *names):
+    """Texte du premier descendant portant l'un des noms (dans l'ordre des noms)"""
+    found = {}
+    for child in element.iter():
+        name = _local(child.tag)
+        if name in names and name not in found and child.text and child.text.strip():
+            found[name] = child.text.strip()
+    for name in names:
+        if name in found:
+            return found[name]
+    return None
+
+
+def parse_feed_date(value):
+    """Date RFC 822 (RSS) ou ISO 8601 (Atom, sitemaps), None si illisible"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _atom_link(entry):
+    for child in entry:
+        if _local(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate' and child.get('href'):
+            return child.get('href')
+    return None
+
+
+def parse_feed(content):
+    """
+    Analyse un flux RSS/Atom ou un sitemap
+
+    Args:
+        content: Document XML (bytes)
+
+    Returns:
+        tuple: ('articles', [(url, date ou None)]) pour un flux ou un sitemap d'URLs,
+               ('sitemaps', [(url, date ou None)]) pour un index de sitemaps,
+               None si le document n'est pas un flux reconnu
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        return None
+
+    kind = _local(root.tag)
+    entries = []
+    if kind in ('rss', 'RDF'):
+        for item in root.iter():
+            if _local(item.tag) == 'item':
+                url = _child_text(item, 'link')
+                if url:
+                    entries.append((url, parse_feed_date(_child_text(item, *ITEM_DATE_TAGS))))
+        return 'articles', entries
+
+    if kind == 'feed':
+        for entry in root:
+            if _local(entry.tag) == 'entry':
+                url = _atom_link(entry)
+                if url:
+                    entries.append((url, parse_feed_date(_child_text(entry, *ITEM_DATE_TAGS))))
+        return 'articles', entries
+
+    if kind in ('urlset', 'sitemapindex'):
+        element = 'url' if kind == 'urlset' else 'sitemap'
+        for node in root:
+            if _local(node.tag) == element:
+                url = _child_text(node, 'loc')
+                if url:
+                    entries.append((url, parse_feed_date(_child_text(node, *ITEM_DATE_TAGS))))
+        return ('articles' if kind == 'urlset' else 'sitemaps'), entries
+
+    return None
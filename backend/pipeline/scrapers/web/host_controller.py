@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contrôle des requêtes par site (hôte) pendant un passage
+- Débit adaptatif (AIMD): la concurrence augmente d'un cran par succès (additif) et
+  est divisée par deux, délai entre requêtes doublé, sur erreur ou réponse lente
+- Disjoncteur: après CIRCUIT_FAILURES échecs consécutifs, les requêtes suivantes
+  vers ce site sont ignorées immédiatement pour le reste du passage
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Requêtes simultanées par site: départ séquentiel, plafond
+INITIAL_CONCURRENCY = 1
+MAX_CONCURRENCY = 4
+# Délai entre deux départs de requêtes: premier palier après une erreur, plafond, retour par succès
+MIN_BACKOFF = 0.5
+MAX_DELAY = 10.0
+DELAY_STEP = 0.25
+# Réponse lente: latence supérieure à SLOW_FACTOR fois la moyenne (moyenne mobile exponentielle)
+# et à SLOW_MIN_LATENCY secondes (les variations de quelques millisecondes ne comptent pas)
+SLOW_FACTOR = 3.0
+SLOW_MIN_LATENCY = 2.0
+LATENCY_SMOOTHING = 0.2
+# Échecs consécutifs avant l'ouverture du disjoncteur
+CIRCUIT_FAILURES = 3
+
+logger = logging.getLogger(__name__)
+
+
+def host_of(url):
+    """Hôte d'une URL, sans www. (www.lefaso.net et lefaso.net sont le même site)"""
+    netloc = urlsplit(url).netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+class HostController:
+    """Concurrence, délai et disjoncteur d'un site (thread-safe)"""
+
+    def __init__(self, host):
+        self.host = host
+        self.limit = float(INITIAL_CONCURRENCY)
+        self.delay = 0.0
+        self.latency = None
+        self.active = 0
+        self.consecutive_failures = 0
+        self.circuit_open = False
+        self.requests = 0
+        self.failures = 0
+        self.skipped = 0
+        self._next_start = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """
+        Attend une place (concurrence et délai du site) avant une requête
+
+        Returns:
+            bool: False si le disjoncteur est ouvert (requête à ignorer)
+        """
+        with self._cond:
+            while not self.circuit_open and self.active >= int(self.limit):
+                self._cond.wait()
+            if self.circuit_open:
+                self.skipped += 1
+                return False
+            self.active += 1
+            now = time.monotonic()
+            start_at = max(now, self._next_start)
+            self._next_start = start_at + self.delay
+        if start_at > now:
+            time.sleep(start_at - now)
+        return True
+
+    def release(self, latency, ok):
+        """
+        Enregistre l'issue d'une requête et ajuste concurrence et délai
+
+        Args:
+            latency: Durée de la requête (secondes)
+            ok: False pour une erreur réseau, un 429 ou un 5xx
+        """
+        opened = False
+        with self._cond:
+            self.active -= 1
+            self.requests += 1
+            if ok:
+                self.consecutive_failures = 0
+                slow = self.latency is not None and latency > max(SLOW_MIN_LATENCY, SLOW_FACTOR * self.latency)
+                self.latency = latency if self.latency is None else \
+                    (1 - LATENCY_SMOOTHING) * self.latency + LATENCY_SMOOTHING * latency
+                if slow:
+                    self._decrease()
+                else:
+                    self.limit = min(MAX_CONCURRENCY, self.limit + 1 / self.limit)
+                    self.delay = max(0.0, self.delay - DELAY_STEP)
+            else:
+                self.failures += 1
+                self.consecutive_failures += 1
+                self._decrease()
+                if self.consecutive_failures >= CIRCUIT_FAILURES and not self.circuit_open:
+                    self.circuit_open = opened = True
+            self._cond.notify_all()
+
+        if opened:
+            logger.warning("🔌 %s: %d échecs consécutifs, requêtes suivantes ignorées pour ce passage",
+                           self.host, CIRCUIT_FAILURES, extra={'host': self.host})
+
+    def _decrease(self):
+        self.limit = max(1.0, self.limit / 2)
+        self.delay = min(MAX_DELAY, max(MIN_BACKOFF, self.delay * 2))
+
+
+class HostControllers:
+    """Contrôleurs par site, créés à la demande (thread-safe)"""
+
+    def __init__(self):
+        self._controllers = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = host_of(url)
+        with self._lock:
+            controller = self._controllers.get(host)
+            if controller is None:
+                controller = self._controllers[host] = HostController(host)
+            return controller
+
+    @property
+    def skipped(self):
+        """Requêtes ignorées (disjoncteur ouvert), tous sites confondus"""
+        return sum(controller.skipped for controller in self._controllers.values())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse HTML des scrapers web avec un moteur interchangeable
+- selectolax (Lexbor): le plus rapide
+- lxml (libxml2 + cssselect): sélecteurs CSS compilés une seule fois
+- bs4 (BeautifulSoup, html.parser): ancien comportement, toujours disponible
+
+Les scrapers n'utilisent qu'une petite API commune (select, select_one, text, attr,
+has_ancestor), identique quel que soit le moteur.
+
+Choix du moteur: SCRAPER_HTML_PARSER=selectolax|lxml|bs4 (défaut: le premier installé)
+"""
+
+import importlib.util
+import os
+import re
+from functools import lru_cache
+
+# Par ordre de préférence
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+# Module à importer pour chaque moteur
+_BACKEND_MODULES = {
+    'selectolax': 'selectolax',
+    'lxml': 'lxml',
+    'bs4': 'bs4',
+}
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def available_backends():
+    """Moteurs installés, par ordre de préférence"""
+    return [name for name in BACKENDS if importlib.util.find_spec(_BACKEND_MODULES[name])]
+
+
+@lru_cache(maxsize=None)
+def default_backend():
+    """Moteur configuré (SCRAPER_HTML_PARSER) ou le plus rapide installé"""
+    configured = os.getenv('SCRAPER_HTML_PARSER')
+    if configured:
+        if configured not in BACKENDS:
+            raise ValueError(f"Moteur HTML inconnu: {configured} (choix: {', '.join(BACKENDS)})")
+        return configured
+
+    installed = available_backends()
+    if not installed:
+        raise ImportError("Aucun moteur HTML installé (selectolax, lxml ou beautifulsoup4)")
+    return installed[0]
+
+
+def decode_html(content):
+    """
+    Décode une page en texte: UTF-8, sinon l'encodage déclaré en <meta>, sinon cp1252
+    Tous les moteurs reçoivent ainsi le même texte
+    """
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+
+    match = _META_CHARSET.search(content[:2048])
+    if match:
+        try:
+            return content.decode(match.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    return content.decode('cp1252', errors='replace')
+
+
+def parse_html(content, backend=None):
+    """
+    Analyse une page HTML
+
+    Args:
+        content: Page (bytes de la réponse HTTP ou texte)
+        backend: Moteur ('selectolax', 'lxml', 'bs4'), défaut: default_backend()
+
+    Returns:
+        Nœud racine du document (API commune des moteurs)
+    """
+    backend = backend or default_backend()
+    parser = _PARSERS.get(backend)
+    if parser is None:
+        raise ValueError(f"Moteur HTML inconnu: {backend} (choix: {', '.join(BACKENDS)})")
+    return parser(decode_html(content))
+
+
+# ==================== SELECTOLAX ====================
+
+class SelectolaxNode:
+    """Nœud Lexbor"""
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag(self):
+        return self._node.tag
+
+    def select(self, css):
+        return [SelectolaxNode(node) for node in self._node.css(css)]
+
+    def select_one(self, css):
+        node = self._node.css_first(css)
+        return SelectolaxNode(node) if node is not None else None
+
+    def text(self):
+        """Textes du sous-arbre, chacun sans espaces de bord, concaténés"""
+        return self._node.text(deep=True, separator='', strip=True)
+
+    def attr(self, name, default=None):
+        value = self._node.attributes.get(name)
+        return default if value is None else value
+
+    def has_ancestor(self, *tags):
+        parent = self._node.parent
+        while parent is not None:
+            if parent.tag in tags:
+                return True
+            parent = parent.parent
+        return False
+
+
+def _parse_selectolax(text):
+    from selectolax.lexbor import LexborHTMLParser
+    return SelectolaxNode(LexborHTMLParser(text).root)
+
+
+# ==================== LXML ====================
+
+@lru_cache(maxsize=256)
+def _compiled_selector(css):
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(css, translator='html')
+
+
+class LxmlNode:
+    """Élément lxml"""
+
+    __slots__ = ('_element',)
+
+    def __init__(self, element):
+        self._element = element
+
+    @property
+    def tag(self):
+        return self._element.tag
+
+    def select(self, css):
+        return [LxmlNode(element) for element in _compiled_selector(css)(self._element)]
+
+    def select_one(self, css):
+        for element in _compiled_selector(css)(self._element):
+            return LxmlNode(element)
+        return None
+
+    def text(self):
+        """Textes du sous-arbre, chacun sans espaces de bord, concaténés"""
+        return ''.join(part.strip() for part in self._element.itertext())
+
+    def attr(self, name, default=None):
+        return self._element.get(name, default)
+
+    def has_ancestor(self, *tags):
+        for _ in self._element.iterancestors(*tags):
+            return True
+        return False
+
+
+def _parse_lxml(text):
+    from lxml import html as lxml_html
+    # lxml refuse un texte Unicode qui déclare son encodage (pages XHTML)
+    return LxmlNode(lxml_html.document_fromstring(_XML_DECLARATION.sub('', text, count=1)))
+
+
+# ==================== BEAUTIFULSOUP ====================
+
+class SoupNode:
+    """Tag BeautifulSoup"""
+
+    __slots__ = ('_tag',)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    @property
+    def tag(self):
+        return self._tag.name
+
+    def select(self, css):
+        return [SoupNode(tag) for tag in self._tag.select(css)]
+
+    def select_one(self, css):
+        tag = self._tag.select_one(css)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self):
+        """Textes du sous-arbre, chacun sans espaces de bord, concaténés"""
+        return self._tag.get_text(strip=True)
+
+    def attr(self, name, default=None):
+        return self._tag.get(name, default)
+
+    def has_ancestor(self, *tags):
+        return self._tag.find_parent(list(tags)) is not None
+
+
+def _parse_bs4(text):
+    from bs4 import BeautifulSoup
+    return SoupNode(BeautifulSoup(text, 'html.parser'))
+
+
+_PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'bs4': _parse_bs4,
+}
@@ -5,9 +5,19 @@ Scraper pour lefaso.net
 """
 
 from .base_scraper import BaseWebScraper
+import logging
 import re
 import html
 
+WHITESPACE = re.compile(r'\s+')
+# Suffixe " - LeFaso.net ..." des titres
+SITE_SUFFIX = re.compile(r'\s*-\s*(?:le[Ff]aso|LeFaso)\.net.*$')
+PUBLISHED = re.compile(r'Publié le (.+?)(?:\s+à|\s*$)', re.I)
+REACTIONS = re.compile(r'Vos r[ée]actions', re.I)
+REACTION_COUNT = re.compile(r'\((\d+)\)')
+
+logger = logging.getLogger(__name__)
+
 class LeFasoScraper(BaseWebScraper):
     
     def __init__(self):
@@ -21,16 +31,15 @@ class LeFasoScraper(BaseWebScraper):
             "Sport": "https://lefaso.net/spip.php?rubrique5",
             "Culture": "https://lefaso.net/spip.php?rubrique18",
         }
+        # Flux RSS SPIP du site
+        self.feeds = [
+            'https://lefaso.net/spip.php?page=backend',
+        ]
     
-    def get_article_urls(self, section_url, max_articles=20):
-        """Récupère les URLs des articles d'une section"""
-        soup = self.make_request(section_url)
-        if not soup:
-            return []
-        
-        urls = []
-        for link in soup.find_all('a', href=True):
-            href = link.get('href')
+    def extract_listing(self, doc):
+        """(url, date) des articles d'une page de rubrique (pas de date dans les listes SPIP)"""
+        for link in doc.select('a[href]'):
+            href = link.attr('href')
             if href and 'spip.php?article' in href:
                 if href.startswith('http'):
                     url_complete = href
@@ -38,30 +47,16 @@ class LeFasoScraper(BaseWebScraper):
                     url_complete = self.base_url + href
                 else:
                     url_complete = self.base_url + '/' + href
-                
-                if url_complete not in urls:
-                    urls.append(url_complete)
-                
-                if len(urls) >= max_articles:
-                    break
-        
-        return urls[:max_articles]
+                yield url_complete, None
     
-    def scrape_article(self, url):
-        """Scrape un article complet de LeFaso.net"""
-        soup = self.make_request(url)
-        if not soup:
-            return None
-        
+    def extract_article(self, doc, url):
+        """Article complet de LeFaso.net depuis sa page"""
         # TITRE - chercher tous les h1.entry-title et ignorer "Newsletter"
         titre = ''
-        all_titles = soup.find_all('h1', class_='entry-title')
-        for titre_tag in all_titles:
-            titre_brut = titre_tag.get_text(strip=True)
-            titre_brut = html.unescape(titre_brut)
-            titre_brut = re.sub(r'\s+', ' ', titre_brut)
-            titre_brut = re.sub(r'\s*-\s*le[Ff]aso\.net.*$', '', titre_brut)
-            titre_brut = re.sub(r'\s*-\s*LeFaso\.net.*$', '', titre_brut)
+        for titre_tag in doc.select('h1.entry-title'):
+            titre_brut = html.unescape(titre_tag.text())
+            titre_brut = WHITESPACE.sub(' ', titre_brut)
+            titre_brut = SITE_SUFFIX.sub('', titre_brut)
             # Ignorer "Newsletter" et prendre le premier titre valide
             if titre_brut and titre_brut != 'Newsletter LeFaso.net' and 'Newsletter' not in titre_brut:
                 titre = titre_brut.strip()
@@ -72,10 +67,10 @@ class LeFasoScraper(BaseWebScraper):
         
         # DATE
         date_brute = None
-        for p_tag in soup.find_all('p'):
-            texte_p = p_tag.get_text(strip=True)
+        for p_tag in doc.select('p'):
+            texte_p = p_tag.text()
             if 'Publié' in texte_p or 'publié' in texte_p:
-                match = re.search(r'Publié le (.+?)(?:\s+à|\s*$)', texte_p, re.I)
+                match = PUBLISHED.search(texte_p)
                 if match:
                     date_brute = match.group(1).strip()
                     break
@@ -88,37 +83,36 @@ class LeFasoScraper(BaseWebScraper):
         
         # AUTEUR
         auteur = None
-        auteur_meta = soup.find('meta', {'name': re.compile('author', re.I)})
-        if auteur_meta:
-            auteur = auteur_meta.get('content', '')
+        for meta in doc.select('meta[name]'):
+            if 'author' in meta.attr('name', '').lower():
+                auteur = meta.attr('content', '')
+                break
         
         # CONTENU
         contenu = ''
-        contenu_div = soup.find('div', class_='entry-content')
+        contenu_div = doc.select_one('div.entry-content')
         if contenu_div:
-            paragraphes = contenu_div.find_all('p')
-            contenu = '\n\n'.join([p.get_text(strip=True) for p in paragraphes if p.get_text(strip=True)])
+            paragraphes = (p.text() for p in contenu_div.select('p'))
+            contenu = '\n\n'.join([texte for texte in paragraphes if texte])
         
         # COMMENTAIRES/RÉACTIONS
         commentaires = 0
         try:
             # Chercher le titre avec le compteur de réactions
-            reactions_heading = soup.find('h2', string=re.compile(r'Vos r[ée]actions', re.I))
-            if reactions_heading:
-                # Extraire le nombre entre parenthèses
-                match = re.search(r'\((\d+)\)', reactions_heading.get_text())
-                if match:
-                    commentaires = int(match.group(1))
+            for heading in doc.select('h2'):
+                texte_heading = heading.text()
+                if REACTIONS.search(texte_heading):
+                    # Extraire le nombre entre parenthèses
+                    match = REACTION_COUNT.search(texte_heading)
+                    if match:
+                        commentaires = int(match.group(1))
+                    break
             
             # Méthode alternative: compter les éléments <li class="forum-fil">
             if commentaires == 0:
-                forum_ul = soup.find('ul', id='navforum', class_='forum')
-                if forum_ul:
-                    forum_fils = forum_ul.find_all('li', class_='forum-fil', recursive=False)
-                    commentaires = len(forum_fils)
+                commentaires = len(doc.select('ul#navforum.forum > li.forum-fil'))
         except Exception as e:
-            print(f"  ⚠️ Erreur extraction commentaires: {e}")
-            pass
+            logger.debug("⚠️ Erreur extraction commentaires %s: %s", url, e)
         
         return self.create_article_dict(
             url=url,
@@ -128,21 +122,6 @@ class LeFasoScraper(BaseWebScraper):
             auteur=auteur,
             commentaires=commentaires
         )
-    
-    def scrape_all_sections(self, max_articles_per_section=20):
-        """Scrape toutes les sections"""
-        print(f"\n{'='*70}")
-        print(f"🔍 SCRAPING: {self.media_name.upper()}")
-        print(f"{'='*70}")
-        
-        all_articles = []
-        for nom_section, url_section in self.sections.items():
-            print(f"\n📂 Section: {nom_section}")
-            articles = self.scrape_section(url_section, max_articles_per_section)
-            all_articles.extend(articles)
-        
-        print(f"\n✅ Total: {len(all_articles)} articles scrapés de {self.media_name}")
-        return all_articles
 
 
 if __name__ == "__main__":
@@ -19,40 +19,32 @@ class ObservateurScraper(BaseWebScraper):
             "Culture": "https://www.lobservateur.bf/culture",
             "Economie": "https://www.lobservateur.bf/economie",
         }
+        # Flux RSS WordPress, puis index des sitemaps
+        self.feeds = [
+            'https://www.lobservateur.bf/feed/',
+            'https://www.lobservateur.bf/sitemap_index.xml',
+        ]
     
-    def get_article_urls(self, section_url, max_articles=20):
-        """Récupère les URLs des articles"""
-        soup = self.make_request(section_url)
-        if not soup:
-            return []
-        
-        urls = []
-        for link in soup.select('h3.entry-title a, h2.entry-title a'):
-            href = link.get('href')
-            if href and href.startswith(self.base_url) and href not in urls:
-                urls.append(href)
-            if len(urls) >= max_articles:
-                break
-        
-        return urls[:max_articles]
+    def extract_listing(self, doc):
+        """(url, date) des articles d'une page de rubrique (date dans time.entry-date après le titre)"""
+        links = self.iter_dated_links(doc, 'h3.entry-title a, h2.entry-title a', 'time.entry-date', self.parse_iso_date)
+        for href, date in links:
+            if href.startswith(self.base_url):
+                yield href, date
     
-    def scrape_article(self, url):
-        """Scrape un article de L'Observateur"""
-        soup = self.make_request(url)
-        if not soup:
-            return None
-        
+    def extract_article(self, doc, url):
+        """Article de L'Observateur depuis sa page"""
         # TITRE
         titre = ''
-        titre_tag = soup.find('h1', class_='entry-title')
+        titre_tag = doc.select_one('h1.entry-title')
         if titre_tag:
-            titre = html.unescape(titre_tag.get_text(strip=True))
+            titre = html.unescape(titre_tag.text())
         
         # DATE
         date = None
-        date_div = soup.find('div', class_='entry-meta')
+        date_div = doc.select_one('div.entry-meta')
         if date_div:
-            date_str = date_div.get_text(strip=True).replace('Publication :', '').strip()
+            date_str = date_div.text().replace('Publication :', '').strip()
             date = self.parse_french_date(date_str)
         
         # Vérifier si on doit scraper cet article basé sur sa date
@@ -61,16 +53,16 @@ class ObservateurScraper(BaseWebScraper):
         
         # AUTEUR
         auteur = None
-        auteur_tag = soup.find('span', class_='author')
+        auteur_tag = doc.select_one('span.author')
         if auteur_tag:
-            auteur = auteur_tag.get_text(strip=True)
+            auteur = auteur_tag.text()
         
         # CONTENU
         contenu = ''
-        contenu_div = soup.find('div', class_='entry-content')
+        contenu_div = doc.select_one('div.entry-content')
         if contenu_div:
-            paragraphes = contenu_div.find_all('p')
-            contenu = '\n\n'.join([html.unescape(p.get_text(strip=True)) for p in paragraphes if p.get_text(strip=True)])
+            paragraphes = (p.text() for p in contenu_div.select('p'))
+            contenu = '\n\n'.join([html.unescape(texte) for texte in paragraphes if texte])
         
         return self.create_article_dict(
             url=url,
@@ -79,18 +71,3 @@ class ObservateurScraper(BaseWebScraper):
             date=date,
             auteur=auteur
         )
-    
-    def scrape_all_sections(self, max_articles_per_section=20):
-        """Scrape toutes les sections"""
-        print(f"\n{'='*70}")
-        print(f"🔍 SCRAPING: {self.media_name.upper()}")
-        print(f"{'='*70}")
-        
-        all_articles = []
-        for nom_section, url_section in self.sections.items():
-            print(f"\n📂 Section: {nom_section}")
-            articles = self.scrape_section(url_section, max_articles_per_section)
-            all_articles.extend(articles)
-        
-        print(f"\n✅ Total: {len(all_articles)} articles scrapés de {self.media_name}")
-        return all_articles
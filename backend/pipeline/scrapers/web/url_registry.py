@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registre des URLs d'articles demandées pendant un passage
+Partagé par toutes les rubriques d'un média et par tous les médias d'un passage:
+un article listé dans plusieurs rubriques n'est téléchargé et analysé qu'une fois.
+"""
+
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+
+def canonical_url(url):
+    """
+    Clé de comparaison d'une URL: sans schéma, sans www., sans ancre ni / final
+    (https://www.site.bf/article/#forum et http://site.bf/article désignent le même article)
+    """
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    return urlunsplit(('', netloc, parts.path.rstrip('/'), parts.query, ''))
+
+
+class UrlRegistry:
+    """URLs déjà réservées, et téléchargements évités par média (thread-safe)"""
+
+    def __init__(self):
+        self._urls = set()
+        self._lock = threading.Lock()
+        self.saved = 0
+        self.saved_by_media = {}
+
+    def claim(self, url, media=None):
+        """
+        Réserve une URL avant son téléchargement
+
+        Returns:
+            bool: True si l'URL est nouvelle (à télécharger), False si déjà réservée
+        """
+        key = canonical_url(url)
+        with self._lock:
+            if key in self._urls:
+                self.saved += 1
+                if media:
+                    self.saved_by_media[media] = self.saved_by_media.get(media, 0) + 1
+                return False
+            self._urls.add(key)
+            return True
+
+    def filter_new(self, urls, media=None):
+        """URLs non encore réservées (réservées au passage), dans l'ordre"""
+        return [url for url in urls if self.claim(url, media)]
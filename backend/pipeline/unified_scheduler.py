@@ -1,15 +1,14 @@
 """
 Scheduler unifié pour lancer automatiquement les 2 pipelines:
-- Pipeline WEB (médias burkinabè)
-- Pipeline Facebook
-Toutes les 10 minutes avec système de notifications
+- Pipeline WEB: un job par média, à intervalle adapté à son rythme de publication
+- Pipeline Facebook: toutes les 10 minutes
+Avec système de notifications
 """
 
 import logging
 import sys
 from pathlib import Path
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 import threading
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
@@ -18,56 +17,55 @@ from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from pipeline.orchestrator import PipelineOrchestrator
+from pipeline.orchestrator import PipelineOrchestrator, create_web_scrapers
 from pipeline.scrapers.facebookScriping.facebook_orchestrator import FacebookOrchestrator
+from pipeline.utils.adaptive_schedule import AdaptiveInterval, load_publication_rates, normalize_media_name
+from pipeline.utils.job_store import get_job_store
+# Mêmes noms de modules que les orchestrateurs (utils.*, ml.*): registre de mesures unique
+from ml.predictor import CategoryPredictor
+from utils.db_writer import DatabaseWriter
+from supabase_client import get_supabase_client
+from utils.log import configure_logging
 
-# Configuration du logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Sortie configurée par le point d'entrée (configure_logging)
 logger = logging.getLogger(__name__)
 
-# Fichier pour persister l'état
-STATE_FILE = Path(__file__).parent.parent / 'pipeline_state.json'
+# Jobs et notifications partagés avec les routes API
+job_store = get_job_store()
 
-def load_pipeline_state():
-    """Charge l'état du pipeline depuis le fichier"""
-    if STATE_FILE.exists():
-        try:
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Erreur chargement état: {e}")
-    return {
-        'is_running': False,
-        'last_run': None,
-        'last_result': None,
-        'current_progress': None,
-        'notifications': []
-    }
+# Intervalle du pipeline Facebook (relit les JSON des moniteurs, aucun scraping)
+FACEBOOK_INTERVAL_MINUTES = 10
+
+# État du scheduler par média (un seul processus planifie)
+_scheduler = None
+_intervals = {}
+_last_runs = {}
+
+# Modèle ML et écrivain BD partagés par tous les passages (chargés au premier passage)
+_shared_modules = None
+_shared_modules_lock = threading.Lock()
+
+
+def shared_modules():
+    """
+    Prédicteur et écrivain BD communs aux orchestrateurs du scheduler
+    Un passage par média toutes les quelques minutes ne recharge ni le modèle ni les
+    IDs des médias et catégories.
+
+    Returns:
+        dict: {'predictor': CategoryPredictor, 'db_writer': DatabaseWriter}
+    """
+    global _shared_modules
+    with _shared_modules_lock:
+        if _shared_modules is None:
+            _shared_modules = {'predictor': CategoryPredictor(), 'db_writer': DatabaseWriter()}
+        return _shared_modules
 
-def save_pipeline_state(state):
-    """Sauvegarde l'état du pipeline dans le fichier"""
-    try:
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.error(f"❌ Erreur sauvegarde état: {e}")
 
 def add_notification(notification):
-    """Ajoute une notification à la liste (max 20)"""
-    state = load_pipeline_state()
-    
-    # Ajouter l'ID et le statut read
-    notification['id'] = datetime.now().timestamp()
-    notification['read'] = False
-    
-    state['notifications'].insert(0, notification)
-    # Garder seulement les 20 dernières
-    state['notifications'] = state['notifications'][:20]
-    save_pipeline_state(state)
-    logger.info(f"📢 Notification ajoutée: {notification['title']}")
+    """Ajoute une notification (les 20 dernières sont conservées)"""
+    job_store.add_notification(notification)
+    logger.info("📢 Notification ajoutée: %s", notification['title'])
 
 
 def run_alerts_check():
@@ -104,28 +102,16 @@ def run_alerts_check():
         
         total_alerts = 0
         
+        # Régularité (90 jours) de tous les médias en une seule lecture
+        from pipeline.utils.publication_days import PublicationDays
+        regularities = PublicationDays(supabase).get_regularity([media['id'] for media in medias.data])
+        
         for media in medias.data:
-            # Calculer la régularité (90 jours)
-            from datetime import timedelta
-            ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-            articles_90d = supabase.table('articles')\
-                .select('date')\
-                .eq('media_id', media['id'])\
-                .gte('date', ninety_days_ago.isoformat())\
-                .execute()
-            
-            dates_with_articles = set()
-            for article in articles_90d.data:
-                article_date = datetime.fromisoformat(article['date'].replace('Z', '+00:00')).date()
-                dates_with_articles.add(article_date)
-            
-            days_with_publications = len(dates_with_articles)
-            regularite = (days_with_publications / 90) * 100
-            
-            media['regularite'] = regularite
+            media['regularite'] = regularities.get(media['id'], 0.0)
             
             # Générer les alertes pour ce média
             alerts = generator.generate_alerts_for_media(media)
+            logger.info("⏱️ Alertes %s: %s", media['name'], generator.format_timings())
             
             # Sauvegarder les alertes
             for alert in alerts:
@@ -143,7 +129,7 @@ def run_alerts_check():
                             'timestamp': datetime.now().isoformat()
                         })
         
-        logger.info(f"✅ Vérification des alertes terminée: {total_alerts} nouvelles alertes")
+        logger.info("✅ Vérification des alertes terminée: %d nouvelles alertes", total_alerts)
         
         # Notification récapitulative si des alertes ont été créées
         if total_alerts > 0:
@@ -155,9 +141,7 @@ def run_alerts_check():
             })
         
     except Exception as e:
-        logger.error(f"❌ Erreur lors de la vérification des alertes: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur lors de la vérification des alertes: %s", e)
 
 
 def run_unified_pipeline():
@@ -166,41 +150,17 @@ def run_unified_pipeline():
     1. Pipeline WEB (médias burkinabè)
     2. Pipeline Facebook
     """
-    state = load_pipeline_state()
-    
-    # Vérifier si un scraping est déjà en cours (avec timeout de sécurité de 30 min)
-    if state.get('is_running', False):
-        last_run = state.get('last_run')
-        if last_run:
-            from dateutil import parser
-            last_run_time = parser.isoparse(last_run)
-            elapsed = (datetime.now() - last_run_time).total_seconds()
-            # Si le scraping est bloqué depuis plus de 30 minutes, on le débloque
-            if elapsed > 1800:  # 30 minutes
-                logger.warning(f"⚠️ Scraping bloqué depuis {elapsed/60:.1f} min - Déblocage forcé")
-                state['is_running'] = False
-                save_pipeline_state(state)
-            else:
-                logger.warning(f"⚠️ Un scraping est déjà en cours depuis {elapsed/60:.1f} min")
-                return
-        else:
-            logger.warning("⚠️ Un scraping est déjà en cours, passage ignoré")
-            return
-    
-    logger.info("=" * 80)
-    logger.info("🚀 LANCEMENT DES PIPELINES AUTOMATIQUES")
-    logger.info("=" * 80)
-    
-    # Recharger l'état pour préserver les notifications précédentes
-    state = load_pipeline_state()
-    state['is_running'] = True
-    state['last_run'] = datetime.now().isoformat()
-    state['current_progress'] = {
+    # Single-flight: le job n'est créé que si aucun autre pipeline ne tourne
+    job_id = job_store.start_job(progress={
         'status': 'starting',
         'message': '🚀 Démarrage des pipelines...',
         'timestamp': datetime.now().isoformat()
-    }
-    save_pipeline_state(state)
+    })
+    if job_id is None:
+        logger.warning("⚠️ Un scraping est déjà en cours, passage ignoré")
+        return
+    
+    logger.info("🚀 Lancement des pipelines automatiques", extra={'job_id': job_id})
     
     # Notification de démarrage
     add_notification({
@@ -218,23 +178,20 @@ def run_unified_pipeline():
         nonlocal web_stats
         try:
             # === PIPELINE 1: WEB ===
-            logger.info("\n📰 === PIPELINE WEB - Médias burkinabè ===")
+            logger.info("📰 Pipeline WEB: médias burkinabè")
             
-            # Recharger l'état pour préserver les notifications
-            state = load_pipeline_state()
-            state['current_progress'] = {
-                'status': 'web_scraping',
-                'message': '📰 Scraping des sites web en cours...',
-                'timestamp': datetime.now().isoformat()
-            }
-            save_pipeline_state(state)
+            job_store.update_progress(job_id, 'web_scraping', '📰 Scraping des sites web en cours...')
             
-            web_orchestrator = PipelineOrchestrator(include_facebook=False)
+            web_orchestrator = PipelineOrchestrator(
+                include_facebook=False,
+                on_event=job_store.event_callback(job_id, pipeline='web'),
+                **shared_modules()
+            )
             web_stats = web_orchestrator.run_full_pipeline(
                 max_articles_per_section=20,
                 facebook_max_posts=0
             )
-            logger.info(f"✅ Pipeline WEB terminé: {web_stats.get('total_inserted', 0)} articles insérés")
+            logger.info("✅ Pipeline WEB terminé: %d articles insérés", web_stats.get('total_inserted', 0))
             
             # Notification succès WEB
             add_notification({
@@ -246,7 +203,7 @@ def run_unified_pipeline():
             })
             
         except Exception as e:
-            logger.error(f"❌ Erreur Pipeline WEB: {e}")
+            logger.error("❌ Erreur Pipeline WEB: %s", e)
             add_notification({
                 'type': 'error',
                 'title': 'Erreur Pipeline WEB',
@@ -260,20 +217,14 @@ def run_unified_pipeline():
         nonlocal facebook_stats
         try:
             # === PIPELINE 2: FACEBOOK ===
-            logger.info("\n👥 === PIPELINE FACEBOOK ===")
+            logger.info("👥 Pipeline Facebook")
             
-            # Recharger l'état pour préserver les notifications
-            state = load_pipeline_state()
-            state['current_progress'] = {
-                'status': 'facebook_scraping',
-                'message': '👥 Traitement des posts Facebook...',
-                'timestamp': datetime.now().isoformat()
-            }
-            save_pipeline_state(state)
+            job_store.update_progress(job_id, 'facebook_scraping', '👥 Traitement des posts Facebook...')
             
-            fb_orchestrator = FacebookOrchestrator()
+            fb_orchestrator = FacebookOrchestrator(on_event=job_store.event_callback(job_id, pipeline='facebook'),
+                                                   **shared_modules())
             facebook_stats = fb_orchestrator.run_full_pipeline()
-            logger.info(f"✅ Pipeline Facebook terminé: {facebook_stats.get('inserted', 0)} posts insérés")
+            logger.info("✅ Pipeline Facebook terminé: %d posts insérés", facebook_stats.get('inserted', 0))
             
             # Notification succès Facebook
             add_notification({
@@ -289,7 +240,7 @@ def run_unified_pipeline():
             })
             
         except Exception as e:
-            logger.error(f"❌ Erreur Pipeline Facebook: {e}")
+            logger.error("❌ Erreur Pipeline Facebook: %s", e)
             add_notification({
                 'type': 'error',
                 'title': 'Erreur Pipeline Facebook',
@@ -318,27 +269,22 @@ def run_unified_pipeline():
         # === RÉSUMÉ FINAL ===
         total_inserted = web_stats.get('total_inserted', 0) + facebook_stats.get('inserted', 0)
         
-        logger.info("\n" + "=" * 80)
-        logger.info("📊 RÉSUMÉ DES PIPELINES")
-        logger.info("=" * 80)
-        logger.info(f"📰 WEB: {web_stats.get('total_inserted', 0)} articles")
-        logger.info(f"👥 FACEBOOK: {facebook_stats.get('inserted', 0)} posts")
-        logger.info(f"✅ TOTAL: {total_inserted} nouveaux contenus")
-        logger.info("=" * 80)
+        logger.info("📊 Pipelines terminés: %d nouveaux contenus (WEB: %d articles, Facebook: %d posts)",
+                    total_inserted, web_stats.get('total_inserted', 0), facebook_stats.get('inserted', 0),
+                    extra={'summary': {
+                        'job_id': job_id,
+                        'total_inserted': total_inserted,
+                        'web': web_stats,
+                        'facebook': facebook_stats
+                    }})
         
-        # Recharger l'état pour préserver les notifications
-        state = load_pipeline_state()
-        state['is_running'] = False
-        state['last_run'] = datetime.now().isoformat()
-        state['last_result'] = {
+        job_store.finish_job(job_id, result={
             'success': True,
             'web_stats': web_stats,
             'facebook_stats': facebook_stats,
             'total_inserted': total_inserted,
             'timestamp': datetime.now().isoformat()
-        }
-        state['current_progress'] = None
-        save_pipeline_state(state)
+        })
         
         # Notification finale de résumé
         add_notification({
@@ -354,21 +300,9 @@ def run_unified_pipeline():
         })
         
     except Exception as e:
-        logger.error(f"❌ ERREUR CRITIQUE: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ ERREUR CRITIQUE: %s", e)
         
-        # Recharger l'état pour préserver les notifications
-        state = load_pipeline_state()
-        state['is_running'] = False
-        state['last_run'] = datetime.now().isoformat()
-        state['last_result'] = {
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }
-        state['current_progress'] = None
-        save_pipeline_state(state)
+        job_store.finish_job(job_id, error=str(e))
         
         add_notification({
             'type': 'error',
@@ -378,26 +312,177 @@ def run_unified_pipeline():
         })
 
 
+def run_media_pipeline(media_name):
+    """
+    Passage du pipeline WEB pour un seul média, puis reprogrammation
+    à un intervalle adapté à ce qu'il a ramené
+    """
+    interval = _intervals.setdefault(media_name, AdaptiveInterval())
+    now = datetime.now()
+    elapsed = (now - _last_runs[media_name]).total_seconds() / 60 if media_name in _last_runs else 0
+    _last_runs[media_name] = now
+    
+    try:
+        # Single-flight par média (un passage manuel /run peut tourner en parallèle)
+        job_id = job_store.start_job(f"media:{media_name}", progress={
+            'status': 'starting',
+            'message': f'🚀 Scraping {media_name}...',
+            'timestamp': now.isoformat()
+        })
+        if job_id is None:
+            logger.warning("⚠️ %s: passage précédent encore en cours, ignoré", media_name)
+            return
+        
+        try:
+            orchestrator = PipelineOrchestrator(
+                include_facebook=False,
+                on_event=job_store.event_callback(job_id, pipeline='web'),
+                media_names=[media_name],
+                **shared_modules()
+            )
+            stats = orchestrator.run_full_pipeline(max_articles_per_section=20, facebook_max_posts=0)
+        except Exception as e:
+            logger.error("❌ Erreur pipeline %s: %s", media_name, e)
+            job_store.finish_job(job_id, error=str(e))
+            interval.record_run(0, elapsed, failed=True)
+            add_notification({
+                'type': 'error',
+                'title': f'Erreur scraping {media_name}',
+                'message': str(e),
+                'timestamp': datetime.now().isoformat()
+            })
+            return
+        
+        inserted = stats.get('total_inserted', 0)
+        job_store.finish_job(job_id, result={
+            'success': True,
+            'stats': stats,
+            'timestamp': datetime.now().isoformat()
+        })
+        interval.record_run(inserted, elapsed)
+        logger.info("✅ %s: %d articles insérés", media_name, inserted)
+        
+        # Pas de notification pour les passages sans nouveauté (la plupart)
+        if inserted:
+            add_notification({
+                'type': 'success',
+                'title': f'{media_name}: nouveaux articles',
+                'message': f"{inserted} nouveaux articles insérés",
+                'stats': stats,
+                'timestamp': datetime.now().isoformat()
+            })
+    finally:
+        schedule_next_media_run(media_name)
+
+
+def schedule_next_media_run(media_name, delay_seconds=None):
+    """Programme le prochain passage d'un média (délai adaptatif par défaut)"""
+    if _scheduler is None:
+        return
+    
+    if delay_seconds is None:
+        delay_seconds = _intervals[media_name].next_delay_seconds()
+    
+    _scheduler.add_job(
+        func=run_media_pipeline,
+        trigger='date',
+        run_date=datetime.now() + timedelta(seconds=delay_seconds),
+        args=[media_name],
+        id=f'media_pipeline_{media_name}',
+        name=f'Pipeline WEB {media_name}',
+        replace_existing=True,
+        misfire_grace_time=None
+    )
+    logger.info("⏰ %s: prochain passage dans %.1f min", media_name, delay_seconds / 60)
+
+
+def schedule_media_jobs(scheduler):
+    """
+    Crée un job par média web, intervalle initial d'après le rythme de publication
+    observé (scraping_media_details), premiers passages échelonnés d'une minute
+    """
+    global _scheduler
+    _scheduler = scheduler
+    
+    try:
+        rates = load_publication_rates(get_supabase_client())
+    except Exception as e:
+        logger.warning("⚠️ Rythme de publication indisponible, intervalle par défaut: %s", e)
+        rates = {}
+    
+    for index, scraper in enumerate(create_web_scrapers()):
+        rate = rates.get(normalize_media_name(scraper.media_name))
+        _intervals[scraper.media_name] = AdaptiveInterval(rate)
+        if rate is not None:
+            logger.info("📈 %s: %.1f articles/jour", scraper.media_name, rate * 24)
+        schedule_next_media_run(scraper.media_name, delay_seconds=60 * index)
+
+
+def run_facebook_pipeline():
+    """Pipeline Facebook seul (job périodique)"""
+    job_id = job_store.start_job('facebook', progress={
+        'status': 'starting',
+        'message': '👥 Traitement des posts Facebook...',
+        'timestamp': datetime.now().isoformat()
+    })
+    if job_id is None:
+        logger.warning("⚠️ Pipeline Facebook déjà en cours, passage ignoré")
+        return
+    
+    try:
+        fb_orchestrator = FacebookOrchestrator(on_event=job_store.event_callback(job_id, pipeline='facebook'),
+                                               **shared_modules())
+        facebook_stats = fb_orchestrator.run_full_pipeline()
+        job_store.finish_job(job_id, result={
+            'success': True,
+            'stats': facebook_stats,
+            'timestamp': datetime.now().isoformat()
+        })
+        logger.info("✅ Pipeline Facebook terminé: %d posts insérés", facebook_stats.get('inserted', 0))
+    except Exception as e:
+        logger.error("❌ Erreur Pipeline Facebook: %s", e)
+        job_store.finish_job(job_id, error=str(e))
+        add_notification({
+            'type': 'error',
+            'title': 'Erreur Pipeline Facebook',
+            'message': str(e),
+            'timestamp': datetime.now().isoformat()
+        })
+
+
 def start_unified_scheduler():
     """
     Démarre le scheduler unifié qui lance:
-    - Les 2 pipelines (WEB + Facebook) toutes les 10 minutes
+    - Le pipeline WEB de chaque média à son propre rythme
+    - Le pipeline Facebook toutes les 10 minutes
     - La vérification des alertes toutes les heures
     """
     scheduler = BackgroundScheduler()
     
-    # Job 1: Pipelines toutes les 10 minutes
+    # Libérer les jobs laissés 'running' par un processus arrêté
+    recovered = job_store.recover_interrupted_jobs()
+    if recovered:
+        logger.warning("⚠️ %d job(s) interrompu(s) marqué(s) en échec", recovered)
+    
+    # Jours de publication: initialisation depuis les articles si la table est vide
+    from pipeline.utils.publication_days import PublicationDays
+    PublicationDays(get_supabase_client()).ensure_backfilled()
+    
+    # Job 1: Pipeline WEB, un job par média à intervalle adaptatif
+    schedule_media_jobs(scheduler)
+    
+    # Job 2: Pipeline Facebook toutes les 10 minutes
     scheduler.add_job(
-        func=run_unified_pipeline,
+        func=run_facebook_pipeline,
         trigger='interval',
-        minutes=10,
-        id='unified_pipeline_job',
-        name='Pipeline Unifié (WEB + Facebook)',
+        minutes=FACEBOOK_INTERVAL_MINUTES,
+        id='facebook_pipeline_job',
+        name='Pipeline Facebook',
         replace_existing=True,
         max_instances=1  # Un seul job à la fois
     )
     
-    # Job 2: Alertes toutes les heures
+    # Job 3: Alertes toutes les heures
     scheduler.add_job(
         func=run_alerts_check,
         trigger='interval',
@@ -413,22 +498,20 @@ def start_unified_scheduler():
     try:
         run_alerts_check()
     except Exception as e:
-        logger.error(f"❌ Erreur lors de la vérification initiale des alertes: {e}")
+        logger.error("❌ Erreur lors de la vérification initiale des alertes: %s", e)
     
     # Listener pour les événements
     def job_listener(event):
         if event.exception:
-            logger.error(f"❌ Job failed: {event.exception}")
+            logger.error("❌ Job failed: %s", event.exception)
         else:
-            logger.info(f"✅ Job executed successfully")
+            logger.info("✅ Job executed successfully")
     
     scheduler.add_listener(job_listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
     
     scheduler.start()
-    logger.info("✅ Scheduler unifié démarré")
-    logger.info("   📰 Pipeline WEB + 👥 Pipeline Facebook toutes les 10 minutes")
-    logger.info("   🚨 Vérification des alertes toutes les heures")
-    logger.info("   ⏰ Prochaine exécution des pipelines dans 10 minutes")
+    logger.info("✅ Scheduler unifié démarré: WEB par média (intervalle adaptatif), Facebook toutes les %d minutes, "
+                "alertes toutes les heures", FACEBOOK_INTERVAL_MINUTES)
     
     return scheduler
 
@@ -437,6 +520,7 @@ if __name__ == '__main__':
     """
     Mode autonome: lance le scheduler et attend indéfiniment
     """
+    configure_logging()
     logger.info("🚀 Démarrage du scheduler unifié en mode autonome")
     
     scheduler = start_unified_scheduler()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Intervalles de scraping adaptés au rythme de publication de chaque média
+- Intervalle de base: temps moyen pour voir TARGET_ARTICLES_PER_RUN nouveaux articles,
+  d'après les articles insérés (scraping_media_details) sur RATE_WINDOW_DAYS jours
+- Recul exponentiel quand un passage ne ramène rien (ou échoue)
+- Gigue aléatoire pour que les médias ne tombent pas tous à la même minute
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from .pagination import fetch_all_rows
+
+# Bornes de l'intervalle entre deux passages d'un média
+MIN_INTERVAL_MINUTES = 5
+MAX_INTERVAL_MINUTES = 240
+# Intervalle tant que le rythme du média est inconnu (ancien comportement global)
+DEFAULT_INTERVAL_MINUTES = 10
+
+# Nouveaux articles attendus par passage (0.5: un passage sur deux ramène un article)
+TARGET_ARTICLES_PER_RUN = 0.5
+# Fenêtre d'observation du rythme de publication
+RATE_WINDOW_DAYS = 7
+# Poids d'un passage dans la moyenne glissante du rythme
+RATE_SMOOTHING = 0.3
+
+# Multiplicateur de l'intervalle par passage vide consécutif
+BACKOFF_FACTOR = 1.5
+# Gigue: ±15% de l'intervalle
+JITTER_RATIO = 0.15
+
+
+def normalize_media_name(name):
+    """Même normalisation que DateManager (variations de nom entre tables et scrapers)"""
+    return name.lower().replace(' ', '').replace('.', '')
+
+
+def load_publication_rates(supabase, days=RATE_WINDOW_DAYS):
+    """
+    Rythme de publication observé par média (articles insérés par heure)
+
+    Returns:
+        dict: {nom normalisé du média: articles/heure}
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    # Un détail par média et par passage: plusieurs milliers de lignes sur la fenêtre
+    rows = fetch_all_rows(lambda: supabase.table('scraping_media_details')
+                          .select('articles_inserted, medias(name)')
+                          .gte('created_at', since)
+                          .order('id'))
+
+    inserted = {}
+    for row in rows:
+        media = (row.get('medias') or {}).get('name')
+        if not media:
+            continue
+        key = normalize_media_name(media)
+        inserted[key] = inserted.get(key, 0) + (row.get('articles_inserted') or 0)
+
+    hours = days * 24
+    return {media: count / hours for media, count in inserted.items()}
+
+
+class AdaptiveInterval:
+    """Intervalle de scraping d'un média, ajusté après chaque passage"""
+
+    def __init__(self, rate_per_hour=None, rng=None):
+        """
+        Args:
+            rate_per_hour: Rythme observé (None si inconnu)
+            rng: Générateur aléatoire (gigue reproductible)
+        """
+        self.rate = rate_per_hour
+        self.empty_runs = 0
+        self.rng = rng or random.Random()
+
+    def base_minutes(self):
+        """Intervalle sans recul ni gigue, d'après le rythme de publication"""
+        if self.rate is None:
+            return DEFAULT_INTERVAL_MINUTES
+        if self.rate <= 0:
+            return MAX_INTERVAL_MINUTES
+        minutes = TARGET_ARTICLES_PER_RUN / self.rate * 60
+        return min(MAX_INTERVAL_MINUTES, max(MIN_INTERVAL_MINUTES, minutes))
+
+    def record_run(self, new_articles, elapsed_minutes, failed=False):
+        """
+        Met à jour le rythme et le recul après un passage
+
+        Args:
+            new_articles: Articles insérés par ce passage
+            elapsed_minutes: Temps écoulé depuis le passage précédent
+            failed: Passage en erreur (recul sans toucher au rythme)
+        """
+        if failed or not new_articles:
+            self.empty_runs += 1
+        else:
+            self.empty_runs = 0
+
+        if failed or elapsed_minutes <= 0:
+            return
+
+        observed = new_articles / (elapsed_minutes / 60)
+        if self.rate is None:
+            self.rate = observed
+        else:
+            self.rate = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * self.rate
+
+    def next_delay_seconds(self):
+        """Délai avant le prochain passage: base × recul, borné, avec gigue"""
+        minutes = self.base_minutes() * BACKOFF_FACTOR ** self.empty_runs
+        minutes = min(MAX_INTERVAL_MINUTES, max(MIN_INTERVAL_MINUTES, minutes))
+        minutes *= 1 + self.rng.uniform(-JITTER_RATIO, JITTER_RATIO)
+        return minutes * 60
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal d'audit des articles validés (optionnel, désactivé par défaut)
+Remplace les CSV temporaires des orchestrateurs: une seule écriture, en flux, des
+articles déjà validés, dans des fichiers JSONL compressés (gzip) en ajout seul, un
+fichier par jour.
+
+Plusieurs orchestrateurs (et le worker à côté de l'API) écrivent dans le même fichier:
+chaque lot est compressé en mémoire en un membre gzip complet puis ajouté d'une seule
+écriture, sous un verrou par fichier (threads) et un verrou fcntl (processus). Aucun
+flux gzip ne reste ouvert entre deux lots.
+
+Activation: PIPELINE_AUDIT_DIR=/chemin/vers/audit
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: verrou entre threads seulement
+    fcntl = None
+
+# Un verrou par fichier, partagé par toutes les instances du processus
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+
+def _lock_for(path):
+    with _file_locks_guard:
+        return _file_locks.setdefault(str(path), threading.Lock())
+
+
+class AuditSink:
+    """Écrit les articles validés dans <dossier>/<préfixe>-AAAA-MM-JJ.jsonl.gz"""
+
+    def __init__(self, directory=None, prefix='articles'):
+        """
+        Args:
+            directory: Dossier des journaux (défaut: PIPELINE_AUDIT_DIR, désactivé si absent)
+            prefix: Préfixe des fichiers (un journal par orchestrateur)
+        """
+        directory = directory or os.getenv('PIPELINE_AUDIT_DIR')
+        self.directory = Path(directory) if directory else None
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.written = 0
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    def _path_for_today(self):
+        return self.directory / f"{self.prefix}-{datetime.now().strftime('%Y-%m-%d')}.jsonl.gz"
+
+    def write(self, articles, source='web'):
+        """Ajoute des articles validés au journal du jour (sans effet si désactivé)"""
+        if not self.enabled or not articles:
+            return
+
+        audited_at = datetime.now().isoformat()
+        lines = ''.join(
+            json.dumps({'audited_at': audited_at, 'source': source, **article},
+                       ensure_ascii=False, default=str) + '\n'
+            for article in articles
+        )
+        # Membre gzip complet: les fichiers concaténés restent lisibles par gzip.open
+        member = gzip.compress(lines.encode('utf-8'))
+
+        path = self._path_for_today()
+        with _lock_for(path):
+            with open(path, 'ab') as audit_file:
+                if fcntl:
+                    fcntl.flock(audit_file, fcntl.LOCK_EX)
+                audit_file.write(member)
+                audit_file.flush()
+        with self._lock:
+            self.written += len(articles)
+
+    def close(self):
+        """Rien à fermer: chaque lot est écrit et fermé dans write()"""
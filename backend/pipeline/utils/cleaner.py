@@ -5,8 +5,11 @@ Module de nettoyage et validation des données scrapées
 """
 
 import re
+import logging
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class DataCleaner:
     """Nettoie et valide les données avant insertion dans la DB"""
     
@@ -129,8 +132,6 @@ class DataCleaner:
         Returns:
             Liste d'articles nettoyés (peut être plus courte si certains sont invalides)
         """
-        print(f"\n🧹 Nettoyage de {len(articles)} articles...")
-        
         cleaned_articles = []
         invalid_count = 0
         
@@ -141,24 +142,26 @@ class DataCleaner:
             else:
                 invalid_count += 1
         
-        print(f"✅ {len(cleaned_articles)} articles valides")
-        if invalid_count > 0:
-            print(f"⚠️  {invalid_count} articles rejetés (invalides)")
+        logger.info("🧹 Nettoyage de %d articles: %d valides, %d rejetés (invalides)",
+                    len(articles), len(cleaned_articles), invalid_count)
         
         return cleaned_articles
     
     @staticmethod
-    def deduplicate(articles):
+    def deduplicate(articles, seen_urls=None):
         """
         Supprime les doublons basés sur l'URL
         
         Args:
             articles: Liste d'articles
+            seen_urls: Ensemble d'URLs déjà vues, complété sur place (dédoublonnage
+                       d'un flux traité par lots)
         
         Returns:
             Liste sans doublons
         """
-        seen_urls = set()
+        if seen_urls is None:
+            seen_urls = set()
         unique_articles = []
         duplicates = 0
         
@@ -171,7 +174,7 @@ class DataCleaner:
                 duplicates += 1
         
         if duplicates > 0:
-            print(f"🔄 {duplicates} doublons supprimés")
+            logger.debug("🔄 %d doublons supprimés", duplicates)
         
         return unique_articles
 
@@ -6,6 +6,7 @@ Récupère la dernière date de publication par média
 """
 
 import sys
+import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -14,20 +15,29 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from supabase_client import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
 
 class DateManager:
     """Gère les dates de dernière publication par média"""
     
-    def __init__(self):
+    def __init__(self, media_names=None):
+        """
+        Args:
+            media_names: Médias dont charger la date (défaut: tous), une requête par média
+        """
         self.supabase = get_supabase_client()
         self.last_dates = {}
-        self._load_last_dates()
+        self._load_last_dates(media_names)
     
-    def _load_last_dates(self):
+    def _load_last_dates(self, media_names=None):
         """Charge la dernière date de publication pour chaque média"""
         try:
-            # Récupérer tous les médias
-            medias_result = self.supabase.table('medias').select('id, name').execute()
+            # Récupérer les médias
+            medias_query = self.supabase.table('medias').select('id, name')
+            if media_names is not None:
+                medias_query = medias_query.in_('name', list(media_names))
+            medias_result = medias_query.execute()
             
             for media in medias_result.data:
                 media_id = media['id']
@@ -37,6 +47,7 @@ class DateManager:
                 result = self.supabase.table('articles')\
                     .select('date')\
                     .eq('media_id', media_id)\
+                    .not_.is_('date', 'null')\
                     .order('date', desc=True)\
                     .limit(1)\
                     .execute()
@@ -53,13 +64,14 @@ class DateManager:
                     # Pas d'articles pour ce média, prendre il y a 7 jours
                     self.last_dates[media_name] = datetime.now() - timedelta(days=7)
             
-            print(f"✅ Dates de dernière publication chargées:")
-            for media_name, date in self.last_dates.items():
-                if '.' in media_name or ' ' in media_name:  # Afficher seulement les noms originaux
-                    print(f"   - {media_name}: {date.strftime('%Y-%m-%d %H:%M')}")
+            logger.debug("✅ Dates de dernière publication chargées", extra={'last_dates': {
+                # Seulement les noms originaux
+                media_name: date.strftime('%Y-%m-%d %H:%M')
+                for media_name, date in self.last_dates.items() if '.' in media_name or ' ' in media_name
+            }})
             
         except Exception as e:
-            print(f"❌ Erreur chargement dates: {e}")
+            logger.error("❌ Erreur chargement dates: %s", e)
     
     def get_last_date(self, media_name):
         """
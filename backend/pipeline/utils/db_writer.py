@@ -6,12 +6,18 @@ Module d'insertion des articles dans Supabase
 
 import sys
 import os
+import copy
+import logging
 from pathlib import Path
 
 # Ajouter le répertoire parent au path pour importer supabase_client
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from supabase_client import get_supabase_client
+from .metrics import METRICS
+from .publication_days import PublicationDays
+
+logger = logging.getLogger(__name__)
 
 class DatabaseWriter:
     """Gère l'insertion des articles dans Supabase"""
@@ -20,6 +26,19 @@ class DatabaseWriter:
         self.supabase = get_supabase_client()
         self.media_ids = self._load_media_ids()
         self.category_ids = self._load_category_ids()
+        self.publication_days = PublicationDays(self.supabase)
+        # Mesures (registre du passage fourni par l'orchestrateur, sinon celui du processus)
+        self.metrics = METRICS
+    
+    def with_metrics(self, metrics):
+        """
+        Même écrivain (client, IDs des médias et catégories) avec les mesures d'un passage
+        Un écrivain partagé par les passages du scheduler, éventuellement simultanés,
+        n'est ainsi jamais modifié.
+        """
+        writer = copy.copy(self)
+        writer.metrics = metrics
+        return writer
     
     def _load_media_ids(self):
         """Charge la correspondance nom_media → id"""
@@ -32,10 +51,10 @@ class DatabaseWriter:
                 mapping[name_normalized] = media['id']
                 # Aussi avec le nom original
                 mapping[media['name']] = media['id']
-            print(f"✅ {len(result.data)} médias chargés")
+            logger.debug("✅ %d médias chargés", len(result.data))
             return mapping
         except Exception as e:
-            print(f"❌ Erreur chargement médias: {e}")
+            logger.error("❌ Erreur chargement médias: %s", e)
             return {}
     
     def _load_category_ids(self):
@@ -48,10 +67,10 @@ class DatabaseWriter:
                 name_normalized = cat['nom'].lower()
                 mapping[name_normalized] = cat['id']
                 mapping[cat['nom']] = cat['id']
-            print(f"✅ {len(result.data)} catégories chargées")
+            logger.debug("✅ %d catégories chargées", len(result.data))
             return mapping
         except Exception as e:
-            print(f"❌ Erreur chargement catégories: {e}")
+            logger.error("❌ Erreur chargement catégories: %s", e)
             return {}
     
     def get_media_id(self, media_name):
@@ -70,7 +89,7 @@ class DatabaseWriter:
             if var in self.media_ids:
                 return self.media_ids[var]
         
-        print(f"⚠️ Média non trouvé: {media_name}")
+        logger.warning("⚠️ Média non trouvé: %s", media_name, extra={'sample': 20})
         return None
     
     def get_category_id(self, category_name):
@@ -95,7 +114,8 @@ class DatabaseWriter:
     def article_exists(self, article_url):
         """Vérifie si un article existe déjà dans la DB"""
         try:
-            result = self.supabase.table('articles').select('id').eq('url', article_url).execute()
+            with self.metrics.timer('db_query_seconds', query='article_exists'):
+                result = self.supabase.table('articles').select('id').eq('url', article_url).execute()
             return len(result.data) > 0
         except:
             return False
@@ -252,32 +272,34 @@ class DatabaseWriter:
         
         return cleaned
 
-    def insert_article(self, article):
+    def insert_article(self, article, validated=False):
         """
         Insère un article dans la base de données
         
         Args:
             article: Dictionnaire avec les données de l'article
+            validated: Article déjà validé (ArticleNormalizer): pas de seconde validation
         
         Returns:
             str: ID de l'article inséré ou None si erreur
         """
         try:
             # Validation stricte avant insertion
-            is_valid, error_msg = self.validate_article_for_db(article)
-            if not is_valid:
-                print(f"⚠️ Article rejeté: {error_msg} - '{article.get('titre', '')[:40]}...'")
-                return None
+            if not validated:
+                is_valid, error_msg = self.validate_article_for_db(article)
+                if not is_valid:
+                    logger.debug("⚠️ Article rejeté: %s - '%s...'", error_msg, article.get('titre', '')[:40],
+                                 extra={'sample': 50})
+                    return None
             
             # Vérifier si l'article existe déjà
             if self.article_exists(article['url']):
-                # print(f"⏭️  Article déjà existant: {article['titre'][:50]}...")
                 return None
             
             # Récupérer les IDs
             media_id = self.get_media_id(article['media'])
             if not media_id:
-                print(f"❌ Média invalide pour: {article['titre'][:50]}...")
+                logger.warning("❌ Média invalide pour: %s...", article['titre'][:50], extra={'sample': 20})
                 return None
             
             category_id = self.get_category_id(article.get('categorie'))
@@ -299,6 +321,9 @@ class DatabaseWriter:
             if result.data:
                 article_id = result.data[0]['id']
                 
+                # Mettre à jour les jours de publication (régularité incrémentale)
+                self.publication_days.record(media_id, article.get('date'))
+                
                 # Insérer les engagements si présents
                 if article.get('likes', 0) > 0 or article.get('commentaires', 0) > 0 or article.get('partages', 0) > 0:
                     self.insert_engagement(
@@ -315,7 +340,8 @@ class DatabaseWriter:
             return None
         
         except Exception as e:
-            print(f"❌ Erreur insertion article '{article.get('titre', '')[:50]}...': {e}")
+            logger.warning("❌ Erreur insertion article '%s...': %s", article.get('titre', '')[:50], e,
+                           extra={'sample': 10})
             return None
     
     def insert_engagement(self, article_id, likes, commentaires, partages, type_source=None, plateforme=None):
@@ -342,21 +368,20 @@ class DatabaseWriter:
             
             return True
         except Exception as e:
-            print(f"❌ Erreur insertion engagement: {e}")
+            logger.warning("❌ Erreur insertion engagement: %s", e, extra={'sample': 10})
             return False
     
-    def insert_batch(self, articles):
+    def insert_batch(self, articles, validated=False):
         """
         Insère une liste d'articles dans la base
         
         Args:
             articles: Liste de dictionnaires
+            validated: Articles déjà validés (ArticleNormalizer)
         
         Returns:
             dict: Statistiques d'insertion avec détails par média
         """
-        print(f"\n💾 Insertion de {len(articles)} articles dans Supabase...")
-        
         inserted = 0
         skipped = 0
         errors = 0
@@ -375,7 +400,8 @@ class DatabaseWriter:
                     'errors': 0
                 }
             
-            result = self.insert_article(article)
+            with self.metrics.timer('db_insert_seconds', table='articles'):
+                result = self.insert_article(article, validated)
             if result:
                 inserted += 1
                 media_stats[media_name]['inserted'] += 1
@@ -386,6 +412,10 @@ class DatabaseWriter:
                 errors += 1
                 media_stats[media_name]['errors'] += 1
         
+        for result, count in (('inserted', inserted), ('skipped', skipped), ('error', errors)):
+            if count:
+                self.metrics.inc('db_rows_total', count, table='articles', result=result)
+        
         stats = {
             'inserted': inserted,
             'skipped': skipped,
@@ -394,11 +424,9 @@ class DatabaseWriter:
             'by_media': media_stats
         }
         
-        print(f"✅ Insertion terminée:")
-        print(f"   - Insérés: {inserted}")
-        print(f"   - Ignorés (doublons): {skipped}")
-        if errors > 0:
-            print(f"   - Erreurs: {errors}")
+        logger.info("💾 Insertion de %d articles: %d insérés, %d doublons, %d erreurs",
+                    len(articles), inserted, skipped, errors,
+                    extra={'inserted': inserted, 'skipped': skipped, 'errors': errors})
         
         return stats
 
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Table de jobs du pipeline (SQLite), remplace pipeline_state.json
+- Un job par exécution: statut, progression, résultat
+- Single-flight garanti par un index unique partiel (un seul job 'running' par nom)
+- File de jobs 'queued': l'API (mode API seule) demande, le worker exécute
+- Notifications de la cloche
+- Journal d'événements (progression, stats par média, notifications) lu par le flux SSE
+Le scheduler, les threads lancés par /run et les routes partagent la même base:
+chaque mise à jour est une transaction atomique, le statut une lecture indexée.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / 'pipeline_jobs.sqlite3'
+
+# Nombre de notifications conservées
+MAX_NOTIFICATIONS = 20
+
+# Nombre d'événements conservés pour le flux SSE (reprise via Last-Event-ID)
+MAX_EVENTS = 500
+
+logger = logging.getLogger(__name__)
+
+# Nom du job du pipeline de scraping (WEB + Facebook)
+PIPELINE_JOB = 'pipeline'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    host TEXT,
+    pid INTEGER,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_single_flight ON jobs(name) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_jobs_name_id ON jobs(name, id DESC);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT,
+    data TEXT NOT NULL,
+    read INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+def _loads(value):
+    return json.loads(value) if value else None
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+class JobStore:
+    """Jobs et notifications du pipeline"""
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or os.getenv('PIPELINE_DB_PATH', DEFAULT_DB_PATH))
+        # Une connexion par thread (sqlite3 interdit le partage par défaut)
+        self._local = threading.local()
+        # Réveille immédiatement les flux SSE du même processus à chaque événement
+        self._new_event = threading.Condition()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Bases créées avant la file de jobs
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'params' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN params TEXT")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL: les lectures (routes) ne bloquent pas les écritures (pipeline)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    # ========== JOBS ==========
+
+    def start_job(self, name=PIPELINE_JOB, progress=None):
+        """
+        Démarre un job si aucun job du même nom ne tourne (atomique)
+
+        Returns:
+            int: ID du job, ou None si un job est déjà en cours
+        """
+        now = _now()
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO jobs (name, status, progress, host, pid, started_at, updated_at) "
+                    "VALUES (?, 'running', ?, ?, ?, ?, ?)",
+                    (name, json.dumps(progress, ensure_ascii=False) if progress else None,
+                     socket.gethostname(), os.getpid(), now, now)
+                )
+                job_id = cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return None
+        self.publish('status', {'name': name, **self.get_status(name)})
+        return job_id
+
+    def enqueue_job(self, name=PIPELINE_JOB, params=None, progress=None):
+        """
+        Met un job en file pour le worker, sauf si un job du même nom est déjà
+        en file ou en cours (atomique)
+
+        Returns:
+            int: ID du job, ou None si un job est déjà en file ou en cours
+        """
+        now = _now()
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            pending = conn.execute(
+                "SELECT 1 FROM jobs WHERE name = ? AND status IN ('queued', 'running')", (name,)
+            ).fetchone()
+            if pending:
+                return None
+            cursor = conn.execute(
+                "INSERT INTO jobs (name, status, params, progress, started_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (name, json.dumps(params or {}), json.dumps(progress, ensure_ascii=False) if progress else None,
+                 now, now)
+            )
+            job_id = cursor.lastrowid
+        self.publish('status', {'name': name, **self.get_status(name)})
+        return job_id
+
+    def claim_job(self, name=PIPELINE_JOB):
+        """
+        Prend le plus ancien job en file (passage à 'running' pour ce processus)
+
+        Returns:
+            tuple: (job_id, params) ou None si rien à faire ou un job du même nom tourne déjà
+        """
+        now = _now()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                row = conn.execute(
+                    "SELECT id, params FROM jobs WHERE name = ? AND status = 'queued' ORDER BY id LIMIT 1", (name,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', host = ?, pid = ?, started_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (socket.gethostname(), os.getpid(), now, now, row['id'])
+                )
+        except sqlite3.IntegrityError:
+            return None
+        self.publish('status', {'name': name, **self.get_status(name)})
+        return row['id'], _loads(row['params']) or {}
+
+    def update_progress(self, job_id, status, message, **extra):
+        """Met à jour la progression d'un job en cours"""
+        progress = {'status': status, 'message': message, 'timestamp': _now(), **extra}
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                (json.dumps(progress, ensure_ascii=False), progress['timestamp'], job_id)
+            )
+        self.publish('progress', {'job_id': job_id, **progress})
+
+    def finish_job(self, job_id, result=None, error=None):
+        """Termine un job (succès si error est None)"""
+        now = _now()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = NULL, result = ?, error = ?, "
+                "updated_at = ?, finished_at = ? WHERE id = ?",
+                ('failed' if error else 'success',
+                 json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                 error, now, now, job_id)
+            )
+            name = conn.execute("SELECT name FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if name:
+            self.publish('status', {'name': name['name'], **self.get_status(name['name'])})
+
+    def recover_interrupted_jobs(self):
+        """
+        Marque en échec les jobs 'running' dont le processus n'existe plus
+        (redémarrage, crash) pour libérer le single-flight
+
+        Returns:
+            int: Nombre de jobs récupérés
+        """
+        host = socket.gethostname()
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, host, pid FROM jobs WHERE status = 'running'").fetchall()
+            dead = [row['id'] for row in rows if row['host'] == host and not _process_alive(row['pid'])]
+            now = _now()
+            for job_id in dead:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', progress = NULL, error = ?, updated_at = ?, finished_at = ? "
+                    "WHERE id = ?",
+                    ('Interrompu (processus arrêté)', now, now, job_id)
+                )
+        return len(dead)
+
+    def get_status(self, name=PIPELINE_JOB):
+        """
+        État du pipeline au format de l'ancien pipeline_state.json
+
+        Un job en file pour le worker compte comme en cours (is_queued en plus).
+
+        Returns:
+            dict: is_running, is_queued, last_run, last_result, current_progress
+        """
+        conn = self._connect()
+        running = conn.execute(
+            "SELECT * FROM jobs WHERE name = ? AND status IN ('running', 'queued') "
+            "ORDER BY status = 'running' DESC, id LIMIT 1", (name,)
+        ).fetchone()
+        last = conn.execute(
+            "SELECT * FROM jobs WHERE name = ? AND status NOT IN ('running', 'queued') ORDER BY id DESC LIMIT 1",
+            (name,)
+        ).fetchone()
+
+        last_result = None
+        if last:
+            last_result = _loads(last['result']) or {}
+            last_result.setdefault('success', last['status'] == 'success')
+            last_result.setdefault('timestamp', last['finished_at'])
+            if last['error']:
+                last_result.setdefault('error', last['error'])
+
+        return {
+            'is_running': running is not None,
+            'is_queued': running is not None and running['status'] == 'queued',
+            'job_id': running['id'] if running else None,
+            'last_run': (running or last)['started_at'] if (running or last) else None,
+            'last_result': last_result,
+            'current_progress': _loads(running['progress']) if running else None
+        }
+
+    # ========== NOTIFICATIONS ==========
+
+    def add_notification(self, notification):
+        """Ajoute une notification (seules les MAX_NOTIFICATIONS dernières sont conservées)"""
+        notification.setdefault('timestamp', _now())
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO notifications (type, data, created_at) VALUES (?, ?, ?)",
+                (notification.get('type'), json.dumps(notification, ensure_ascii=False, default=str), _now())
+            )
+            conn.execute(
+                "DELETE FROM notifications WHERE id <= ?",
+                (cursor.lastrowid - MAX_NOTIFICATIONS,)
+            )
+        notification['id'] = cursor.lastrowid
+        notification['read'] = False
+        self.publish('notification', notification)
+        return notification
+
+    def get_notifications(self, notification_type=None, after_id=None) -> List[Dict]:
+        """Notifications de la plus récente à la plus ancienne"""
+        query = "SELECT id, data, read FROM notifications"
+        conditions, params = [], []
+        if notification_type:
+            conditions.append("type = ?")
+            params.append(notification_type)
+        if after_id is not None:
+            conditions.append("id > ?")
+            params.append(after_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+
+        notifications = []
+        for row in self._connect().execute(query, params):
+            notification = json.loads(row['data'])
+            notification['id'] = row['id']
+            notification['read'] = bool(row['read'])
+            notifications.append(notification)
+        return notifications
+
+    def unread_count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM notifications WHERE read = 0").fetchone()[0]
+
+    def mark_all_read(self):
+        with self._connect() as conn:
+            conn.execute("UPDATE notifications SET read = 1 WHERE read = 0")
+        self.publish('notifications_read', {})
+
+    def clear_notifications(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM notifications")
+        self.publish('notifications_cleared', {})
+
+    # ========== ÉVÉNEMENTS (flux SSE) ==========
+
+    def publish(self, event_type, data):
+        """
+        Ajoute un événement au journal et réveille les flux en attente
+
+        Le journal est en base: un flux SSE servi par un autre processus (API seule,
+        worker séparé) voit aussi les événements, avec au plus un intervalle de latence.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO events (type, data, created_at) VALUES (?, ?, ?)",
+                (event_type, json.dumps(data, ensure_ascii=False, default=str), _now())
+            )
+            conn.execute("DELETE FROM events WHERE id <= ?", (cursor.lastrowid - MAX_EVENTS,))
+        with self._new_event:
+            self._new_event.notify_all()
+        return cursor.lastrowid
+
+    def event_callback(self, job_id, **tags):
+        """
+        Callback `on_event(event_type, data)` à passer aux orchestrateurs
+
+        Les événements 'progress' mettent à jour la progression du job, les autres
+        (stats par média...) sont publiés tels quels, enrichis de job_id et des tags.
+        """
+        def on_event(event_type, data):
+            try:
+                if event_type == 'progress':
+                    data = dict(data)
+                    self.update_progress(job_id, data.pop('status'), data.pop('message'), **tags, **data)
+                else:
+                    self.publish(event_type, {'job_id': job_id, **tags, **data})
+            except sqlite3.Error as e:
+                # Le suivi ne doit jamais interrompre le pipeline
+                logger.warning("⚠️ Erreur publication événement %s: %s", event_type, e, extra={'sample': 10})
+        return on_event
+
+    def last_event_id(self):
+        return self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def events_lost(self, after_id):
+        """
+        True si des événements postérieurs à after_id ne sont plus au journal (purgés
+        par publish, ou base réinitialisée): le client doit repartir d'un état complet
+        """
+        oldest, newest = self._connect().execute("SELECT MIN(id), MAX(id) FROM events").fetchone()
+        if newest is None:
+            return after_id > 0
+        return after_id < oldest - 1 or after_id > newest
+
+    def get_events(self, after_id=0, limit=100) -> List[Dict]:
+        """Événements postérieurs à after_id, du plus ancien au plus récent"""
+        rows = self._connect().execute(
+            "SELECT id, type, data FROM events WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        )
+        return [{'id': row['id'], 'type': row['type'], 'data': json.loads(row['data'])} for row in rows]
+
+    def wait_for_events(self, after_id, timeout):
+        """
+        Attend un événement postérieur à after_id (réveil immédiat dans le processus,
+        sinon relecture de la base au bout de `timeout` secondes)
+        """
+        # Vérification et attente sous la condition: une publication entre les deux
+        # ne peut pas notifier avant que l'attente ait commencé
+        with self._new_event:
+            events = self.get_events(after_id)
+            if events:
+                return events
+            self._new_event.wait(timeout)
+        return self.get_events(after_id)
+
+
+_store: Optional[JobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Instance partagée du processus"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journalisation structurée du backend
+- Un logger par module (logging.getLogger(__name__)), niveaux standard
+- Sortie en lignes JSON (LOG_FORMAT=json, défaut) ou texte lisible (LOG_FORMAT=text)
+- Écriture asynchrone: les threads du pipeline et de l'API déposent les messages dans
+  une file, un thread dédié les écrit sur stdout
+- Échantillonnage des boucles chaudes: extra={'sample': N} garde un message sur N
+  (par logger et par modèle de message), le message gardé porte le nombre d'omis
+
+Configuration (variables d'environnement):
+    LOG_LEVEL=INFO       niveau global (DEBUG, INFO, WARNING, ERROR)
+    LOG_FORMAT=json      json ou text
+    LOG_SAMPLING=1       0: aucun échantillonnage (tous les messages gardés)
+
+Exemple:
+    logger = logging.getLogger(__name__)
+    logger.info("Insertion terminée", extra={'inserted': 12, 'skipped': 3})
+    logger.debug("Article rejeté: %s", reason, extra={'sample': 50})
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Attributs standard d'un LogRecord: tout autre attribut vient de extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par message: ts, level, logger, msg, champs extra, exc"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != 'sample':
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Garde un message sur N pour les messages marqués extra={'sample': N}"""
+
+    def __init__(self):
+        super().__init__()
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, 'sample', None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            seen = self._seen.get(key, 0)
+            self._seen[key] = seen + 1
+        if seen % every:
+            return False
+        if seen:
+            # Messages omis depuis le dernier gardé
+            record.sampled_out = every - 1
+        return True
+
+
+class _AsyncHandler(QueueHandler):
+    """Dépôt dans la file: message déjà interpolé, traceback en texte (objets non partagés entre threads)"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level=None, log_format=None, stream=None):
+    """
+    Configure la journalisation du processus (une seule fois, appels suivants ignorés)
+
+    Args:
+        level: Niveau (défaut: LOG_LEVEL ou INFO)
+        log_format: 'json' ou 'text' (défaut: LOG_FORMAT ou json)
+        stream: Flux de sortie (défaut: stdout)
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+
+        level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+        log_format = log_format or os.getenv('LOG_FORMAT', 'json')
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+
+        handler = _AsyncHandler(queue.SimpleQueue())
+        if os.getenv('LOG_SAMPLING', '1') != '0':
+            handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(handler.queue, output, respect_handler_level=False)
+        _listener.start()
+        # Vider la file à l'arrêt du processus
+        atexit.register(_listener.stop)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mesures du pipeline: compteurs, histogrammes et chronomètres
+- METRICS: registre du processus (cumul de tous les passages), exporté au format
+  Prometheus par /metrics (API Flask, ou worker avec METRICS_PORT)
+- METRICS.child(): registre d'un passage, qui reporte chaque mesure dans le registre
+  du processus; son résumé (snapshot) est enregistré dans scraping_logs.details
+
+Importer ce module sous le nom utils.metrics (comme les orchestrateurs), sinon le
+registre du processus serait dupliqué.
+
+Exemple:
+    with metrics.timer('pipeline_stage_seconds', pipeline='web', stage='insertion'):
+        ...
+    metrics.inc('scraper_requests_total', media='LeFaso', outcome='ok')
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+# Limites des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+logger = logging.getLogger(__name__)
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _series(name, labels, extra=()):
+    """name{a="1",b="2"} au format d'exposition Prometheus"""
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return name
+    return name + '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+
+class Metrics:
+    """Registre de mesures (thread-safe)"""
+
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent: Registre qui reçoit aussi chaque mesure (registre du processus)
+        """
+        self.parent = parent
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def child(self):
+        """Registre d'un passage, reporté dans celui-ci"""
+        return Metrics(parent=self)
+
+    def inc(self, name, value=1, **labels):
+        """Incrémente un compteur (nom en *_total)"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        if self.parent is not None:
+            self.parent.inc(name, value, **labels)
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        """Ajoute une observation à un histogramme (durée en secondes par défaut)"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+        if self.parent is not None:
+            self.parent.observe(name, value, buckets, **labels)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Chronomètre un bloc (histogramme en secondes), même s'il lève une exception"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, **labels)
+
+    def timed(self, name, function, **labels):
+        """Fonction chronométrée à chaque appel (étapes du flux)"""
+        def wrapper(*args, **kwargs):
+            with self.timer(name, **labels):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def total(self, name, **labels):
+        """Somme d'un compteur sur les séries qui ont au moins ces labels"""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(value for (series, key), value in self._counters.items()
+                       if series == name and wanted <= set(key))
+
+    def seconds(self, name, **labels):
+        """Durée cumulée d'un histogramme sur les séries qui ont au moins ces labels"""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(histogram.sum for (series, key), histogram in self._histograms.items()
+                       if series == name and wanted <= set(key))
+
+    def snapshot(self):
+        """
+        Résumé JSON (scraping_logs.details)
+
+        Returns:
+            dict: {'counters': {série: valeur}, 'timings': {série: {count, sum, avg, max}}}
+        """
+        with self._lock:
+            counters = {_series(name, key): value for (name, key), value in sorted(self._counters.items())}
+            timings = {
+                _series(name, key): {
+                    'count': histogram.count,
+                    'sum': round(histogram.sum, 4),
+                    'avg': round(histogram.sum / histogram.count, 4) if histogram.count else 0,
+                    'max': round(histogram.max, 4)
+                }
+                for (name, key), histogram in sorted(self._histograms.items())
+            }
+        return {'counters': counters, 'timings': timings}
+
+    def render_prometheus(self):
+        """Texte au format d'exposition Prometheus (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, key), value in sorted(self._counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{_series(name, key)} {value}")
+
+            for (name, key), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{_series(name + '_bucket', key, [('le', repr(float(bound)))])} {cumulative}")
+                lines.append(f"{_series(name + '_bucket', key, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{_series(name + '_sum', key)} {histogram.sum}")
+                lines.append(f"{_series(name + '_count', key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+# Registre du processus
+METRICS = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = METRICS.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Pas de ligne de log par collecte
+        pass
+
+
+def start_metrics_server(port=None):
+    """
+    Sert /metrics dans un thread (processus sans Flask: worker)
+
+    Args:
+        port: Port d'écoute (défaut: METRICS_PORT, serveur non démarré si absent)
+
+    Returns:
+        ThreadingHTTPServer ou None
+    """
+    port = port or os.getenv('METRICS_PORT')
+    if not port:
+        return None
+    server = ThreadingHTTPServer(('0.0.0.0', int(port)), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    logger.info("📈 Mesures Prometheus: http://0.0.0.0:%s/metrics", port)
+    return server
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Nettoyage et validation en une seule passe
+Fusionne DataCleaner.clean_article, DatabaseWriter.clean_article_for_db et
+DatabaseWriter.validate_article_for_db: un seul parcours des champs, un enregistrement
+typé compact ou un motif de rejet. Les espaces sont normalisés par str.split.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+MIN_TITLE_LENGTH = 10
+MAX_TITLE_LENGTH = 500
+# En dessous, le contenu est remplacé par le titre
+MIN_CONTENT_LENGTH = 50
+MIN_URL_LENGTH = 10
+MAX_URL_LENGTH = 1000
+MIN_ID_LENGTH = 10
+
+VALID_TYPE_SOURCES = frozenset(['article', 'post', 'video', 'image'])
+VALID_PLATFORMS = frozenset(['web', 'facebook', 'twitter', 'instagram'])
+METRICS = ('likes', 'commentaires', 'partages')
+
+
+class CleanArticle(NamedTuple):
+    """Article nettoyé et conforme au schéma BD"""
+    id: str
+    media: str
+    titre: str
+    contenu: str
+    url: str
+    date: Optional[datetime]
+    categorie: Optional[str]
+    likes: int
+    commentaires: int
+    partages: int
+    type_source: Optional[str]
+    plateforme: Optional[str]
+
+    def to_dict(self) -> Dict:
+        """Format attendu par DatabaseWriter et le journal d'audit"""
+        return self._asdict()
+
+
+def normalize_text(value) -> str:
+    """Espaces (y compris sauts de ligne et tabulations) réduits à un seul, bords supprimés"""
+    if not value or not isinstance(value, str):
+        return ''
+    # str.split() sépare sur les mêmes espaces Unicode que \s, en C et sans regex
+    return ' '.join(value.split())
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    # Date inconnue: article inséré sans date (articles.date accepte NULL), pas une date
+    # inventée qui deviendrait la dernière publication du média (DateManager)
+    return None
+
+
+class ArticleNormalizer:
+    """Étape unique nettoyage + validation"""
+
+    def __init__(self, get_media_id: Callable[[str], Optional[int]]):
+        """
+        Args:
+            get_media_id: Résolution nom de média → ID (DatabaseWriter.get_media_id)
+        """
+        self._get_media_id = get_media_id
+        # Résultat mémorisé par nom: une recherche (et un avertissement) par média inconnu
+        self._known_media = {}
+
+    def _media_exists(self, media):
+        known = self._known_media.get(media)
+        if known is None:
+            known = self._known_media[media] = bool(self._get_media_id(media))
+        return known
+
+    def normalize(self, article) -> Tuple[Optional[CleanArticle], Optional[str]]:
+        """
+        Nettoie et valide un article
+
+        Args:
+            article: Dictionnaire brut (scraper, post Facebook)
+
+        Returns:
+            tuple: (CleanArticle, None) si valide, sinon (None, motif du rejet)
+        """
+        if not isinstance(article, dict):
+            return None, "Article invalide"
+
+        titre = normalize_text(article.get('titre'))
+        if len(titre) < MIN_TITLE_LENGTH:
+            return None, f"Titre manquant ou trop court (<{MIN_TITLE_LENGTH} caractères)"
+
+        url = article.get('url')
+        if not isinstance(url, str) or not url.startswith(('http://', 'https://')) or len(url) < MIN_URL_LENGTH:
+            return None, "URL invalide (doit commencer par http:// ou https://)"
+
+        article_id = str(article.get('id', '')).strip()
+        if not article_id:
+            return None, "Champ obligatoire manquant: id"
+        if len(article_id) < MIN_ID_LENGTH:
+            return None, "ID invalide (doit être une chaîne de >10 caractères)"
+
+        media = str(article.get('media', '')).strip()
+        if not media:
+            return None, "Champ obligatoire manquant: media"
+        if not self._media_exists(media):
+            return None, f"Média non trouvé: {media}"
+
+        metrics = []
+        for metric in METRICS:
+            try:
+                value = int(article.get(metric, 0) or 0)
+            except (TypeError, ValueError):
+                return None, f"{metric} doit être un nombre entier (reçu: {type(article.get(metric)).__name__})"
+            if value < 0:
+                return None, f"{metric} ne peut pas être négatif"
+            metrics.append(value)
+
+        type_source = article.get('type_source', 'article')
+        if type_source and type_source not in VALID_TYPE_SOURCES:
+            return None, f"type_source invalide: {type_source} (doit être: article, post, video, ou image)"
+
+        plateforme = article.get('plateforme', 'web')
+        if plateforme and plateforme not in VALID_PLATFORMS:
+            return None, f"plateforme invalide: {plateforme} (doit être: web, facebook, twitter, ou instagram)"
+
+        contenu = normalize_text(article.get('contenu'))
+        if len(contenu) < MIN_CONTENT_LENGTH:
+            # Si pas de contenu, utiliser le titre
+            contenu = titre
+
+        categorie = article.get('categorie')
+        categorie = str(categorie).strip().capitalize() if categorie else None
+
+        return CleanArticle(
+            article_id,
+            media,
+            titre[:MAX_TITLE_LENGTH],
+            contenu,
+            url.strip().replace(' ', '')[:MAX_URL_LENGTH],
+            _parse_date(article.get('date')),
+            categorie,
+            *metrics,
+            type_source,
+            plateforme
+        ), None
+
+    def normalize_batch(self, articles, seen_urls=None):
+        """
+        Nettoie, valide et dédoublonne (par URL) un lot d'articles
+
+        Args:
+            articles: Liste de dictionnaires bruts
+            seen_urls: Ensemble d'URLs déjà vues, complété sur place (flux traité par lots)
+
+        Returns:
+            tuple: (articles valides, [(article brut, motif)], nombre de doublons)
+        """
+        if seen_urls is None:
+            seen_urls = set()
+
+        valid: List[CleanArticle] = []
+        rejected = []
+        duplicates = 0
+        for article in articles:
+            record, reason = self.normalize(article)
+            if record is None:
+                rejected.append((article, reason))
+            elif record.url in seen_urls:
+                duplicates += 1
+            else:
+                seen_urls.add(record.url)
+                valid.append(record)
+
+        return valid, rejected, duplicates
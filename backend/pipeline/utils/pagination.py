@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lecture complète d'une requête Supabase, page par page
+PostgREST plafonne chaque réponse (1000 lignes par défaut sur Supabase): une requête
+sans pagination est tronquée sans erreur dès que la table grossit.
+"""
+
+# Lignes par page (plafond par défaut de PostgREST sur Supabase)
+PAGE_SIZE = 1000
+
+
+def fetch_all_rows(build_query, page_size=PAGE_SIZE):
+    """
+    Toutes les lignes d'une requête, lues par pages successives (.range)
+
+    Args:
+        build_query: Fonction sans argument qui construit la requête (nouvel objet à chaque
+                     page: les filtres PostgREST s'accumulent sur l'objet), triée sur une
+                     colonne unique pour des pages stables
+        page_size: Lignes par page (ne pas dépasser le plafond du serveur)
+
+    Returns:
+        list: Lignes de toutes les pages
+    """
+    rows = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jours de publication par média (table media_publication_days)
+Mis à jour à chaque insertion d'article, la régularité devient une simple lecture
+au lieu de recharger 90 jours de dates d'articles à chaque calcul
+"""
+
+import logging
+from datetime import datetime, timedelta, date as date_type
+
+from .pagination import fetch_all_rows
+
+# Fenêtre de calcul de la régularité
+REGULARITY_WINDOW_DAYS = 90
+
+logger = logging.getLogger(__name__)
+
+
+def to_day(value):
+    """Convertit une date (datetime, date ou chaîne ISO) en jour calendaire"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_type):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).date()
+    except ValueError:
+        return None
+
+
+def regularity_rate(days_with_publication, window=REGULARITY_WINDOW_DAYS):
+    """Taux de régularité (%) = jours avec au moins une publication / fenêtre"""
+    return round(min(days_with_publication, window) / window * 100, 1)
+
+
+class PublicationDays:
+    """Enregistre et lit les jours de publication de chaque média"""
+
+    TABLE = 'media_publication_days'
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+        # (media_id, jour) déjà enregistrés par cette instance: évite les upserts redondants
+        self._recorded = set()
+
+    def record(self, media_id, article_date):
+        """
+        Marque le jour de publication d'un article (idempotent)
+
+        Args:
+            media_id: ID du média
+            article_date: Date de l'article
+
+        Returns:
+            bool: True si une écriture a été envoyée
+        """
+        day = to_day(article_date)
+        if media_id is None or day is None or (media_id, day) in self._recorded:
+            return False
+
+        try:
+            self.supabase.table(self.TABLE).upsert(
+                {'media_id': media_id, 'day': day.isoformat()},
+                on_conflict='media_id,day',
+                ignore_duplicates=True
+            ).execute()
+            self._recorded.add((media_id, day))
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Erreur enregistrement jour de publication: %s", e, extra={'sample': 10})
+            return False
+
+    def get_regularity(self, media_ids=None, window=REGULARITY_WINDOW_DAYS):
+        """
+        Régularité de publication sur la fenêtre, pour un ou plusieurs médias
+
+        Au plus `window` lignes par média, lues par pages (une seule requête jusqu'à une
+        dizaine de médias). Un média demandé sans aucune ligne dans la fenêtre est relu
+        depuis la table articles (table pas encore initialisée, import en masse) et ses
+        jours sont enregistrés au passage.
+
+        Args:
+            media_ids: Liste d'IDs (None = tous les médias de la table, sans relecture)
+            window: Nombre de jours de la fenêtre
+
+        Returns:
+            dict: media_id -> taux de régularité (%) ; absent = 0 jour publié
+        """
+        start_day = (datetime.utcnow() - timedelta(days=window)).date()
+
+        def build_query():
+            query = self.supabase.table(self.TABLE)\
+                .select('media_id, day')\
+                .gt('day', start_day.isoformat())\
+                .order('media_id')\
+                .order('day')
+            if media_ids is not None:
+                query = query.in_('media_id', list(media_ids))
+            return query
+
+        days_by_media = {}
+        for row in fetch_all_rows(build_query):
+            days_by_media[row['media_id']] = days_by_media.get(row['media_id'], 0) + 1
+
+        missing = [media_id for media_id in (media_ids or []) if media_id not in days_by_media]
+        if missing:
+            rows = {(media_id, day) for media_id, day in self._days_from_articles(missing, window)
+                    if day > start_day}
+            self._upsert(rows)
+            for media_id, _ in rows:
+                days_by_media[media_id] = days_by_media.get(media_id, 0) + 1
+
+        return {media_id: regularity_rate(days, window) for media_id, days in days_by_media.items()}
+
+    def _days_from_articles(self, media_ids=None, window=REGULARITY_WINDOW_DAYS):
+        """Jours (media_id, jour) avec au moins un article dans la fenêtre, lus dans la table articles"""
+        start_date = datetime.utcnow() - timedelta(days=window)
+
+        # Tous les articles de la fenêtre: bien plus que le plafond d'une réponse PostgREST
+        def build_query():
+            query = self.supabase.table('articles')\
+                .select('media_id, date')\
+                .gte('date', start_date.isoformat())\
+                .order('id')
+            if media_ids is not None:
+                query = query.in_('media_id', list(media_ids))
+            return query
+
+        rows = set()
+        for article in fetch_all_rows(build_query):
+            day = to_day(article.get('date'))
+            if day is not None:
+                rows.add((article['media_id'], day))
+        return rows
+
+    def _upsert(self, rows):
+        """Enregistre des jours (media_id, jour) par lots"""
+        payload = [{'media_id': media_id, 'day': day.isoformat()} for media_id, day in rows]
+        batch_size = 500
+        for i in range(0, len(payload), batch_size):
+            self.supabase.table(self.TABLE).upsert(
+                payload[i:i + batch_size],
+                on_conflict='media_id,day',
+                ignore_duplicates=True
+            ).execute()
+        self._recorded.update(rows)
+
+    def backfill(self, media_ids=None, window=REGULARITY_WINDOW_DAYS):
+        """
+        Reconstruit les jours de publication depuis la table articles
+        (initialisation de la table ou après un import en masse)
+
+        Returns:
+            int: Nombre de jours (média, jour) enregistrés
+        """
+        rows = self._days_from_articles(media_ids, window)
+        self._upsert(rows)
+        logger.info("✅ %d jours de publication enregistrés", len(rows))
+        return len(rows)
+
+    def ensure_backfilled(self, window=REGULARITY_WINDOW_DAYS):
+        """
+        Initialise la table depuis les articles si elle est vide (premier démarrage
+        après sa création). Une erreur est journalisée sans bloquer le démarrage.
+
+        Returns:
+            int: Nombre de jours enregistrés (0 si la table était déjà remplie)
+        """
+        try:
+            if self.supabase.table(self.TABLE).select('media_id').limit(1).execute().data:
+                return 0
+            logger.info("📅 Table %s vide: initialisation depuis les articles...", self.TABLE)
+            return self.backfill(window=window)
+        except Exception as e:
+            logger.warning("⚠️ Initialisation des jours de publication impossible: %s", e)
+            return 0
+
+
+if __name__ == "__main__":
+    # Initialisation de la table à partir des articles existants
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from supabase_client import get_supabase_client
+
+    publication_days = PublicationDays(get_supabase_client())
+    publication_days.backfill()
+    print(f"Régularité: {publication_days.get_regularity()}")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Étapes concurrentes reliées par des files bornées
+Chaque étape tourne dans son thread, lit des lots dans sa file d'entrée et pousse le
+résultat dans la suivante. Une file pleine bloque l'étape amont (contre-pression):
+la mémoire est bornée par la taille des files, pas par le volume scrapé.
+"""
+
+import logging
+import queue
+import threading
+
+# Marqueur de fin de flux, propagé d'étape en étape
+END = object()
+
+logger = logging.getLogger(__name__)
+
+
+def bounded_queue(max_batches):
+    """File de lots bornée"""
+    return queue.Queue(maxsize=max_batches)
+
+
+def chunked(items, size):
+    """Découpe une liste en lots de `size` éléments"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Stage(threading.Thread):
+    """
+    Étape du pipeline: process(lot) -> lot suivant (ou None pour ne rien transmettre)
+
+    Si process lève une exception, l'erreur est conservée, les lots suivants sont
+    consommés sans traitement (l'amont ne reste pas bloqué) et END est tout de même
+    transmis à l'aval.
+    """
+
+    def __init__(self, name, process, inbox, outbox=None):
+        super().__init__(name=name, daemon=True)
+        self.process = process
+        self.inbox = inbox
+        self.outbox = outbox
+        self.error = None
+
+    def run(self):
+        while True:
+            batch = self.inbox.get()
+            if batch is END:
+                break
+            if self.error is not None:
+                continue
+            try:
+                result = self.process(batch)
+            except Exception as e:
+                logger.exception("❌ Erreur étape %s: %s", self.name, e)
+                self.error = e
+                continue
+            if self.outbox is not None and result:
+                self.outbox.put(result)
+
+        if self.outbox is not None:
+            self.outbox.put(END)
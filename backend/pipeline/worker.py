@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker du pipeline: scheduler et exécution des scrapings hors du processus de l'API
+Le scraping (CPU, mémoire, modèle ML) ne dégrade plus la latence de l'API, et chaque
+processus se dimensionne séparément.
+
+L'API en mode API seule (PIPELINE_MODE=api) et le worker communiquent par la table de
+jobs SQLite (PIPELINE_DB_PATH, partagée sur la même machine): /api/pipeline/run met un
+job en file, le worker le prend et publie progression et notifications, que le flux
+SSE de l'API relaie.
+
+Usage (depuis backend/):
+    python -m pipeline.worker
+    python -m pipeline.worker --no-scheduler   # seulement les demandes de l'API
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter les paths nécessaires
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+from pipeline.utils.job_store import PIPELINE_JOB, get_job_store
+
+# Fréquence de consultation de la file de jobs (secondes)
+WORKER_POLL_SECONDS = 2
+
+logger = logging.getLogger(__name__)
+
+
+def run_pipeline_job(job_id, max_articles=20):
+    """
+    Exécute le pipeline WEB complet pour un job déjà créé (en cours)
+    Utilisé par le worker et, en mode intégré, par le thread lancé par /run
+    """
+    from pipeline.orchestrator import PipelineOrchestrator
+
+    job_store = get_job_store()
+    try:
+        # Ajouter notification de démarrage
+        add_notification({
+            'type': 'info',
+            'title': 'Scraping démarré',
+            'message': 'Le scraping automatique a commencé',
+            'timestamp': datetime.now().isoformat()
+        })
+
+        # Créer et exécuter l'orchestrateur
+        orchestrator = PipelineOrchestrator(
+            include_facebook=False,
+            on_event=job_store.event_callback(job_id, pipeline='web')
+        )
+
+        job_store.update_progress(job_id, 'scraping', '📰 Scraping des médias en cours...')
+
+        stats = orchestrator.run_full_pipeline(
+            max_articles_per_section=max_articles,
+            facebook_max_posts=0
+        )
+
+        # Pipeline terminé
+        job_store.finish_job(job_id, result={
+            'success': True,
+            'stats': stats,
+            'timestamp': datetime.now().isoformat(),
+            'duration': stats.get('duration', 0)
+        })
+
+        # Ajouter notification de succès
+        add_notification({
+            'type': 'success',
+            'title': 'Scraping terminé',
+            'message': f"{stats['total_inserted']} nouveaux articles insérés",
+            'stats': stats,
+            'timestamp': datetime.now().isoformat()
+        })
+
+        logger.info("✅ Pipeline terminé: job %s", job_id, extra={'job_id': job_id, 'stats': stats})
+
+    except Exception as e:
+        job_store.finish_job(job_id, error=str(e))
+
+        # Ajouter notification d'erreur
+        add_notification({
+            'type': 'error',
+            'title': 'Erreur de scraping',
+            'message': f'Erreur: {str(e)}',
+            'timestamp': datetime.now().isoformat()
+        })
+
+        logger.exception("❌ Erreur pipeline: %s", e, extra={'job_id': job_id})
+
+
+def add_notification(notification):
+    """Ajoute une notification (les 20 dernières sont conservées)"""
+    get_job_store().add_notification(notification)
+    logger.info("📢 Notification ajoutée: %s", notification['title'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker du pipeline de scraping")
+    parser.add_argument('--no-scheduler', action='store_true',
+                        help="Ne pas planifier les passages automatiques (demandes de l'API seulement)")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    from utils.log import configure_logging
+    configure_logging()
+    logger.info("⚙️  Worker du pipeline démarré")
+
+    # Mesures Prometheus des passages de ce processus (si METRICS_PORT est défini)
+    from utils.metrics import start_metrics_server
+    start_metrics_server()
+    
+    job_store = get_job_store()
+    scheduler = None
+    if args.no_scheduler:
+        recovered = job_store.recover_interrupted_jobs()
+        if recovered:
+            logger.warning("⚠️ %d job(s) interrompu(s) marqué(s) en échec", recovered)
+        from pipeline.utils.publication_days import PublicationDays
+        from supabase_client import get_supabase_client
+        PublicationDays(get_supabase_client()).ensure_backfilled()
+    else:
+        from pipeline.unified_scheduler import start_unified_scheduler
+        scheduler = start_unified_scheduler()
+
+    logger.info("📥 En attente des demandes de l'API (toutes les %ss)...", WORKER_POLL_SECONDS)
+    try:
+        while True:
+            claimed = job_store.claim_job(PIPELINE_JOB)
+            if claimed:
+                job_id, params = claimed
+                logger.info("🚀 Job %s pris en charge", job_id, extra={'job_id': job_id})
+                run_pipeline_job(job_id, params.get('max_articles', 20))
+            else:
+                time.sleep(WORKER_POLL_SECONDS)
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("🛑 Arrêt du worker")
+        if scheduler:
+            scheduler.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from datetime import datetime
+import logging
 import bcrypt
 from supabase_client import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
 
@@ -99,9 +102,7 @@ def login():
         }), 200
         
     except Exception as e:
-        print(f"Erreur de connexion: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Erreur de connexion: %s", e)
         return jsonify({'error': str(e)}), 500
         return jsonify({'error': str(e)}), 500
 
@@ -3,14 +3,18 @@ Routes API pour le Dashboard - Monitoring Médiatique
 Fournit les données pour le frontend (stats, médias, articles, alertes, rankings)
 """
 
+import logging
 from flask import Blueprint, jsonify, request
 from supabase import create_client, Client
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
+from pipeline.utils.publication_days import PublicationDays
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
 # Configuration Supabase
@@ -144,7 +148,7 @@ def get_stats():
         supabase = get_supabase()
         time_range = request.args.get('time_range', '24h')
         
-        print(f"📊 get_stats - time_range: {time_range}")
+        logger.debug("📊 get_stats - time_range: %s", time_range)
         
         # Total médias actifs
         medias_result = supabase.table('medias').select('id', count='exact').eq('is_active', True).execute()
@@ -153,16 +157,16 @@ def get_stats():
         # Total articles dans la période
         if time_range == 'all':
             # TOUS les articles sans filtre de date
-            print("Récupération de TOUS les articles...")
+            logger.debug("Récupération de TOUS les articles...")
             articles_result = supabase.table('articles').select('id', count='exact').execute()
         else:
             # Filtrer par date
             start_date = parse_time_range(time_range)
-            print(f"Récupération des articles depuis {start_date}...")
+            logger.debug("Récupération des articles depuis %s...", start_date)
             articles_result = supabase.table('articles').select('id', count='exact').gte('date', start_date).execute()
         
         total_articles = articles_result.count or 0
-        print(f"✅ Total articles: {total_articles}")
+        logger.debug("✅ Total articles: %s", total_articles)
         
         # Calcul des engagements
         total_likes = 0
@@ -178,7 +182,7 @@ def get_stats():
                 articles_in_period = supabase.table('articles').select('id').gte('date', start_date).execute()
             
             article_ids_set = set(a['id'] for a in articles_in_period.data)
-            print(f"📰 Articles dans la période: {len(article_ids_set)}")
+            logger.debug("📰 Articles dans la période: %s", len(article_ids_set))
             
             # Récupérer TOUS les engagements puis filtrer en Python
             all_engagements = supabase.table('engagements')\
@@ -193,7 +197,7 @@ def get_stats():
                     total_partages += eng.get('partages', 0) or 0
         
         total_engagement = total_likes + total_commentaires + total_partages
-        print(f"💬 Engagement total: {total_engagement}")
+        logger.debug("💬 Engagement total: %s", total_engagement)
         
         # Total alertes actives
         alerts_result = supabase.table('alerts').select('id', count='exact').eq('is_resolved', False).execute()
@@ -212,8 +216,7 @@ def get_stats():
         })
     
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur dans get_stats: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -230,13 +233,13 @@ def get_medias():
         
         # Récupérer tous les articles (avec ou sans filtre de date)
         if time_range == 'all':
-            print(f"Récupération de TOUS les articles...")
+            logger.debug("Récupération de TOUS les articles...")
             articles_result = supabase.table('articles')\
                 .select('id, media_id')\
                 .execute()
         else:
             start_date = parse_time_range(time_range)
-            print(f"Récupération des articles depuis {start_date}...")
+            logger.debug("Récupération des articles depuis %s...", start_date)
             articles_result = supabase.table('articles')\
                 .select('id, media_id')\
                 .gte('date', start_date)\
@@ -253,10 +256,10 @@ def get_medias():
             articles_by_media[media_id].append(article['id'])
             article_ids_set.add(article['id'])
         
-        print(f"Trouvé {len(article_ids_set)} articles dans la période")
+        logger.debug("Trouvé %s articles dans la période", len(article_ids_set))
         
         # Récupérer TOUS les engagements (sans filtre, filtrage en Python)
-        print("Récupération de tous les engagements...")
+        logger.debug("Récupération de tous les engagements...")
         all_engagements = supabase.table('engagements')\
             .select('article_id, likes, commentaires, partages')\
             .execute()
@@ -271,12 +274,14 @@ def get_medias():
                     'partages': eng.get('partages', 0) or 0
                 }
         
-        print(f"Trouvé {len(engagements_by_article)} engagements pour la période")
+        logger.debug("Trouvé %s engagements pour la période", len(engagements_by_article))
         
         # Calculer les stats par média
         medias_with_stats = []
         now = datetime.utcnow()
-        ninety_days_ago = now - timedelta(days=90)
+        
+        # Régularité (90 jours) de tous les médias en une seule lecture
+        regularities = PublicationDays(supabase).get_regularity(list(medias.keys()))
         
         for media_id, media in medias.items():
             article_ids = articles_by_media.get(media_id, [])
@@ -292,27 +297,8 @@ def get_medias():
                     total_commentaires += eng['commentaires']
                     total_partages += eng['partages']
             
-            # Calculer la régularité (90 jours)
-            regularity_rate = 0
-            try:
-                regularity_articles = supabase.table('articles')\
-                    .select('date')\
-                    .eq('media_id', media_id)\
-                    .gte('date', ninety_days_ago.isoformat())\
-                    .execute()
-                
-                unique_days = set()
-                for article in regularity_articles.data:
-                    try:
-                        article_date = datetime.fromisoformat(article['date'].replace('Z', '+00:00'))
-                        unique_days.add(article_date.date())
-                    except:
-                        pass
-                
-                days_with_publication = len(unique_days)
-                regularity_rate = round((1 - (90 - days_with_publication) / 90) * 100, 1)
-            except:
-                regularity_rate = 0
+            # Régularité (90 jours)
+            regularity_rate = regularities.get(media_id, 0)
             
             # Calculer l'ancienneté en mois
             anciennete_mois = 0
@@ -352,9 +338,7 @@ def get_medias():
         return jsonify(medias_with_stats)
     
     except Exception as e:
-        print(f"Erreur dans get_medias: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Erreur dans get_medias: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -365,7 +349,7 @@ def get_media_details(media_id):
         supabase = get_supabase()
         time_range = request.args.get('time_range', '24h')
         
-        print(f"🔍 Chargement des détails pour média {media_id} - période: {time_range}")
+        logger.debug("🔍 Chargement des détails pour média %s - période: %s", media_id, time_range)
         
         # Récupérer le média
         media_result = supabase.table('medias').select('*').eq('id', media_id).single().execute()
@@ -394,7 +378,7 @@ def get_media_details(media_id):
         articles_data = articles_result.data
         article_ids = [a['id'] for a in articles_data]
         
-        print(f"📰 Trouvé {len(articles_data)} articles (limité à {max_articles_for_details})")
+        logger.debug("📰 Trouvé %s articles (limité à %s)", len(articles_data), max_articles_for_details)
         
         # Statistiques d'engagement - requête optimisée par media_id et date au lieu de liste d'IDs
         total_likes = 0
@@ -406,7 +390,7 @@ def get_media_details(media_id):
         if len(articles_data) > 0:
             # OPTIMISATION: Augmenter chunk_size et réduire les logs
             chunk_size = 1000  # Traiter plus d'articles par requête
-            print(f"🔍 Chargement engagements pour {len(article_ids)} articles...")
+            logger.debug("🔍 Chargement engagements pour %s articles...", len(article_ids))
             
             for i in range(0, len(article_ids), chunk_size):
                 chunk = article_ids[i:i+chunk_size]
@@ -426,10 +410,10 @@ def get_media_details(media_id):
                         total_partages += partages
                         
                 except Exception as e:
-                    print(f"⚠️ Erreur engagements chunk {i//chunk_size + 1}: {str(e)}")
+                    logger.warning("⚠️ Erreur engagements chunk %s: %s", i//chunk_size + 1, e)
                     continue
         
-        print(f"💬 Total engagement: {total_likes + total_commentaires + total_partages}")
+        logger.debug("💬 Total engagement: %s", total_likes + total_commentaires + total_partages)
         
         # Distribution thématique - calculée en Python (ultra rapide)
         categories_count = {}
@@ -579,44 +563,15 @@ def get_media_details(media_id):
                 'engagement': engagement
             })
         
-        print(f"✅ Détails du média chargés avec succès")
+        logger.debug("✅ Détails du média chargés avec succès")
         
         # Calcul du taux de régularité (sur 90 jours) - INDÉPENDANT de la période sélectionnée
         regularity_rate = 0
         try:
-            # Récupérer TOUS les articles des 90 derniers jours (requête séparée)
-            ninety_days_ago = now - timedelta(days=90)
-            ninety_days_ago_iso = ninety_days_ago.isoformat()
-            
-            print(f"📅 Calcul régularité depuis {ninety_days_ago_iso}")
-            
-            # Requête indépendante pour les 90 derniers jours
-            regularity_articles = supabase.table('articles')\
-                .select('date')\
-                .eq('media_id', media_id)\
-                .gte('date', ninety_days_ago_iso)\
-                .execute()
-            
-            # Compter le nombre de jours uniques avec publication
-            unique_days = set()
-            for article in regularity_articles.data:
-                try:
-                    article_date = datetime.fromisoformat(article['date'].replace('Z', '+00:00'))
-                    unique_days.add(article_date.date())
-                except Exception as date_error:
-                    print(f"⚠️ Erreur parsing date: {article['date']} - {date_error}")
-                    pass
-            
-            # Calculer le taux: (1 - jours_sans_publication / 90) * 100
-            days_with_publication = len(unique_days)
-            days_without_publication = 90 - days_with_publication
-            regularity_rate = round((1 - days_without_publication / 90) * 100, 1)
-            
-            print(f"📅 Régularité: {len(regularity_articles.data)} articles, {days_with_publication} jours actifs sur 90 = {regularity_rate}%")
+            regularity_rate = PublicationDays(supabase).get_regularity([media_id]).get(media_id, 0)
+            logger.debug("📅 Régularité: %s%%", regularity_rate)
         except Exception as e:
-            print(f"⚠️ Erreur calcul régularité: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("⚠️ Erreur calcul régularité: %s", e)
             regularity_rate = 0
         
         # Calcul du score d'influence pour ce média
@@ -682,11 +637,9 @@ def get_media_details(media_id):
                 0.10 * regularite_norm
             ) * 100, 2)
             
-            print(f"💯 Score d'influence: {score_influence}/100 (E:{engagement_norm:.2f} F:{followers_norm:.2f} A:{articles_norm:.2f} Anc:{anciennete_norm:.2f} R:{regularite_norm:.2f})")
+            logger.debug("💯 Score d'influence: %s/100 (E:%.2f F:%.2f A:%.2f Anc:%.2f R:%.2f)", score_influence, engagement_norm, followers_norm, articles_norm, anciennete_norm, regularite_norm)
         except Exception as e:
-            print(f"⚠️ Erreur calcul score d'influence: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("⚠️ Erreur calcul score d'influence: %s", e)
             score_influence = 0
         
         return jsonify({
@@ -712,9 +665,7 @@ def get_media_details(media_id):
         })
     
     except Exception as e:
-        print(f"❌ Erreur dans get_media_details: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur dans get_media_details: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -910,9 +861,7 @@ def get_alerts():
         return jsonify(alerts_result.data)
     
     except Exception as e:
-        print(f"❌ Erreur dans get_alerts: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur dans get_alerts: %s", e)
         return jsonify({'error': str(e), 'alerts': []}), 500
 
 
@@ -933,7 +882,7 @@ def resolve_alert(alert_id):
             return jsonify({'error': 'Alerte non trouvée'}), 404
     
     except Exception as e:
-        print(f"❌ Erreur dans resolve_alert: {e}")
+        logger.error("❌ Erreur dans resolve_alert: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -959,27 +908,15 @@ def generate_alerts():
         total_alerts = 0
         alerts_created = []
         
+        # Régularité (90 jours) de tous les médias en une seule lecture
+        regularities = PublicationDays(supabase).get_regularity([media['id'] for media in medias.data])
+        
         for media in medias.data:
-            # Calculer la régularité
-            ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-            articles_90d = supabase.table('articles')\
-                .select('date')\
-                .eq('media_id', media['id'])\
-                .gte('date', ninety_days_ago.isoformat())\
-                .execute()
-            
-            dates_with_articles = set()
-            for article in articles_90d.data:
-                article_date = datetime.fromisoformat(article['date'].replace('Z', '+00:00')).date()
-                dates_with_articles.add(article_date)
-            
-            days_with_publications = len(dates_with_articles)
-            regularite = (days_with_publications / 90) * 100
-            
-            media['regularite'] = regularite
+            media['regularite'] = regularities.get(media['id'], 0.0)
             
             # Générer les alertes pour ce média
             alerts = generator.generate_alerts_for_media(media)
+            logger.debug("⏱️ Alertes %s: %s", media['name'], generator.format_timings())
             
             # Sauvegarder les alertes
             for alert in alerts:
@@ -994,9 +931,7 @@ def generate_alerts():
         })
     
     except Exception as e:
-        print(f"❌ Erreur dans generate_alerts: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur dans generate_alerts: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1048,7 +983,7 @@ def get_alerts_stats():
         })
     
     except Exception as e:
-        print(f"❌ Erreur dans get_alerts_stats: {e}")
+        logger.error("❌ Erreur dans get_alerts_stats: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1101,7 +1036,7 @@ def get_deontology_alerts():
         })
     
     except Exception as e:
-        print(f"❌ Erreur dans get_deontology_alerts: {e}")
+        logger.error("❌ Erreur dans get_deontology_alerts: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1153,7 +1088,7 @@ def get_activity_chart():
         media_id = request.args.get('media_id', type=int)
         time_range = request.args.get('time_range', '7d')
         
-        print(f"📊 get_activity_chart - time_range: {time_range}, media_id: {media_id}")
+        logger.debug("📊 get_activity_chart - time_range: %s, media_id: %s", time_range, media_id)
         
         # Déterminer la période et la granularité
         now = datetime.utcnow()
@@ -1191,7 +1126,7 @@ def get_activity_chart():
             query = query.eq('media_id', media_id)
         
         articles_result = query.execute()
-        print(f"📰 Trouvé {len(articles_result.data)} articles pour le graphique")
+        logger.debug("📰 Trouvé %s articles pour le graphique", len(articles_result.data))
         
         # Grouper par période
         activity_data = {}
@@ -1248,13 +1183,11 @@ def get_activity_chart():
                     'count': activity_data.get(period_key, 0)
                 })
         
-        print(f"✅ Graphique généré avec {len(chart_data)} points")
+        logger.debug("✅ Graphique généré avec %s points", len(chart_data))
         return jsonify(chart_data)
     
     except Exception as e:
-        print(f"❌ Erreur get_activity_chart: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur get_activity_chart: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1325,7 +1258,7 @@ def get_recent_articles():
         media_id = request.args.get('media_id', type=int)
         time_range = request.args.get('time_range', '24h')
         
-        print(f"📰 get_recent_articles - media_id: {media_id}, time_range: {time_range}, limit: {limit}")
+        logger.debug("📰 get_recent_articles - media_id: %s, time_range: %s, limit: %s", media_id, time_range, limit)
         
         # Parser la période
         start_date = parse_time_range(time_range)
@@ -1351,7 +1284,7 @@ def get_recent_articles():
         
         articles_result = query.execute()
         
-        print(f"✅ Trouvé {len(articles_result.data)} articles récents")
+        logger.debug("✅ Trouvé %s articles récents", len(articles_result.data))
         
         # Récupérer tous les engagements en une seule requête
         article_ids = [article['id'] for article in articles_result.data]
@@ -1407,7 +1340,7 @@ def get_recent_articles():
                 
                 article_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
             except Exception as e:
-                print(f"⚠️ Erreur parsing date '{article['date']}': {e}")
+                logger.warning("⚠️ Erreur parsing date '%s': %s", article['date'], e, extra={'sample': 20})
                 article_date = datetime.now(timezone.utc)
             
             from datetime import timezone
@@ -1449,11 +1382,11 @@ def get_recent_articles():
                 'url': article.get('url', '')
             })
         
-        print(f"📦 Retour de {len(articles)} articles formatés")
+        logger.debug("📦 Retour de %s articles formatés", len(articles))
         return jsonify(articles)
     
     except Exception as e:
-        print(f"❌ Erreur get_recent_articles: {str(e)}")
+        logger.error("❌ Erreur get_recent_articles: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1461,7 +1394,8 @@ def get_recent_articles():
 def get_sentiments():
     """
     Retourne l'analyse déontologique des articles (scores de qualité journalistique)
-    Remplace l'ancienne analyse de sentiments par une vraie analyse LLM
+    Lit uniquement les scores stockés dans deontology_scores : les articles non encore
+    analysés sont confiés au worker d'arrière-plan et comptés dans 'pending'
     """
     try:
         supabase = get_supabase()
@@ -1470,11 +1404,11 @@ def get_sentiments():
         limit = request.args.get('limit', 10, type=int)
         offset = request.args.get('offset', 0, type=int)
         
-        print(f"🔍 get_sentiments (déontologie) - media_id: {media_id}, time_range: {time_range}, limit: {limit}, offset: {offset}")
+        logger.debug("🔍 get_sentiments (déontologie) - media_id: %s, time_range: %s, limit: %s, offset: %s", media_id, time_range, limit, offset)
         
         # Construire la requête pour récupérer les articles récents
         query = supabase.table('articles')\
-            .select('id, titre, contenu, date, media_id')\
+            .select('id, titre, date, media_id')\
             .order('date', desc=True)\
             .range(offset, offset + limit - 1)
         
@@ -1491,8 +1425,6 @@ def get_sentiments():
         result = query.execute()
         articles_data = result.data
         
-        print(f"� {len(articles_data)} articles récupérés pour analyse déontologique")
-        
         if not articles_data:
             return jsonify({
                 'excellent': 0,
@@ -1502,58 +1434,31 @@ def get_sentiments():
                 'critique': 0,
                 'total_posts': 0,
                 'score_moyen': 0,
+                'pending': 0,
                 'articles': []
             })
         
-        # Analyser chaque article avec le système LLM
-        import os
-        from dotenv import load_dotenv
-        
-        # Charger les variables d'environnement depuis /backend/llm/.env
-        llm_env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'llm', '.env')
-        load_dotenv(llm_env_path)
-        
-        # Import du module d'analyse
+        # Module d'analyse (backend/llm)
         import sys
         llm_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'llm')
         if llm_path not in sys.path:
             sys.path.insert(0, llm_path)
         
-        from analyze_deontology_supabase import DeontologyAnalyzer
+        from deontology_worker import get_stored_scores, get_scoring_worker
         
-        # Récupérer les variables d'environnement
-        supabase_url = os.getenv('SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_KEY')
-        mistral_api_key = os.getenv('MISTRAL_API_KEY')
+        stored_scores = get_stored_scores(supabase, [a['id'] for a in articles_data])
         
-        if not all([supabase_url, supabase_key, mistral_api_key]):
-            print("⚠️ Variables d'environnement manquantes, utilisation de données simulées")
-            print(f"  - SUPABASE_URL: {'✓' if supabase_url else '✗'}")
-            print(f"  - SUPABASE_KEY: {'✓' if supabase_key else '✗'}")
-            print(f"  - MISTRAL_API_KEY: {'✓' if mistral_api_key else '✗'}")
-            # Retourner des données simulées si les clés ne sont pas configurées
-            return jsonify({
-                'excellent': 3,
-                'bon': 4,
-                'moyen': 2,
-                'faible': 1,
-                'critique': 0,
-                'total_posts': len(articles_data),
-                'score_moyen': 7.2,
-                'articles': [
-                    {
-                        'titre': article['titre'][:60] + '...',
-                        'score': 7,
-                        'interpretation': 'Article conforme aux standards journalistiques'
-                    }
-                    for article in articles_data[:3]
-                ]
-            })
+        # Confier les articles non analysés au worker (sans attendre le résultat)
+        unscored_ids = [a['id'] for a in articles_data if a['id'] not in stored_scores]
+        worker = None
+        if unscored_ids:
+            load_dotenv(os.path.join(llm_path, '.env'))
+            worker = get_scoring_worker()
+            if worker:
+                worker.enqueue(unscored_ids)
+        # Sans worker (LLM non configuré), rien n'est en attente: ces articles ne seront pas analysés
+        pending = len(unscored_ids) if worker else 0
         
-        # Créer l'analyseur avec Mistral AI
-        analyzer = DeontologyAnalyzer(supabase_url, supabase_key, mistral_api_key)
-        
-        # Analyser les articles
         excellent = 0  # 9-10
         bon = 0        # 7-8
         moyen = 0      # 5-6
@@ -1563,48 +1468,39 @@ def get_sentiments():
         scores = []
         articles_analyses = []
         
-        import time
-        
-        for idx, article in enumerate(articles_data):
-            try:
-                # Ajouter un délai entre les requêtes pour éviter le rate limit (sauf pour la première)
-                if idx > 0:
-                    time.sleep(0.5)  # 500ms entre chaque requête
-                
-                analysis = analyzer.analyze_content(article['titre'], article.get('contenu', ''))
-                score = analysis['score']
-                
-                if score >= 9:
-                    excellent += 1
-                elif score >= 7:
-                    bon += 1
-                elif score >= 5:
-                    moyen += 1
-                elif score >= 3:
-                    faible += 1
-                else:
-                    critique += 1
-                
-                if score >= 0:
-                    scores.append(score)
-                
-                articles_analyses.append({
-                    'titre': article['titre'][:80],
-                    'score': score,
-                    'interpretation': analysis['interpretation'],
-                    'date': article['date']
-                })
-            except Exception as e:
-                error_msg = str(e)
-                print(f"⚠️ Erreur analyse article '{article['titre'][:50]}': {error_msg}")
-                
-                # En cas d'erreur (rate limit, etc.), ajouter avec score -1
+        for article in articles_data:
+            stored = stored_scores.get(article['id'])
+            
+            if not stored:
+                # Score -1 = pas encore de score (en attente si un worker l'analyse)
                 articles_analyses.append({
                     'titre': article['titre'][:80],
                     'score': -1,
-                    'interpretation': f"Erreur d'analyse temporaire. Réessayez plus tard.",
-                    'date': article['date']
+                    'interpretation': "Analyse en cours..." if worker else "Analyse indisponible",
+                    'date': article['date'],
+                    'pending': worker is not None
                 })
+                continue
+            
+            score = stored['score']
+            if score >= 9:
+                excellent += 1
+            elif score >= 7:
+                bon += 1
+            elif score >= 5:
+                moyen += 1
+            elif score >= 3:
+                faible += 1
+            else:
+                critique += 1
+            
+            scores.append(score)
+            articles_analyses.append({
+                'titre': article['titre'][:80],
+                'score': score,
+                'interpretation': stored['interpretation'],
+                'date': article['date']
+            })
         
         score_moyen = sum(scores) / len(scores) if scores else 0
         
@@ -1616,15 +1512,13 @@ def get_sentiments():
             'critique': critique,
             'total_posts': len(articles_data),
             'score_moyen': round(score_moyen, 1),
-            'articles': articles_analyses  # Tous les articles analysés
+            'pending': pending,
+            'articles': articles_analyses
         }
         
-        print(f"✅ Analyse terminée: Score moyen={score_moyen:.1f}, Excellent={excellent}, Bon={bon}")
+        logger.debug("✅ Scores déontologiques: %s disponibles, %s en attente", len(scores), pending)
         return jsonify(result)
     
     except Exception as e:
-        print(f"❌ Erreur get_sentiments: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur get_sentiments: %s", e)
         return jsonify({'error': str(e)}), 500
-
@@ -7,6 +7,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 from io import BytesIO
+import logging
 import sys
 from pathlib import Path
 
@@ -15,6 +16,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from supabase_client import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
 export_bp = Blueprint('export', __name__, url_prefix='/api/export')
 
 
@@ -120,10 +123,10 @@ def export_database():
                     adjusted_width = min(max_length + 2, 50)  # Max 50 caractères
                     ws.column_dimensions[column_letter].width = adjusted_width
                 
-                print(f"✅ Table '{table_config['name']}' exportée : {len(data)} lignes")
+                logger.debug("✅ Table '%s' exportée : %s lignes", table_config['name'], len(data))
                 
             except Exception as e:
-                print(f"⚠️ Erreur export table '{table_config['name']}': {e}")
+                logger.warning("⚠️ Erreur export table '%s': %s", table_config['name'], e)
                 continue
         
         # Créer un buffer en mémoire
@@ -143,9 +146,7 @@ def export_database():
         )
         
     except Exception as e:
-        print(f"❌ Erreur export database: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erreur export database: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -222,5 +223,5 @@ def export_articles_only():
         )
         
     except Exception as e:
-        print(f"❌ Erreur export articles: {e}")
+        logger.error("❌ Erreur export articles: %s", e)
         return jsonify({'error': str(e)}), 500
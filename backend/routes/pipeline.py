@@ -3,172 +3,88 @@ Routes API pour le pipeline de scraping automatique
 Permet de lancer, suivre et récupérer les résultats des scraping
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from datetime import datetime
+import json
 import threading
-import os
 import sys
-import json
 from pathlib import Path
 
 # Ajouter le path du pipeline
 sys.path.insert(0, str(Path(__file__).parent.parent / 'pipeline'))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from pipeline.orchestrator import PipelineOrchestrator
+from pipeline.utils.job_store import get_job_store
 from supabase_client import get_supabase_client
 
 pipeline_bp = Blueprint('pipeline', __name__, url_prefix='/api/pipeline')
 
-# Fichier pour persister l'état du pipeline
-STATE_FILE = Path(__file__).parent.parent / 'pipeline_state.json'
-
-def load_pipeline_state():
-    """Charge l'état du pipeline depuis le fichier"""
-    if STATE_FILE.exists():
-        try:
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return {
-        'is_running': False,
-        'last_run': None,
-        'last_result': None,
-        'current_progress': None,
-        'notifications': []
-    }
-
-def save_pipeline_state(state):
-    """Sauvegarde l'état du pipeline dans le fichier"""
-    try:
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"❌ Erreur sauvegarde état: {e}")
+# Relecture du journal d'événements quand aucun réveil n'arrive (événements d'un autre processus)
+SSE_POLL_SECONDS = 1.0
+# Commentaire de maintien de connexion (proxys, navigateurs)
+SSE_HEARTBEAT_SECONDS = 15
 
-# Charger l'état initial
-pipeline_state = load_pipeline_state()
+# Jobs et notifications partagés avec le scheduler
+job_store = get_job_store()
 
 
-def run_pipeline_async(max_articles=20):
-    """Exécute le pipeline en arrière-plan"""
-    global pipeline_state
-    
+def run_pipeline_async(job_id, max_articles=20):
+    """Exécute le pipeline en arrière-plan (mode intégré, le job est déjà créé par /run)"""
+    # Import tardif: l'API seule ne charge ni les scrapers ni le modèle ML
+    from pipeline.worker import run_pipeline_job
+    run_pipeline_job(job_id, max_articles)
+
+
+@pipeline_bp.route('/run', methods=['POST'])
+def run_pipeline():
+    """Lance le pipeline de scraping en arrière-plan"""
+    # Paramètres optionnels - gérer les différents formats de requête
     try:
-        pipeline_state['is_running'] = True
-        pipeline_state['current_progress'] = {
-            'status': 'starting',
-            'message': '🚀 Démarrage du scraping...',
-            'timestamp': datetime.now().isoformat()
-        }
-        save_pipeline_state(pipeline_state)
-        
-        # Ajouter notification de démarrage
-        add_notification({
-            'type': 'info',
-            'title': 'Scraping démarré',
-            'message': 'Le scraping automatique a commencé',
+        max_articles = request.json.get('max_articles', 20) if request.json and isinstance(request.json, dict) else 20
+    except:
+        max_articles = 20
+    
+    # Mode API seule: le job est mis en file, le worker (python -m pipeline.worker) l'exécute
+    if current_app.config.get('PIPELINE_API_ONLY'):
+        job_id = job_store.enqueue_job(params={'max_articles': max_articles}, progress={
+            'status': 'queued',
+            'message': '⏳ En attente du worker...',
             'timestamp': datetime.now().isoformat()
         })
+        if job_id is None:
+            return jsonify({
+                'success': False,
+                'message': 'Un scraping est déjà en cours'
+            }), 400
         
-        # Créer et exécuter l'orchestrateur
-        orchestrator = PipelineOrchestrator(include_facebook=False)
-        
-        pipeline_state['current_progress'] = {
-            'status': 'scraping',
-            'message': '📰 Scraping des médias en cours...',
-            'timestamp': datetime.now().isoformat()
-        }
-        save_pipeline_state(pipeline_state)
-        
-        stats = orchestrator.run_full_pipeline(
-            max_articles_per_section=max_articles,
-            facebook_max_posts=0
-        )
-        
-        # Pipeline terminé
-        pipeline_state['is_running'] = False
-        pipeline_state['last_run'] = datetime.now().isoformat()
-        pipeline_state['last_result'] = {
+        return jsonify({
             'success': True,
-            'stats': stats,
-            'timestamp': datetime.now().isoformat(),
-            'duration': stats.get('duration', 0)
-        }
-        pipeline_state['current_progress'] = None
-        save_pipeline_state(pipeline_state)
-        
-        # Ajouter notification de succès
-        add_notification({
-            'type': 'success',
-            'title': 'Scraping terminé',
-            'message': f"{stats['total_inserted']} nouveaux articles insérés",
-            'stats': stats,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        print(f"✅ Pipeline terminé: {stats}")
-        
-    except Exception as e:
-        pipeline_state['is_running'] = False
-        pipeline_state['last_run'] = datetime.now().isoformat()
-        pipeline_state['last_result'] = {
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }
-        pipeline_state['current_progress'] = None
-        save_pipeline_state(pipeline_state)
-        
-        # Ajouter notification d'erreur
-        add_notification({
-            'type': 'error',
-            'title': 'Erreur de scraping',
-            'message': f'Erreur: {str(e)}',
+            'message': 'Pipeline mis en file pour le worker',
+            'job_id': job_id,
             'timestamp': datetime.now().isoformat()
         })
-        
-        print(f"❌ Erreur pipeline: {e}")
-        import traceback
-        traceback.print_exc()
-
-
-def add_notification(notification):
-    """Ajoute une notification à la liste (max 20)"""
-    global pipeline_state
-    pipeline_state['notifications'].insert(0, notification)
-    # Garder seulement les 20 dernières
-    pipeline_state['notifications'] = pipeline_state['notifications'][:20]
-    save_pipeline_state(pipeline_state)
-    print(f"📢 Notification ajoutée: {notification['title']}")
-
-
-@pipeline_bp.route('/run', methods=['POST'])
-def run_pipeline():
-    """Lance le pipeline de scraping en arrière-plan"""
-    global pipeline_state
     
-    if pipeline_state['is_running']:
+    # Création atomique du job: échoue si le scheduler ou un autre /run est en cours
+    job_id = job_store.start_job(progress={
+        'status': 'starting',
+        'message': '🚀 Démarrage du scraping...',
+        'timestamp': datetime.now().isoformat()
+    })
+    if job_id is None:
         return jsonify({
             'success': False,
             'message': 'Un scraping est déjà en cours'
         }), 400
     
-    # Paramètres optionnels - gérer les différents formats de requête
-    try:
-        max_articles = request.json.get('max_articles', 20) if request.json and isinstance(request.json, dict) else 20
-    except:
-        max_articles = 20
-    
     # Lancer le pipeline dans un thread séparé
-    thread = threading.Thread(target=run_pipeline_async, args=(max_articles,))
+    thread = threading.Thread(target=run_pipeline_async, args=(job_id, max_articles))
     thread.daemon = True
     thread.start()
     
     return jsonify({
         'success': True,
         'message': 'Pipeline démarré en arrière-plan',
+        'job_id': job_id,
         'timestamp': datetime.now().isoformat()
     })
 
@@ -176,51 +92,77 @@ def run_pipeline():
 @pipeline_bp.route('/status', methods=['GET'])
 def get_status():
     """Retourne l'état actuel du pipeline"""
-    # Recharger l'état depuis le fichier pour avoir les dernières données
-    global pipeline_state
-    pipeline_state = load_pipeline_state()
-    
-    return jsonify({
-        'is_running': pipeline_state['is_running'],
-        'last_run': pipeline_state['last_run'],
-        'last_result': pipeline_state['last_result'],
-        'current_progress': pipeline_state['current_progress']
+    return jsonify(job_store.get_status())
+
+
+def _sse(event_id, event_type, data):
+    """Formate un message Server-Sent Events"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+@pipeline_bp.route('/events', methods=['GET'])
+def stream_events():
+    """
+    Flux Server-Sent Events: progression, stats par média et notifications
+
+    Au premier branchement: un événement 'snapshot' (statut + notifications), puis les
+    événements au fil de l'eau. Après une coupure, le navigateur renvoie Last-Event-ID
+    et reçoit les événements manqués, ou un nouveau 'snapshot' s'ils ont été purgés
+    du journal entre-temps.
+    """
+    last_id = request.headers.get('Last-Event-ID', type=int)
+
+    def generate():
+        after_id = last_id
+        if after_id is None or job_store.events_lost(after_id):
+            after_id = job_store.last_event_id()
+            yield _sse(after_id, 'snapshot', {
+                'status': job_store.get_status(),
+                'notifications': job_store.get_notifications(),
+                'unread_count': job_store.unread_count()
+            })
+
+        idle = 0.0
+        while True:
+            events = job_store.wait_for_events(after_id, SSE_POLL_SECONDS)
+            for event in events:
+                after_id = event['id']
+                yield _sse(event['id'], event['type'], event['data'])
+
+            if events:
+                idle = 0.0
+            else:
+                idle += SSE_POLL_SECONDS
+                if idle >= SSE_HEARTBEAT_SECONDS:
+                    idle = 0.0
+                    yield ": heartbeat\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
 
 
 @pipeline_bp.route('/notifications', methods=['GET'])
 def get_notifications():
     """Retourne les notifications de scraping"""
-    # Recharger l'état depuis le fichier
-    global pipeline_state
-    pipeline_state = load_pipeline_state()
-    
     # Filtrer par type si spécifié
     notification_type = request.args.get('type')
     
-    notifications = pipeline_state['notifications']
-    if notification_type:
-        notifications = [n for n in notifications if n['type'] == notification_type]
-    
-    print(f"📋 Retour {len(notifications)} notifications")
+    notifications = job_store.get_notifications(notification_type)
     
     return jsonify({
         'notifications': notifications,
         'count': len(notifications),
-        'unread_count': len([n for n in pipeline_state['notifications'] if not n.get('read', False)])
+        'unread_count': job_store.unread_count()
     })
 
 
 @pipeline_bp.route('/notifications/mark-read', methods=['POST'])
 def mark_notifications_read():
     """Marque toutes les notifications comme lues"""
-    global pipeline_state
-    pipeline_state = load_pipeline_state()
-    
-    for notification in pipeline_state['notifications']:
-        notification['read'] = True
-    
-    save_pipeline_state(pipeline_state)
+    job_store.mark_all_read()
     
     return jsonify({
         'success': True,
@@ -231,10 +173,7 @@ def mark_notifications_read():
 @pipeline_bp.route('/notifications/clear', methods=['POST'])
 def clear_notifications():
     """Efface toutes les notifications"""
-    global pipeline_state
-    pipeline_state = load_pipeline_state()
-    pipeline_state['notifications'] = []
-    save_pipeline_state(pipeline_state)
+    job_store.clear_notifications()
     
     return jsonify({
         'success': True,
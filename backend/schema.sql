@@ -34,6 +34,14 @@ CREATE TABLE public.categories (
   created_at timestamp with time zone DEFAULT now(),
   CONSTRAINT categories_pkey PRIMARY KEY (id)
 );
+CREATE TABLE public.deontology_scores (
+  article_id text NOT NULL,
+  score integer NOT NULL CHECK (score >= 0 AND score <= 10),
+  interpretation text,
+  analyzed_at timestamp with time zone DEFAULT now(),
+  CONSTRAINT deontology_scores_pkey PRIMARY KEY (article_id),
+  CONSTRAINT deontology_scores_article_id_fkey FOREIGN KEY (article_id) REFERENCES public.articles(id)
+);
 CREATE TABLE public.engagements (
   id bigint GENERATED ALWAYS AS IDENTITY NOT NULL,
   likes integer DEFAULT 0,
@@ -61,6 +69,16 @@ CREATE TABLE public.media_stats (
   CONSTRAINT media_stats_pkey PRIMARY KEY (id),
   CONSTRAINT media_stats_media_id_fkey FOREIGN KEY (media_id) REFERENCES public.medias(id)
 );
+-- Jours de publication par média (régularité). Initialisée automatiquement depuis la table
+-- articles au démarrage du scheduler ou du worker tant qu'elle est vide
+-- (à la main: python pipeline/utils/publication_days.py)
+CREATE TABLE public.media_publication_days (
+  media_id bigint NOT NULL,
+  day date NOT NULL,
+  created_at timestamp with time zone DEFAULT now(),
+  CONSTRAINT media_publication_days_pkey PRIMARY KEY (media_id, day),
+  CONSTRAINT media_publication_days_media_id_fkey FOREIGN KEY (media_id) REFERENCES public.medias(id)
+);
 CREATE TABLE public.medias (
   id bigint GENERATED ALWAYS AS IDENTITY NOT NULL,
   name text NOT NULL UNIQUE,
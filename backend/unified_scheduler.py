@@ -8,15 +8,9 @@ import logging
 from datetime import datetime
 import threading
 import time
-import json
 from pathlib import Path
 import sys
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Ajouter les paths
@@ -25,43 +19,17 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from pipeline.orchestrator import PipelineOrchestrator
 from pipeline.scrapers.facebookScriping.facebook_orchestrator import FacebookOrchestrator
+from pipeline.utils.job_store import get_job_store
+from utils.log import configure_logging
 
-# Fichier d'état partagé avec les routes API
-STATE_FILE = Path(__file__).parent / 'pipeline_state.json'
+# Notifications partagées avec les routes API
+job_store = get_job_store()
 
-def load_pipeline_state():
-    """Charge l'état du pipeline depuis le fichier"""
-    if STATE_FILE.exists():
-        try:
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return {
-        'is_running': False,
-        'last_run': None,
-        'last_result': None,
-        'current_progress': None,
-        'notifications': []
-    }
-
-def save_pipeline_state(state):
-    """Sauvegarde l'état du pipeline dans le fichier"""
-    try:
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.error(f"❌ Erreur sauvegarde état: {e}")
 
 def add_notification(notification):
-    """Ajoute une notification à la liste (max 20)"""
-    state = load_pipeline_state()
-    notification['read'] = False  # Nouveau: marquer comme non lu
-    state['notifications'].insert(0, notification)
-    # Garder seulement les 20 dernières
-    state['notifications'] = state['notifications'][:20]
-    save_pipeline_state(state)
-    logger.info(f"📢 Notification: {notification['title']}")
+    """Ajoute une notification (les 20 dernières sont conservées)"""
+    job_store.add_notification(notification)
+    logger.info("📢 Notification: %s", notification['title'])
 
 
 def run_web_pipeline(max_articles=20):
@@ -98,11 +66,11 @@ def run_web_pipeline(max_articles=20):
             'timestamp': datetime.now().isoformat()
         })
         
-        logger.info(f"✅ Pipeline WEB terminé: {stats.get('total_inserted', 0)} articles")
+        logger.info("✅ Pipeline WEB terminé: %d articles", stats.get('total_inserted', 0))
         return {'success': True, 'stats': stats, 'duration': duration}
         
     except Exception as e:
-        logger.error(f"❌ Erreur pipeline WEB: {e}")
+        logger.error("❌ Erreur pipeline WEB: %s", e)
         
         add_notification({
             'type': 'error',
@@ -149,11 +117,11 @@ def run_facebook_pipeline():
             'timestamp': datetime.now().isoformat()
         })
         
-        logger.info(f"✅ Pipeline FACEBOOK terminé: {inserted} posts")
+        logger.info("✅ Pipeline FACEBOOK terminé: %d posts", inserted)
         return {'success': True, 'stats': stats, 'duration': duration}
         
     except Exception as e:
-        logger.error(f"❌ Erreur pipeline FACEBOOK: {e}")
+        logger.error("❌ Erreur pipeline FACEBOOK: %s", e)
         
         add_notification({
             'type': 'error',
@@ -194,5 +162,6 @@ def start_unified_scheduler():
 
 if __name__ == "__main__":
     # Test en mode standalone
-    print("🧪 Test du scheduler unifié...")
+    configure_logging()
+    logger.info("🧪 Test du scheduler unifié...")
     run_unified_pipelines()
@@ -8,24 +8,36 @@ const NotificationBell = ({ onShowReport }) => {
   const [isOpen, setIsOpen] = useState(false);
   const [loading, setLoading] = useState(false);
 
-  // Charger les notifications depuis l'API
-  const loadNotifications = async () => {
-    try {
-      const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000';
-      const response = await fetch(`${API_URL}/api/pipeline/notifications`);
-      const data = await response.json();
+  // Notifications poussées par le serveur (flux SSE, sans polling)
+  useEffect(() => {
+    const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000';
+    const source = new EventSource(`${API_URL}/api/pipeline/events`);
+
+    // État complet à la connexion
+    source.addEventListener('snapshot', (event) => {
+      const data = JSON.parse(event.data);
       setNotifications(data.notifications || []);
       setUnreadCount(data.unread_count || 0);
-    } catch (error) {
-      console.error('Erreur chargement notifications:', error);
-    }
-  };
+    });
+    source.addEventListener('notification', (event) => {
+      const notification = JSON.parse(event.data);
+      setNotifications((prev) => [notification, ...prev.filter(n => n.id !== notification.id)].slice(0, 20));
+      setUnreadCount((prev) => prev + 1);
+    });
+    // Synchronisation entre onglets
+    source.addEventListener('notifications_read', () => {
+      setUnreadCount(0);
+      setNotifications((prev) => prev.map(n => ({ ...n, read: true })));
+    });
+    source.addEventListener('notifications_cleared', () => {
+      setNotifications([]);
+      setUnreadCount(0);
+    });
+    source.onerror = () => {
+      console.error('Flux notifications interrompu, reconnexion...');
+    };
 
-  // Polling toutes les 5 secondes pour récupérer les nouvelles notifications
-  useEffect(() => {
-    loadNotifications();
-    const interval = setInterval(loadNotifications, 5000);
-    return () => clearInterval(interval);
+    return () => source.close();
   }, []);
 
   // Marquer toutes comme lues
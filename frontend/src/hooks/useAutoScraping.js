@@ -1,16 +1,23 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { toast } from 'react-hot-toast';
 
 /**
  * Hook pour gérer le scraping automatique
  * - Lance le scraping toutes les X minutes
- * - Surveille l'état du scraping
+ * - Surveille l'état du scraping (flux SSE /api/pipeline/events, sans polling)
  * - Affiche un pop-up automatique quand le scraping se termine
  */
 const useAutoScraping = (intervalMinutes = 15) => {
   const [isScrapingRunning, setIsScrapingRunning] = useState(false);
   const [lastScrapingResult, setLastScrapingResult] = useState(null);
   const [showReportModal, setShowReportModal] = useState(false);
+  const [currentProgress, setCurrentProgress] = useState(null);
+  const [mediaStats, setMediaStats] = useState({});
+
+  // Valeurs lues par les callbacks du flux SSE (évite de recréer la connexion)
+  const isRunningRef = useRef(false);
+  const lastResultRef = useRef(null);
+  const jobIdRef = useRef(null);
   
   // Initialiser le timer depuis localStorage ou créer un nouveau
   const initializeTimer = () => {
@@ -59,6 +66,7 @@ const useAutoScraping = (intervalMinutes = 15) => {
       
       if (data.success) {
         console.log('✅ Scraping démarré:', data.message);
+        isRunningRef.current = true;
         setIsScrapingRunning(true);
         return true;
       } else {
@@ -81,72 +89,113 @@ const useAutoScraping = (intervalMinutes = 15) => {
     }
   }, []);
 
-  // Vérifier l'état du scraping
-  const checkScrapingStatus = useCallback(async () => {
-    try {
-      const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000';
-      const response = await fetch(`${API_URL}/api/pipeline/status`);
-      const data = await response.json();
+  // Appliquer un état reçu (flux SSE ou requête /status)
+  const applyStatus = useCallback((data) => {
+    const wasRunning = isRunningRef.current;
+    isRunningRef.current = data.is_running;
+    jobIdRef.current = data.job_id;
+    setIsScrapingRunning(data.is_running);
+    setCurrentProgress(data.current_progress || null);
 
-      const wasRunning = isScrapingRunning;
-      setIsScrapingRunning(data.is_running);
+    if (data.is_running && !wasRunning) {
+      setMediaStats({});
+    }
 
-      // Si le scraping vient de se terminer
-      if (wasRunning && !data.is_running && data.last_result) {
-        toast.dismiss('scraping-start');
-        
-        if (data.last_result.success) {
-          // Pop-up de succès
-          const stats = data.last_result.stats || {};
-          toast.success(
-            `Scraping terminé !\n${stats.total_inserted || 0} nouveaux articles insérés`,
-            {
-              duration: 5000,
-              icon: '✅',
-              style: {
-                background: '#10B981',
-                color: '#fff',
-                fontWeight: 'bold'
-              }
-            }
-          );
-        } else {
-          // Pop-up d'erreur
-          toast.error('Scraping échoué', {
+    // Si le scraping vient de se terminer
+    if (wasRunning && !data.is_running && data.last_result) {
+      toast.dismiss('scraping-start');
+      
+      if (data.last_result.success) {
+        // Pop-up de succès
+        const stats = data.last_result.stats || {};
+        toast.success(
+          `Scraping terminé !\n${stats.total_inserted || 0} nouveaux articles insérés`,
+          {
             duration: 5000,
-            icon: '❌',
+            icon: '✅',
             style: {
-              background: '#EF4444',
-              color: '#fff'
+              background: '#10B981',
+              color: '#fff',
+              fontWeight: 'bold'
             }
-          });
-        }
+          }
+        );
+      } else {
+        // Pop-up d'erreur
+        toast.error('Scraping échoué', {
+          duration: 5000,
+          icon: '❌',
+          style: {
+            background: '#EF4444',
+            color: '#fff'
+          }
+        });
       }
+    }
 
-      // Si le scraping vient de se terminer et qu'on a un résultat
-      if (!data.is_running && data.last_result && 
-          data.last_result.timestamp !== lastScrapingResult?.timestamp) {
-        
-        setLastScrapingResult(data.last_result);
-        
-        // Afficher automatiquement le rapport si succès
-        if (data.last_result.success) {
-          setShowReportModal(true);
-        }
+    // Si le scraping vient de se terminer et qu'on a un résultat
+    if (!data.is_running && data.last_result && 
+        data.last_result.timestamp !== lastResultRef.current?.timestamp) {
+      lastResultRef.current = data.last_result;
+      setLastScrapingResult(data.last_result);
+      
+      // Afficher automatiquement le rapport si succès
+      if (data.last_result.success) {
+        setShowReportModal(true);
       }
+    }
+  }, []);
 
+  // Vérifier l'état du scraping (ponctuel)
+  const checkScrapingStatus = useCallback(async () => {
+    try {
+      const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000';
+      const response = await fetch(`${API_URL}/api/pipeline/status`);
+      const data = await response.json();
+      applyStatus(data);
       return data;
     } catch (error) {
       console.error('❌ Erreur vérification status:', error);
       return null;
     }
-  }, [lastScrapingResult, isScrapingRunning]);
+  }, [applyStatus]);
 
-  // Polling de l'état toutes les 5 secondes
+  // Événements poussés par le serveur (progression, stats par média, fin du job)
   useEffect(() => {
-    const interval = setInterval(checkScrapingStatus, 5000);
-    return () => clearInterval(interval);
-  }, [checkScrapingStatus]);
+    const API_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000';
+    const source = new EventSource(`${API_URL}/api/pipeline/events`);
+
+    source.addEventListener('snapshot', (event) => {
+      applyStatus(JSON.parse(event.data).status);
+    });
+    source.addEventListener('status', (event) => {
+      const data = JSON.parse(event.data);
+      // Les passages planifiés par média ont leur propre job: seul le pipeline complet est suivi ici
+      if (data.name === 'pipeline') {
+        applyStatus(data);
+      }
+    });
+    source.addEventListener('progress', (event) => {
+      const data = JSON.parse(event.data);
+      if (data.job_id === jobIdRef.current) {
+        setCurrentProgress(data);
+      }
+    });
+    source.addEventListener('media_stats', (event) => {
+      const data = JSON.parse(event.data);
+      if (data.job_id !== jobIdRef.current) {
+        return;
+      }
+      const key = `${data.pipeline || 'web'}:${data.media}`;
+      setMediaStats((prev) => ({ ...prev, [key]: { ...prev[key], ...data } }));
+    });
+    source.onerror = () => {
+      // EventSource se reconnecte seul et reprend au dernier événement reçu
+      console.warn('⚠️ Flux SSE interrompu, reconnexion...');
+    };
+
+    return () => source.close();
+  }, [applyStatus]);
 
   // Timer pour le prochain scraping automatique
   useEffect(() => {
@@ -180,6 +229,8 @@ const useAutoScraping = (intervalMinutes = 15) => {
     lastScrapingResult,
     showReportModal,
     setShowReportModal,
+    currentProgress,
+    mediaStats,
     nextScrapingIn,
     formatTimeRemaining,
     startScraping,
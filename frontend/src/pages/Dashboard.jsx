@@ -50,6 +50,20 @@ import { authAPI } from '../services/api';
 import * as dashboardAPI from '../services/dashboardApi';
 import './Dashboard.css';
 
+// Délai entre deux relectures des scores tant que des articles sont en attente d'analyse
+const PENDING_SCORES_REFRESH_MS = 15000;
+
+// Fusionne un article et son analyse déontologique (score null = pas encore de score)
+const mergeAnalysis = (article, analysisData) => {
+  const hasScore = typeof analysisData?.score === 'number' && analysisData.score >= 0;
+  return {
+    ...article,
+    score: hasScore ? analysisData.score : null,
+    pending: !hasScore && Boolean(analysisData?.pending),
+    interpretation: analysisData?.interpretation || "En attente d'analyse"
+  };
+};
+
 function Dashboard() {
   const navigate = useNavigate();
   
@@ -448,24 +462,22 @@ function Dashboard() {
               interpretation: analysisData?.interpretation?.substring(0, 50)
             });
             
-            return {
-              ...article,
-              score: analysisData?.score !== undefined && analysisData?.score >= 0 ? analysisData.score : 5,
-              interpretation: analysisData?.interpretation || "En attente d'analyse"
-            };
+            return mergeAnalysis(article, analysisData);
           });
           
           setAnalyzedArticles(analyzed);
           
-          // 4. Sauvegarder dans le cache localStorage
-          const cacheData = {
-            articles: analyzed,
-            recentArticles: articles,
-            sentiments: sentiments,
-            timestamp: Date.now()
-          };
-          localStorage.setItem(cacheKey, JSON.stringify(cacheData));
-          console.log('💾 Résultats mis en cache');
+          // 4. Sauvegarder dans le cache localStorage (pas de résultats partiels: scores en attente)
+          if (!(sentiments.pending > 0)) {
+            const cacheData = {
+              articles: analyzed,
+              recentArticles: articles,
+              sentiments: sentiments,
+              timestamp: Date.now()
+            };
+            localStorage.setItem(cacheKey, JSON.stringify(cacheData));
+            console.log('💾 Résultats mis en cache');
+          }
           
         } catch (error) {
           console.error('❌ Erreur lors du chargement:', error);
@@ -547,22 +559,18 @@ function Dashboard() {
         
         // Créer les nouveaux articles analysés
         newAnalyzed = nextBatch.map((article, index) => {
-          const analysisData = sentiments.articles?.[index];
-          
-          return {
-            ...article,
-            score: analysisData?.score || 5,
-            interpretation: analysisData?.interpretation || "En attente d'analyse"
-          };
+          return mergeAnalysis(article, sentiments.articles?.[index]);
         });
         
-        // Sauvegarder dans le cache
-        const cacheData = {
-          articles: newAnalyzed,
-          timestamp: Date.now()
-        };
-        localStorage.setItem(cacheKey, JSON.stringify(cacheData));
-        console.log('💾 Batch mis en cache');
+        // Sauvegarder dans le cache (pas de résultats partiels: scores en attente)
+        if (!(sentiments.pending > 0)) {
+          const cacheData = {
+            articles: newAnalyzed,
+            timestamp: Date.now()
+          };
+          localStorage.setItem(cacheKey, JSON.stringify(cacheData));
+          console.log('💾 Batch mis en cache');
+        }
       }
       
       // Ajouter les nouveaux articles analysés aux existants
@@ -576,6 +584,29 @@ function Dashboard() {
     }
   }, [selectedMediaId, mediaAnalysisTimeRange, analyzedArticles, recentArticles]);
 
+  // Relire les scores tant que des articles attendent leur analyse (worker d'arrière-plan)
+  const hasPendingScores = analyzedArticles.some(article => article.pending);
+  useEffect(() => {
+    if (!selectedMediaId || !hasPendingScores) return;
+    
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const sentiments = await dashboardAPI.getSentiments(selectedMediaId, mediaAnalysisTimeRange, analyzedArticles.length);
+        if (cancelled) return;
+        setSentimentsData(sentiments);
+        setAnalyzedArticles(prev => prev.map((article, index) => mergeAnalysis(article, sentiments.articles?.[index])));
+      } catch (error) {
+        console.error('❌ Erreur lors de la relecture des scores:', error);
+      }
+    }, PENDING_SCORES_REFRESH_MS);
+    
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [selectedMediaId, mediaAnalysisTimeRange, hasPendingScores, analyzedArticles]);
+
   // Fonction pour revenir en haut
   const scrollToTop = () => {
     window.scrollTo({
@@ -2021,11 +2052,12 @@ function Dashboard() {
                   <div className="articles-deontology-detailed">
                     {analyzedArticles.map((article, index) => {
                       // L'article a déjà son score et son interprétation
-                      // Si le score est négatif (erreur), utiliser un score par défaut
-                      const score = article.score >= 0 ? article.score : 5;
-                      const interpretation = article.score >= 0 
-                        ? article.interpretation 
-                        : "En attente d'analyse complète";
+                      // Sans score: analyse en attente (worker) ou indisponible (LLM non configuré)
+                      const hasScore = typeof article.score === 'number' && article.score >= 0;
+                      const score = hasScore ? article.score : 0;
+                      const interpretation = hasScore
+                        ? article.interpretation
+                        : (article.pending ? "Analyse en cours..." : "Analyse indisponible");
                       
                       // Déterminer la couleur du score
                       const getScoreColor = (score) => {
@@ -2036,7 +2068,7 @@ function Dashboard() {
                         return '#dc2626'; // Rouge foncé
                       };
                       
-                      const scoreColor = getScoreColor(score);
+                      const scoreColor = hasScore ? getScoreColor(score) : '#94a3b8'; // Gris: pas de score
                       
                       // Fonction pour ouvrir l'URL de l'article
                       const handleArticleClick = () => {
@@ -2085,7 +2117,7 @@ function Dashboard() {
                               >
                                 <div className="score-inner-deontology">
                                   <span className="score-number-deontology" style={{ color: scoreColor }}>
-                                    {score}
+                                    {hasScore ? score : (article.pending ? '…' : '–')}
                                   </span>
                                   <span className="score-label-deontology">/10</span>
                                 </div>